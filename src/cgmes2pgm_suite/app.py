@@ -33,7 +33,11 @@ from cgmes2pgm_suite.export import (
     TextExport,
 )
 from cgmes2pgm_suite.export.iri_export import extra_info_with_clean_iris
-from cgmes2pgm_suite.measurement_simulation import MeasurementBuilder
+from cgmes2pgm_suite.measurement_simulation import (
+    MeasurementBuilder,
+    PgmMeasurementSimulator,
+    SvValues,
+)
 from cgmes2pgm_suite.rdf_store import (
     FusekiDockerContainer,
     FusekiServer,
@@ -41,6 +45,7 @@ from cgmes2pgm_suite.rdf_store import (
 )
 from cgmes2pgm_suite.state_estimation import (
     StateEstimationResult,
+    StateEstimationSummary,
     StateEstimationWrapper,
 )
 
@@ -61,7 +66,12 @@ def main():
 
 def _run(
     config: SuiteConfiguration,
-) -> StateEstimationResult | list[StateEstimationResult] | None:
+) -> (
+    StateEstimationResult
+    | StateEstimationSummary
+    | list[StateEstimationResult | StateEstimationSummary]
+    | None
+):
 
     _ensure_fuseki_dataset(config)
     if config.steps.upload_xml_files:
@@ -71,7 +81,10 @@ def _run(
         # if profiles are not split, all data is in the default graph and no mapping is needed.
         config.dataset.populate_named_graph_mapping()
 
-    if config.steps.measurement_simulation:
+    simulate_directly = (
+        config.steps.measurement_simulation and config.measurement_simulation.direct
+    )
+    if config.steps.measurement_simulation and not simulate_directly:
         # put OP and MEAS profile into same graph
         separate_models = False
         builder = MeasurementBuilder(
@@ -79,11 +92,23 @@ def _run(
             config.measurement_simulation,
             separate_models=separate_models,
         )
-        builder.build_from_sv()
+        if config.measurement_simulation.update_values:
+            builder.update_from_sv()
+        else:
+            builder.build_from_sv()
         _export_measurement_simulation(config, separate_models)
 
     extra_info, input_data = _convert_cgmes(config.dataset, config.converter_options)
 
+    if simulate_directly:
+        simulator = PgmMeasurementSimulator(
+            input_data, extra_info, config.measurement_simulation
+        )
+        with Timer("Simulating Measurements", loglevel=logging.INFO):
+            input_data, extra_info = simulator.simulate(
+                SvValues.from_dataset(config.dataset)
+            )
+
     if not config.steps.stes:
         return None
 
@@ -97,11 +122,20 @@ def _run(
     if isinstance(results, StateEstimationResult):
         print(results)
         _export_run(results, config.output_folder, config)
+    elif isinstance(results, StateEstimationSummary):
+        print(results)
     else:  # List of results
         for res in results:
             print(f"-----\n{res.run_name}:")
             print(res)
-        _export_runs(results, config.output_folder, config)
+        # only full results can be exported, summaries are not retained
+        full_results = [r for r in results if isinstance(r, StateEstimationResult)]
+        _export_runs(full_results, config.output_folder, config)
+
+    os.makedirs(config.output_folder, exist_ok=True)
+    state_estimation.telemetry.to_csv(
+        os.path.join(config.output_folder, "stes_telemetry.csv")
+    )
 
     return results
 
@@ -299,14 +333,10 @@ def _export_result_data(
         result,
         target_graph=sv_target_graph,
     )
-    sv_profile_builder.build(True)
+    sv_profile_builder.write_xml(os.path.join(output_folder, "pgm_sv.xml"))
 
-    rdfxml_export = GraphToXMLExport(
-        config.dataset,
-        source_graph=sv_target_graph,
-        target_path=os.path.join(output_folder, "pgm_sv.xml"),
-    )
-    rdfxml_export.export()
+    if config.steps.upload_sv_profile:
+        sv_profile_builder.build(True)
 
 
 INVALID_CHARS = ["\\", "/", ":", "*", "?", '"', "<", ">", "|"]
@@ -18,6 +18,7 @@ This module contains common utilities and classes used throughout the package.
 
 from .cgmes_classes import CgmesFullModel
 from .input_data_tools import CacheEntry, InputDataIdCache
+from .mrid_generator import MridGenerator, quote_mrids, random_mrids
 from .node_balance import (
     ContainerData,
     NetworkData,
@@ -27,3 +28,9 @@ from .node_balance import (
     SubstationData,
     VoltageLevelData,
 )
+from .shared_model_store import (
+    ModelStoreHandle,
+    SharedArrayHandle,
+    SharedExtraInfo,
+    SharedModelStore,
+)
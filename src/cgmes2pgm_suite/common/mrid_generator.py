@@ -0,0 +1,84 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import uuid
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Positions of the hex digits in the string representation of an UUID
+_HEX_POSITIONS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+
+
+class MridGenerator:
+    """
+    Creates the mRIDs of new CGMES objects in batches.
+
+    Without `namespace`, random (version 4) UUIDs are created from the random bytes
+    of a NumPy generator. With `namespace`, name-based (version 5) UUIDs are derived
+    from the IRI of the source object and the kind of the new object. Repeated runs
+    with the same namespace create the same mRIDs for the same objects, so existing
+    objects can be updated in place instead of dropping the graph.
+
+    Args:
+        namespace (str | None): Name of the run, e.g. name of the dataset,
+            None for random mRIDs
+    """
+
+    def __init__(self, namespace: str | None = None):
+        self.namespace = (
+            None if namespace is None else uuid.uuid5(uuid.NAMESPACE_URL, namespace)
+        )
+        self._rng = np.random.default_rng()
+
+    @property
+    def deterministic(self) -> bool:
+        return self.namespace is not None
+
+    def create(self, sources: Sequence[str], kind: str) -> list[str]:
+        """Create one mRID for each source object.
+
+        Args:
+            sources (Sequence[str]): IRI or name of the object each new object is
+                derived from, e.g. the TopologicalNode of a SvVoltage
+            kind (str): Kind of the new objects, to distinguish multiple objects
+                derived from the same source, e.g. "PAnalog" and "QAnalog"
+
+        Returns:
+            list[str]: mRIDs without quotes
+        """
+        if self.namespace is None:
+            return random_mrids(len(sources), self._rng)
+
+        return [str(uuid.uuid5(self.namespace, f"{kind}|{s}")) for s in sources]
+
+
+def random_mrids(n: int, rng: np.random.Generator) -> list[str]:
+    """Create `n` random (version 4) UUIDs from a single batch of random bytes."""
+    data = np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    data[:, 6] = (data[:, 6] & 0x0F) | 0x40  # version 4
+    data[:, 8] = (data[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+
+    # hex digits of each UUID with dashes at the positions 8, 13, 18 and 23
+    hex_digits = np.frombuffer(data.tobytes().hex().encode(), dtype=np.uint8)
+    chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+    chars[:, _HEX_POSITIONS] = hex_digits.reshape(n, 32)
+
+    text = chars.tobytes().decode()
+    return [text[i : i + 36] for i in range(0, 36 * n, 36)]
+
+
+def quote_mrids(mrids: Iterable[str]) -> list[str]:
+    """Format mRIDs as string literals for the insertion into the dataset."""
+    return [f'"{mrid}"' for mrid in mrids]
@@ -0,0 +1,234 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import sys
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from power_grid_model import ComponentType
+from power_grid_model.data_types import SingleDataset
+from power_grid_model_io.data_types import ExtraInfo
+
+
+@dataclass(frozen=True)
+class SharedArrayHandle:
+    """
+    Reference to an array in shared memory.
+
+    Attributes:
+        name (str): Name of the shared memory block
+        dtype (np.dtype): Data type of the array
+        shape (tuple[int, ...]): Shape of the array
+    """
+
+    name: str
+    dtype: np.dtype
+    shape: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class ModelStoreHandle:
+    """
+    Picklable reference to a `SharedModelStore`, used to attach to it in another
+    process.
+
+    Attributes:
+        components (dict[ComponentType, SharedArrayHandle]): Input data by component
+        extra_info_ids (SharedArrayHandle): Sorted ids of the extra info entries
+        extra_info_offsets (SharedArrayHandle): Start of each entry in the blob
+        extra_info_blob (SharedArrayHandle): Pickled extra info entries
+    """
+
+    components: dict[ComponentType, SharedArrayHandle]
+    extra_info_ids: SharedArrayHandle
+    extra_info_offsets: SharedArrayHandle
+    extra_info_blob: SharedArrayHandle
+
+
+class SharedExtraInfo(Mapping):
+    """
+    Read-only extra info backed by arrays in shared memory.
+
+    Every entry is pickled separately into a single byte array. Entries are
+    located by binary search on the sorted ids and only unpickled on access.
+    """
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray, blob: np.ndarray):
+        self._ids = ids
+        self._offsets = offsets
+        self._blob = blob
+        self._decoded: dict[int, dict] = {}
+
+    @staticmethod
+    def encode(extra_info: ExtraInfo) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Encode extra info as sorted ids, offsets and blob of pickled entries."""
+        ids = np.array(sorted(extra_info), dtype=np.int64)
+        entries = [
+            pickle.dumps(extra_info[i], protocol=pickle.HIGHEST_PROTOCOL)
+            for i in ids.tolist()
+        ]
+        offsets = np.zeros(len(entries) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(e) for e in entries])
+        blob = np.frombuffer(b"".join(entries), dtype=np.uint8)
+        return ids, offsets, blob
+
+    def __getitem__(self, key) -> dict:
+        if key in self._decoded:
+            return self._decoded[key]
+
+        idx = int(np.searchsorted(self._ids, key))
+        if idx == len(self._ids) or self._ids[idx] != key:
+            raise KeyError(key)
+
+        start, end = self._offsets[idx], self._offsets[idx + 1]
+        entry = pickle.loads(self._blob[start:end].tobytes())
+        self._decoded[key] = entry
+        return entry
+
+    def __iter__(self) -> Iterator[int]:
+        return (int(i) for i in self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class SharedModelStore:
+    """
+    PGM input data and extra info in shared memory for the hand-off to worker
+    processes.
+
+    The creating process copies the data once with `create` and passes the small
+    `handle` to the workers, which `attach` to the same memory without copying.
+    Attached arrays are read-only, components a worker modifies have to be copied.
+
+    The creating process unlinks the memory on `close`, so the store should be used
+    as context manager that outlives the workers. Attached stores are not tracked
+    by the resource tracker of their process and only close the blocks.
+    """
+
+    def __init__(
+        self,
+        handle: ModelStoreHandle,
+        blocks: list[SharedMemory],
+        owner: bool,
+    ):
+        self.handle = handle
+        self._blocks = blocks
+        self._owner = owner
+
+        views = {b.name: b for b in blocks}
+        self.input_data: SingleDataset = {
+            component: self._view(views, array_handle)
+            for component, array_handle in handle.components.items()
+        }
+        self.extra_info = SharedExtraInfo(
+            self._view(views, handle.extra_info_ids),
+            self._view(views, handle.extra_info_offsets),
+            self._view(views, handle.extra_info_blob),
+        )
+
+    @classmethod
+    def create(
+        cls, input_data: SingleDataset, extra_info: ExtraInfo
+    ) -> "SharedModelStore":
+        """Copy input data and extra info into new shared memory blocks."""
+        blocks: list[SharedMemory] = []
+
+        def share(array: np.ndarray) -> SharedArrayHandle:
+            # shared memory blocks cannot be empty
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            shared[...] = array
+            return SharedArrayHandle(block.name, array.dtype, array.shape)
+
+        try:
+            components = {
+                component: share(array) for component, array in input_data.items()
+            }
+            ids, offsets, blob = SharedExtraInfo.encode(extra_info)
+            handle = ModelStoreHandle(
+                components=components,
+                extra_info_ids=share(ids),
+                extra_info_offsets=share(offsets),
+                extra_info_blob=share(blob),
+            )
+        except Exception:
+            for block in blocks:
+                block.close()
+                block.unlink()
+            raise
+
+        return cls(handle, blocks, owner=True)
+
+    @classmethod
+    def attach(cls, handle: ModelStoreHandle) -> "SharedModelStore":
+        """Attach to a store created in another process."""
+        names = {h.name for h in handle.components.values()}
+        names |= {
+            handle.extra_info_ids.name,
+            handle.extra_info_offsets.name,
+            handle.extra_info_blob.name,
+        }
+        return cls(handle, [_attach_block(name) for name in names], owner=False)
+
+    def _view(
+        self, blocks: dict[str, SharedMemory], handle: SharedArrayHandle
+    ) -> np.ndarray:
+        array = np.ndarray(
+            handle.shape, dtype=handle.dtype, buffer=blocks[handle.name].buf
+        )
+        array.flags.writeable = False
+        return array
+
+    def close(self):
+        """Release the views and close the blocks, the owner also unlinks them."""
+        self.input_data = {}
+        self.extra_info = SharedExtraInfo(
+            np.array([], dtype=np.int64),
+            np.zeros(1, dtype=np.int64),
+            np.array([], dtype=np.uint8),
+        )
+        for block in self._blocks:
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedModelStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _attach_block(name: str) -> SharedMemory:
+    """Attach to an existing block without registering it with the resource tracker,
+    since only the creating process unlinks it."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    # Workers share the resource tracker of the creating process, unregistering the
+    # block would also drop the registration of the owner. The registration is
+    # skipped instead, the same as `track=False`.
+    register = resource_tracker.register
+    resource_tracker.register = lambda *_: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
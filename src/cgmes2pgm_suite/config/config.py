@@ -36,12 +36,16 @@ class Steps:
             Default is False.
         stes (bool): Whether to run the state estimation.
             Default is True.
+        upload_sv_profile (bool): Whether to insert the SV profile of the results
+            into the dataset, e.g. for further SPARQL queries. The `pgm_sv.xml` is
+            written without it. Default is False.
     """
 
     own_fuseki_container: bool = False
     upload_xml_files: bool = False
     measurement_simulation: bool = False
     stes: bool = True
+    upload_sv_profile: bool = False
 
 
 @dataclass
@@ -36,7 +36,12 @@ from cgmes2pgm_suite.measurement_simulation import (
     MeasurementRangeSet,
     MeasurementSimulationConfiguration,
 )
-from cgmes2pgm_suite.state_estimation import PgmCalculationParameters, StesOptions
+from cgmes2pgm_suite.state_estimation import (
+    PgmCalculationParameters,
+    ResultRetention,
+    StesOptions,
+    ValidationMode,
+)
 
 from .config import LoggingConfiguration, Steps, SuiteConfiguration
 
@@ -111,9 +116,8 @@ class SuiteConfigReader:
         """
         Returns the measurement simulation ranges.
         """
-        measurement_simulation_path = self._config.get("MeasurementSimulation", {}).get(
-            "Ranges", None
-        )
+        measurement_simulation = self._config.get("MeasurementSimulation", {})
+        measurement_simulation_path = measurement_simulation.get("Ranges", None)
         if measurement_simulation_path and not os.path.isabs(
             measurement_simulation_path
         ):
@@ -121,7 +125,11 @@ class SuiteConfigReader:
                 os.path.dirname(self._path), measurement_simulation_path
             )
 
-        return MeasurementSimulationConfigReader(measurement_simulation_path).read()
+        config = MeasurementSimulationConfigReader(measurement_simulation_path).read()
+        config.direct = measurement_simulation.get("Direct", False)
+        config.update_values = measurement_simulation.get("UpdateValues", False)
+        config.mrid_namespace = measurement_simulation.get("MridNamespace", None)
+        return config
 
     def _eval_environment_variables(self):
         # allow base_url to be set via environment variable or command line argument
@@ -179,12 +187,40 @@ class SuiteConfigReader:
         compute_islands_separately = stes_config.get("ComputeIslandsSeparately", False)
         compute_only_subnets = stes_config.get("ComputeOnlySubnets", [])
         reconnect_branches = stes_config.get("ReconnectBranches", False)
+        reconnect_workers = stes_config.get("ReconnectWorkers", 1)
+        bad_data_elimination = stes_config.get("BadDataElimination", False)
+        max_bad_data_eliminations = stes_config.get("MaxBadDataEliminations", 10)
+        check_observability = stes_config.get("CheckObservability", False)
+        result_retention = ResultRetention(stes_config.get("ResultRetention", "all"))
+        result_spill_folder = stes_config.get("ResultSpillFolder", None)
+        validation_mode = ValidationMode(stes_config.get("ValidationMode", "full"))
+        incremental_subnets = stes_config.get("IncrementalSubnets", False)
+        incremental_tolerance = stes_config.get("IncrementalTolerance", 0.1)
+        incremental_cache_folder = stes_config.get("IncrementalCacheFolder", None)
+        if result_spill_folder and not os.path.isabs(result_spill_folder):
+            result_spill_folder = os.path.join(
+                self._config.get("OutputFolder", ""), result_spill_folder
+            )
+        if incremental_cache_folder and not os.path.isabs(incremental_cache_folder):
+            incremental_cache_folder = os.path.join(
+                self._config.get("OutputFolder", ""), incremental_cache_folder
+            )
 
         return StesOptions(
             pgm_parameters=pgm_parameters,
             compute_islands_separately=compute_islands_separately,
             compute_only_subnets=compute_only_subnets,
             reconnect_branches=reconnect_branches,
+            reconnect_workers=reconnect_workers,
+            bad_data_elimination=bad_data_elimination,
+            max_bad_data_eliminations=max_bad_data_eliminations,
+            check_observability=check_observability,
+            result_retention=result_retention,
+            result_spill_folder=result_spill_folder,
+            validation_mode=validation_mode,
+            incremental_subnets=incremental_subnets,
+            incremental_tolerance=incremental_tolerance,
+            incremental_cache_folder=incremental_cache_folder,
         )
 
     def _read_network_splitting_options(self):
@@ -0,0 +1,374 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from cgmes2pgm_converter.common import Timer
+from power_grid_model import (
+    CalculationMethod,
+    CalculationType,
+    ComponentType,
+    PowerGridModel,
+    initialize_array,
+)
+from power_grid_model.data_types import BatchDataset, SingleDataset
+from power_grid_model_io.data_types import ExtraInfo
+
+from ..state_estimation import PgmCalculationParameters, StateEstimationResult
+from ..state_estimation.options import AUTO_THREADS
+from ..state_estimation.thread_tuning import resolve_threads
+
+# Branches, whose outage is simulated
+CONTINGENCY_COMPONENTS = [
+    ComponentType.line,
+    ComponentType.generic_branch,
+    ComponentType.transformer,
+]
+
+APPLIANCE_COMPONENTS = [ComponentType.sym_load, ComponentType.sym_gen]
+
+SENSOR_COMPONENTS = [
+    ComponentType.sym_voltage_sensor,
+    ComponentType.sym_power_sensor,
+    ComponentType.asym_voltage_sensor,
+    ComponentType.asym_power_sensor,
+]
+
+
+@dataclass
+class ContingencyResult:
+    """
+    Result of the N-1 contingency analysis.
+
+    Attributes:
+        loading_limit (float): Loading above which a branch is reported as violation
+        contingencies (pd.DataFrame): One row per simulated branch outage with
+            the columns `id`, `name`, `component`, `converged`, `max_loading`,
+            `n_violations` and `n_deenergized_nodes`
+        violations (pd.DataFrame): One row per overloaded branch and contingency with
+            the columns `contingency_id`, `contingency_name`, `branch_id`,
+            `branch_name`, `loading` and `base_loading`
+        base_loading (dict[int, float]): Loading of each branch without outage
+    """
+
+    loading_limit: float
+    contingencies: pd.DataFrame
+    violations: pd.DataFrame
+    base_loading: dict[int, float] = field(default_factory=dict)
+
+    @property
+    def n_contingencies(self) -> int:
+        return len(self.contingencies)
+
+    @property
+    def failed_contingencies(self) -> list[int]:
+        return self.contingencies["id"][~self.contingencies["converged"]].tolist()
+
+    def __str__(self):
+        divider = "---------------------------------------------"
+        critical = self.contingencies[self.contingencies["n_violations"] > 0]
+        return (
+            f"{divider}\n"
+            f"N-1 Contingency Analysis\n"
+            f"{divider}\n"
+            f"Contingencies        {self.n_contingencies}\n"
+            f"Not converged        {len(self.failed_contingencies)}\n"
+            f"With violations      {len(critical)}\n"
+            f"Violations           {len(self.violations)}\n"
+            f"Loading limit        {self.loading_limit:.0%}\n"
+            f"{divider}\n"
+        )
+
+
+def create_power_flow_input(result: StateEstimationResult) -> SingleDataset:
+    """Create power flow input data from the estimated state.
+
+    Loads and generators are set to their estimated injections, sources keep
+    the estimated voltage of their node. Sensors are removed.
+    With the stiff sources of the converter, the power flow of the base case
+    reproduces the estimated state.
+
+    Args:
+        result (StateEstimationResult): Converged state estimation result
+
+    Returns:
+        SingleDataset: Input data for a power flow calculation
+    """
+    input_data = {
+        component: data.copy()
+        for component, data in result.input_data.items()
+        if component not in SENSOR_COMPONENTS
+    }
+
+    for component in APPLIANCE_COMPONENTS:
+        if component not in result.result_data:
+            continue
+        appliances = input_data[component]
+        estimated = result.result_data[component]
+        appliances["p_specified"] = estimated["p"]
+        appliances["q_specified"] = estimated["q"]
+
+    nodes = result.result_data[ComponentType.node]
+    node_idx = {node_id: i for i, node_id in enumerate(nodes["id"])}
+    sources = input_data[ComponentType.source]
+    idx = np.array([node_idx[n] for n in sources["node"]], dtype=np.int64)
+    if idx.size:
+        sources["u_ref"] = nodes["u_pu"][idx]
+        sources["u_ref_angle"] = nodes["u_angle"][idx]
+
+    return input_data
+
+
+class ContingencyAnalysis:
+    """
+    N-1 contingency analysis on the result of a state estimation.
+
+    The estimated state is converted to a power flow model, see
+    `create_power_flow_input`. Each energized branch outage is a scenario of
+    a sparse batch power flow, that sets `from_status` and `to_status` of the
+    branch to 0. The scenarios are calculated in chunks of `chunk_size` to limit
+    the memory of the batch results.
+
+    Args:
+        result (StateEstimationResult): Converged state estimation result
+        params (PgmCalculationParameters): Parameters for the power flow,
+            threads are calibrated by default
+        loading_limit (float): Loading above which a branch is reported as violation
+        chunk_size (int): Maximum number of contingencies per batch calculation
+    """
+
+    def __init__(
+        self,
+        result: StateEstimationResult,
+        params: PgmCalculationParameters | None = None,
+        loading_limit: float = 1.0,
+        chunk_size: int = 1000,
+    ):
+        self.result = result
+        self.extra_info: ExtraInfo = result.extra_info
+        self.params = params or PgmCalculationParameters(threads=AUTO_THREADS)
+        self.loading_limit = loading_limit
+        self.chunk_size = chunk_size
+        self.input_data = create_power_flow_input(result)
+
+    def run(self) -> ContingencyResult:
+        """Run the contingency analysis.
+
+        Returns:
+            ContingencyResult: Loading violations of all contingencies
+
+        Raises:
+            SparseMatrixError, IterationDiverge: If the base case power flow fails
+        """
+        model = PowerGridModel(self.input_data)
+        output = self._get_output_component_types()
+
+        with Timer("Base Case Power Flow", loglevel=logging.INFO):
+            base_result = self._calculate(model, -1, None, output)
+
+        base_loading = {
+            component: base_result[component]["loading"]
+            for component in CONTINGENCY_COMPONENTS
+            if component in base_result
+        }
+
+        outages = self._get_outages()
+        contingencies = []
+        violations = []
+
+        with Timer(
+            f"Contingency Analysis ({len(outages)} contingencies)",
+            loglevel=logging.INFO,
+        ):
+            for start in range(0, len(outages), self.chunk_size):
+                chunk = outages[start : start + self.chunk_size]
+                update_data = self._create_update_data(chunk)
+                threads = resolve_threads(
+                    self.params,
+                    CalculationType.power_flow,
+                    self.input_data,
+                    update_data,
+                    lambda t, data: self._calculate(model, t, data, output),
+                )
+                batch_result = self._calculate(model, threads, update_data, output)
+                converged = np.ones(len(chunk), dtype=bool)
+                if model.batch_error is not None:
+                    converged[model.batch_error.failed_scenarios] = False
+
+                contingencies.append(
+                    self._evaluate(chunk, batch_result, converged, violations)
+                )
+
+        contingency_df = pd.concat(contingencies, ignore_index=True)
+        violation_df = self._create_violation_df(violations, base_loading)
+
+        n_failed = int(np.count_nonzero(~contingency_df["converged"]))
+        if n_failed:
+            logging.warning(
+                "Power flow failed in %d of %d contingencies", n_failed, len(outages)
+            )
+
+        return ContingencyResult(
+            loading_limit=self.loading_limit,
+            contingencies=contingency_df,
+            violations=violation_df,
+            base_loading={
+                int(branch_id): float(value)
+                for component, loading in base_loading.items()
+                for branch_id, value in zip(self.input_data[component]["id"], loading)
+            },
+        )
+
+    def _calculate(
+        self,
+        model: PowerGridModel,
+        threads: int,
+        update_data: BatchDataset | None,
+        output: dict,
+    ):
+        return model.calculate_power_flow(
+            update_data=update_data,
+            calculation_method=CalculationMethod.newton_raphson,
+            max_iterations=self.params.max_iterations,
+            error_tolerance=self.params.error_tolerance,
+            threading=threads,
+            symmetric=True,
+            output_component_types=output,
+            continue_on_batch_error=update_data is not None,
+        )
+
+    def _get_output_component_types(self) -> dict:
+        output: dict = {ComponentType.node: ["energized"]}
+        for component in CONTINGENCY_COMPONENTS:
+            if component in self.input_data:
+                output[component] = ["loading"]
+        return output
+
+    def _get_outages(self) -> list[tuple[ComponentType, int]]:
+        """Index of all energized branches as (component, index)"""
+        outages = []
+        for component in CONTINGENCY_COMPONENTS:
+            data = self.input_data.get(component)
+            if data is None:
+                continue
+            energized = (data["from_status"] == 1) & (data["to_status"] == 1)
+            outages += [(component, int(i)) for i in np.flatnonzero(energized)]
+        return outages
+
+    def _create_update_data(
+        self, outages: list[tuple[ComponentType, int]]
+    ) -> BatchDataset:
+        """Sparse batch with one branch outage per scenario"""
+        update_data: BatchDataset = {}
+        components = np.array([c.value for c, _ in outages])
+        indices = np.array([i for _, i in outages], dtype=np.int64)
+
+        for component in CONTINGENCY_COMPONENTS:
+            if component not in self.input_data:
+                continue
+            is_component = components == component.value
+            data = initialize_array(
+                "update", component, int(np.count_nonzero(is_component))
+            )
+            data["id"] = self.input_data[component]["id"][indices[is_component]]
+            data["from_status"] = 0
+            data["to_status"] = 0
+
+            indptr = np.zeros(len(outages) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum(is_component)
+            update_data[component] = {"indptr": indptr, "data": data}
+
+        return update_data
+
+    def _evaluate(
+        self,
+        outages: list[tuple[ComponentType, int]],
+        batch_result: dict,
+        converged: np.ndarray,
+        violations: list[pd.DataFrame],
+    ) -> pd.DataFrame:
+        outage_ids = np.array(
+            [self.input_data[c]["id"][i] for c, i in outages], dtype=np.int64
+        )
+        max_loading = np.zeros(len(outages))
+        n_violations = np.zeros(len(outages), dtype=np.int64)
+
+        for component in CONTINGENCY_COMPONENTS:
+            if component not in batch_result:
+                continue
+            loading = batch_result[component]["loading"]
+            loading = np.where(converged[:, None], loading, np.nan)
+            if loading.shape[1]:
+                max_loading = np.fmax(max_loading, np.nanmax(loading, axis=1))
+
+            overloaded = loading > self.loading_limit
+            n_violations += np.count_nonzero(overloaded, axis=1)
+            rows, cols = np.nonzero(overloaded)
+            violations.append(
+                pd.DataFrame(
+                    {
+                        "contingency_id": outage_ids[rows],
+                        "branch_id": self.input_data[component]["id"][cols],
+                        "loading": loading[rows, cols],
+                    }
+                )
+            )
+
+        energized = batch_result[ComponentType.node]["energized"]
+        n_deenergized = np.count_nonzero(energized == 0, axis=1)
+
+        return pd.DataFrame(
+            {
+                "id": outage_ids,
+                "name": [self._get_name(i) for i in outage_ids],
+                "component": [c.value for c, _ in outages],
+                "converged": converged,
+                "max_loading": np.where(converged, max_loading, np.nan),
+                "n_violations": n_violations,
+                "n_deenergized_nodes": np.where(converged, n_deenergized, 0),
+            }
+        )
+
+    def _create_violation_df(
+        self, violations: list[pd.DataFrame], base_loading: dict
+    ) -> pd.DataFrame:
+        columns = [
+            "contingency_id",
+            "contingency_name",
+            "branch_id",
+            "branch_name",
+            "loading",
+            "base_loading",
+        ]
+        if not violations:
+            return pd.DataFrame(columns=columns)
+
+        df = pd.concat(violations, ignore_index=True)
+        base = pd.concat(
+            [
+                pd.Series(loading, index=self.input_data[component]["id"])
+                for component, loading in base_loading.items()
+            ]
+        )
+        df["contingency_name"] = df["contingency_id"].map(self._get_name)
+        df["branch_name"] = df["branch_id"].map(self._get_name)
+        df["base_loading"] = df["branch_id"].map(base)
+
+        return df[columns].sort_values("loading", ascending=False, ignore_index=True)
+
+    def _get_name(self, pgm_id: int) -> str:
+        return self.extra_info.get(int(pgm_id), {}).get("_name", str(pgm_id))
@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import logging
-import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any, Optional
+from xml.sax.saxutils import escape
 
 import numpy as np
 import pandas as pd
@@ -28,9 +30,11 @@ from cgmes2pgm_converter.common import (
 )
 from power_grid_model import ComponentType
 
-from cgmes2pgm_suite.common import CgmesFullModel
+from cgmes2pgm_suite.common import CgmesFullModel, MridGenerator, quote_mrids
 from cgmes2pgm_suite.state_estimation import PgmDataset
 
+from .utils import CimXmlBuilder, CimXmlObject, full_model_to_xml_object
+
 
 @dataclass
 class TopologicalIsland:
@@ -67,24 +71,166 @@ class TopologicalIsland:
         ]
         return triples
 
+    def to_xml_object(self, base_url: str) -> CimXmlObject:
+        """
+        Convert the TopologicalIsland instance to an object of a CIM/XML file.
+
+        Args:
+            base_url (str): Base url of the dataset, see `to_xml_references`
+
+        Returns:
+            CimXmlObject: The TopologicalIsland as written by `GraphToXMLExport`.
+        """
+        CLS = "cim:TopologicalIsland"
+        rdf_object = CimXmlObject(iri=self.iri.strip("<>"), type_=CLS)
+        rdf_object.add_attribute("cim:IdentifiedObject.mRID", self.mrid)
+        rdf_object.add_attribute("cim:IdentifiedObject.name", escape(self.name))
+
+        if self.angle_ref_node is not None:
+            rdf_object.add_reference(
+                f"{CLS}.angleRefTopologicalNode",
+                to_xml_references([self.angle_ref_node], base_url)[0],
+            )
+
+        for node in to_xml_references(self.topological_nodes, base_url):
+            rdf_object.add_reference(f"{CLS}.TopologicalNodes", node)
+        return rdf_object
+
+
+class PgmIriIndex:
+    """
+    Formatted IRIs of the extra info by PGM id, built once per dataset.
+
+    For each key (e.g. `_mrid` of nodes, `_term1` of branches) the IRIs of all
+    PGM ids are formatted once on first access and stored as object array,
+    so the IRIs of a component are looked up with array indexing.
+
+    Args:
+        extra_info (Mapping): Extra info of the PGM dataset
+        base_url (str): Base url of the dataset for IRIs without base uri
+    """
+
+    def __init__(self, extra_info: Mapping, base_url: str):
+        ids = np.fromiter(extra_info.keys(), dtype=np.int64, count=len(extra_info))
+        infos = list(extra_info.values())
+        order = np.argsort(ids)
+
+        self._ids = ids[order]
+        self._infos = [infos[i] for i in order]
+        self._base_url = base_url
+        self._iris: dict[str, np.ndarray] = {}
+
+    def get(self, key: str, pgm_ids: np.ndarray) -> np.ndarray:
+        """Formatted IRIs of the given PGM ids, None if the id or key is missing."""
+        pgm_ids = np.asarray(pgm_ids, dtype=np.int64)
+        iris = np.full(pgm_ids.shape, None, dtype=object)
+        if not self._ids.size:
+            return iris
+
+        if key not in self._iris:
+            self._iris[key] = format_iris(
+                [info.get(key) for info in self._infos], self._base_url
+            )
+
+        pos = np.minimum(np.searchsorted(self._ids, pgm_ids), self._ids.size - 1)
+        found = self._ids[pos] == pgm_ids
+        iris[found] = self._iris[key][pos[found]]
+        return iris
+
+
+def format_iris(iris: list[str | None], base_url: str) -> np.ndarray:
+    """`SvProfileBuilder._get_formatted_iri` of multiple IRIs as object array."""
+    base_iri = base_url + "#"
+    absolute = (base_iri, "http")
+    formatted = np.empty(len(iris), dtype=object)
+    formatted[:] = [
+        None
+        if iri is None
+        else f"<{iri}>"
+        if iri.startswith(absolute)
+        else f"<{base_iri}{iri}>"
+        for iri in iris
+    ]
+    return formatted
+
+
+def to_xml_references(iris: list[str], base_url: str) -> list[str]:
+    """
+    References of a CIM/XML file for IRIs formatted by `format_iris`.
+    IRIs in the dataset become `#_<id>`, other IRIs are kept, like in `GraphToXMLExport`.
+    """
+    base_iri = "<" + base_url + "#"
+    return [
+        f"#_{iri[len(base_iri) : -1]}" if iri.startswith(base_iri) else iri[1:-1]
+        for iri in iris
+    ]
+
+
+def _to_built_objects(df: pd.DataFrame, base_url: str) -> str:
+    """
+    RDF/XML of SV objects in a DataFrame for `CgmesDataset.insert_df`, see
+    `CimXmlObject.build`. Columns with IRIs are written as references.
+    """
+    if df.empty:
+        return ""
+
+    cls = df["rdf:type"].iloc[0]
+    mrid_col = f"{CIM_ID_OBJ}.mRID"
+    mrids = [mrid.strip('"') for mrid in df[mrid_col].tolist()]
+
+    lines = [
+        [
+            f'  <{cls} rdf:about="urn:uuid:{mrid}">\n'
+            f"    <{mrid_col}>{mrid}</{mrid_col}>\n"
+            for mrid in mrids
+        ]
+    ]
+    references = []
+    for col in df.columns:
+        if col in ("rdf:type", mrid_col):
+            continue
+        if df[col].dtype == object:
+            references.append(
+                [
+                    f'    <{col} rdf:resource="{ref}"/>\n'
+                    for ref in to_xml_references(df[col].tolist(), base_url)
+                ]
+            )
+        else:
+            lines.append(
+                [f"    <{col}>{value}</{col}>\n" for value in df[col].tolist()]
+            )
+    lines += references
+    lines.append([f"  </{cls}>\n"] * len(df))
+
+    return "".join("".join(rows) for rows in zip(*lines))
+
 
 class SvProfileBuilder:
     """
     Generates the state variable (SV) profile for a provided power flow or state estimation result.
 
+    The profile is either inserted into the CGMES dataset with `build` or written
+    directly to a CIM/XML file with `write_xml`. The SV objects are created once,
+    so both outputs of the same builder contain the same mRIDs.
+
     Attributes:
         cgmes_dataset (CgmesDataset): The CGMES dataset to save the SV-profile to.
         pgm_dataset (PgmDataset): The PGM dataset to convert to a state variable profile.
         model_info (CgmesFullModel): The model information to include in the SV-profile.
-        target_graph (str): The name of the target graph to write the SV-profile to.
+        target_graph (str | None): The name of the target graph to write the SV-profile to,
+            only required for `build`.
+        mrid_generator (MridGenerator): Creates the mRIDs of the SV objects,
+            random mRIDs by default.
     """
 
     def __init__(
         self,
         cgmes_dataset: CgmesDataset,
         pgm_dataset: PgmDataset,
-        target_graph: str,
+        target_graph: str | None = None,
         model_info: CgmesFullModel | None = None,
+        mrid_generator: MridGenerator | None = None,
     ):
         self.cgmes_dataset = cgmes_dataset
         self.pgm_dataset = pgm_dataset
@@ -92,12 +238,16 @@ class SvProfileBuilder:
         self.model_info = model_info or CgmesFullModel(
             profile=["http://entsoe.eu/CIM/StateVariables/4/1"]
         )
+        self.mrid_generator = mrid_generator or MridGenerator()
 
     def build(self, overwrite_existing: bool = False):
         """
         Write the SV-profile to the CGMES dataset.
         """
 
+        if self.target_graph is None:
+            raise ValueError("No target graph set, cannot insert the SV-profile.")
+
         if overwrite_existing:
             self.cgmes_dataset.drop_graph(self.target_graph)
 
@@ -105,18 +255,59 @@ class SvProfileBuilder:
             return
 
         self._write_model_info()
-        self._write_sv_voltage()
-        self._write_power_flow()
+        for df in self._sv_objects:
+            self.cgmes_dataset.insert_df(
+                df,
+                self.target_graph,
+                include_mrid=True,
+            )
         self._add_topological_islands()
 
-    def _write_sv_voltage(self):
-        """Create SvVoltage objects"""
+    def write_xml(self, path: str):
+        """
+        Write the SV-profile to a CIM/XML file without inserting it into the dataset.
 
-        CLS = "cim:SvVoltage"
+        The objects are streamed from the result arrays into the file in the
+        same format as `GraphToXMLExport` of a graph filled by `build`.
+
+        Args:
+            path (str): Path of the CIM/XML file
+        """
 
         if not self.pgm_dataset.result_data:
             return
 
+        base_url = self.cgmes_dataset.base_url
+        with CimXmlBuilder(path, self.cgmes_dataset.get_prefixes()) as file_builder:
+            file_builder.add_object(full_model_to_xml_object(self.model_info))
+            for df in self._sv_objects:
+                file_builder.add_built_objects(_to_built_objects(df, base_url))
+            for island in self._topological_islands:
+                file_builder.add_object(island.to_xml_object(base_url))
+
+    @cached_property
+    def _sv_objects(self) -> list[pd.DataFrame]:
+        """SvVoltage and SvPowerFlow objects, one DataFrame per component"""
+        if not self.pgm_dataset.result_data:
+            return []
+
+        objects = [self._get_sv_voltages()]
+
+        for type_ in BRANCH_COMPONENTS:
+            if type_ in self.pgm_dataset.result_data:
+                objects += self._get_branch_flows(type_)
+
+        for type_ in APPLIANCE_COMPONENTS:
+            if type_ in self.pgm_dataset.result_data:
+                objects.append(self._get_appliance_flows(type_))
+
+        return objects
+
+    def _get_sv_voltages(self) -> pd.DataFrame:
+        """Create SvVoltage objects"""
+
+        CLS = "cim:SvVoltage"
+
         node_results = self.pgm_dataset.result_data[ComponentType.node]
 
         df = pd.DataFrame()
@@ -125,53 +316,28 @@ class SvProfileBuilder:
 
         df[f"{CLS}.v"] = node_results["u"] / 1e3
         df[f"{CLS}.angle"] = np.rad2deg(node_results["u_angle"])
-        df[f"{CIM_ID_OBJ}.mRID"] = [f'"{uuid.uuid4()}"' for _ in range(len(df))]
 
-        df[f"{CLS}.TopologicalNode"] = None
-        for idx, row in df.iterrows():
-            node_id = row["_pgm_id"]
-            toponode_iri = self.pgm_dataset.extra_info.get(node_id, {}).get(
-                "_mrid", None
-            )
-            df.at[idx, f"{CLS}.TopologicalNode"] = self._get_formatted_iri(toponode_iri)
+        df[f"{CLS}.TopologicalNode"] = self._iri_index.get("_mrid", node_results["id"])
 
         # drop rows without TopologicalNode and log node ids w/o TopologicalNode
         missing_toponode = df[df[f"{CLS}.TopologicalNode"].isnull()]["_pgm_id"].tolist()
         if missing_toponode:
             logging.warning("Nodes without TopologicalNode: %s", missing_toponode)
-        df = df[df[f"{CLS}.TopologicalNode"].notnull()]
-
-        df.drop(columns=["_pgm_id"], inplace=True)
-
-        self.cgmes_dataset.insert_df(
-            df,
-            self.target_graph,
-            include_mrid=True,
+        df = df[df[f"{CLS}.TopologicalNode"].notnull()].copy()
+        df[f"{CIM_ID_OBJ}.mRID"] = self._create_mrids(
+            df[f"{CLS}.TopologicalNode"], "SvVoltage"
         )
 
-    def _write_power_flow(self):
-        """Create SvPowerFlow objects"""
-
-        if not self.pgm_dataset.result_data:
-            return
-
-        for type_ in BRANCH_COMPONENTS:
-            if type_ in self.pgm_dataset.result_data:
-                self._add_branch_flows(type_)
-
-        for type_ in APPLIANCE_COMPONENTS:
-            if type_ in self.pgm_dataset.result_data:
-                self._add_appliance_flows(type_)
+        df.drop(columns=["_pgm_id"], inplace=True)
+        return df
 
-    def _add_branch_flows(self, type_: ComponentType):
-        """Add generic branch flows to the DataFrame."""
-
-        if not self.pgm_dataset.result_data:
-            return
+    def _get_branch_flows(self, type_: ComponentType) -> list[pd.DataFrame]:
+        """Create SvPowerFlow objects of both branch sides"""
 
         CLS = "cim:SvPowerFlow"
 
         result_data = self.pgm_dataset.result_data[type_]
+        flows = []
 
         for direction in ["from", "to"]:
 
@@ -180,15 +346,10 @@ class SvProfileBuilder:
             df["rdf:type"] = CLS
             df[f"{CLS}.p"] = result_data[f"p_{direction}"] / 1e6
             df[f"{CLS}.q"] = result_data[f"q_{direction}"] / 1e6
-            df[f"{CIM_ID_OBJ}.mRID"] = [f'"{uuid.uuid4()}"' for _ in range(len(df))]
 
             terminal_number = 1 if direction == "from" else 2
             terminal_key = f"_term{terminal_number}"
-            df[f"{CLS}.Terminal"] = df["_pgm_id"].apply(
-                lambda pid, terminal_key=terminal_key: self._get_terminal_from_extra_info(
-                    pid, terminal_key
-                )
-            )
+            df[f"{CLS}.Terminal"] = self._iri_index.get(terminal_key, result_data["id"])
 
             missing_term = df[df[f"{CLS}.Terminal"].isnull()]["_pgm_id"].tolist()
             if missing_term:
@@ -196,19 +357,16 @@ class SvProfileBuilder:
                     "Branches without Terminal (%s): %s", direction, missing_term
                 )
             df.dropna(subset=[f"{CLS}.Terminal"], inplace=True)
-            df.drop(columns=["_pgm_id"], inplace=True)
-
-            self.cgmes_dataset.insert_df(
-                df,
-                self.target_graph,
-                include_mrid=True,
+            df[f"{CIM_ID_OBJ}.mRID"] = self._create_mrids(
+                df[f"{CLS}.Terminal"], "SvPowerFlow"
             )
+            df.drop(columns=["_pgm_id"], inplace=True)
+            flows.append(df)
 
-    def _add_appliance_flows(self, type_: ComponentType):
-        """Add appliance flows to the DataFrame."""
+        return flows
 
-        if not self.pgm_dataset.result_data:
-            return
+    def _get_appliance_flows(self, type_: ComponentType) -> pd.DataFrame:
+        """Create SvPowerFlow objects of appliances"""
 
         CLS = "cim:SvPowerFlow"
 
@@ -219,32 +377,29 @@ class SvProfileBuilder:
         df["rdf:type"] = CLS
         df[f"{CLS}.p"] = result_data["p"] / 1e6
         df[f"{CLS}.q"] = result_data["q"] / 1e6
-        df[f"{CIM_ID_OBJ}.mRID"] = [f'"{uuid.uuid4()}"' for _ in range(len(df))]
 
-        df[f"{CLS}.Terminal"] = df["_pgm_id"].apply(
-            lambda pid: self._get_terminal_from_extra_info(pid, "_terminal")
-        )
+        df[f"{CLS}.Terminal"] = self._iri_index.get("_terminal", result_data["id"])
 
         missing_term_from = df[df[f"{CLS}.Terminal"].isnull()]["_pgm_id"].tolist()
         if missing_term_from:
             logging.warning("Appliance without Terminal: %s", missing_term_from)
 
         df.dropna(subset=[f"{CLS}.Terminal"], inplace=True)
-        df.drop(columns=["_pgm_id"], inplace=True)
-
-        self.cgmes_dataset.insert_df(
-            df,
-            self.target_graph,
-            include_mrid=True,
+        df[f"{CIM_ID_OBJ}.mRID"] = self._create_mrids(
+            df[f"{CLS}.Terminal"], "SvPowerFlow"
         )
+        df.drop(columns=["_pgm_id"], inplace=True)
+        return df
 
     def _add_topological_islands(self):
 
-        subnets = self._get_islands()
-
-        for subnet in subnets:
+        for subnet in self._topological_islands:
             self.cgmes_dataset.insert_triples(subnet.to_triples(), self.target_graph)
 
+    @cached_property
+    def _topological_islands(self) -> list[TopologicalIsland]:
+        return self._get_islands()
+
     def _get_islands(self) -> list[TopologicalIsland]:
 
         if not self.pgm_dataset.result_data:
@@ -291,19 +446,22 @@ class SvProfileBuilder:
         ref_node_per_subnet: dict[str, str | None],
         subnet_energized: dict[str, bool],
     ) -> list[TopologicalIsland]:
-        islands = []
-        for subnet_name, node_mrids in nodes_per_subnet.items():
-
-            if not subnet_energized.get(subnet_name, False):
-                continue
+        energized = [
+            name for name in nodes_per_subnet if subnet_energized.get(name, False)
+        ]
+        mrids = self.mrid_generator.create(energized, "TopologicalIsland")
 
-            mrid = str(uuid.uuid4())
+        islands = []
+        for subnet_name, mrid in zip(energized, mrids):
+            node_mrids = nodes_per_subnet[subnet_name]
             islands.append(
                 TopologicalIsland(
                     mrid=mrid,
                     iri=self.cgmes_dataset.mrid_to_urn(mrid),
                     name=subnet_name,
-                    topological_nodes=[self._get_formatted_iri(x) for x in node_mrids],
+                    topological_nodes=[
+                        self._get_formatted_iri(x) for x in node_mrids if x is not None
+                    ],
                     angle_ref_node=self._get_formatted_iri(
                         ref_node_per_subnet.get(subnet_name, None)
                     ),
@@ -311,6 +469,10 @@ class SvProfileBuilder:
             )
         return islands
 
+    def _create_mrids(self, sources: pd.Series, kind: str) -> list[str]:
+        """Quoted mRIDs of the SV objects, derived from their referenced objects"""
+        return quote_mrids(self.mrid_generator.create(sources.tolist(), kind))
+
     def _has_active_source(
         self, node: dict[str | ComponentType, Any], topology: Topology
     ) -> bool:
@@ -330,16 +492,15 @@ class SvProfileBuilder:
             self.model_info.to_triples(), self.target_graph
         )
 
-    def _get_terminal_from_extra_info(self, pgm_id, terminal_key):
-        """Get the terminal IRI from the extra info of the PGM dataset."""
-        terminal_iri = self.pgm_dataset.extra_info.get(pgm_id, {}).get(terminal_key)
-        return self._get_formatted_iri(terminal_iri)
+    @cached_property
+    def _iri_index(self) -> PgmIriIndex:
+        return PgmIriIndex(self.pgm_dataset.extra_info, self.cgmes_dataset.base_url)
 
-    def _get_formatted_iri(self, iri: str | None) -> str:
+    def _get_formatted_iri(self, iri: str | None) -> str | None:
         """Format the IRI for output."""
         base_iri = self.cgmes_dataset.base_url + "#"
         if iri is None:
-            return "<missing-iri>"
+            return None
         elif iri.startswith(base_iri) or iri.startswith("http"):
             return f"<{iri}>"
         else:
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from .format_df import format_dataframe
+from .ntriples import parse_ntriples_line, parse_term, parse_tsv_triple
 from .sv_lookup import SvPowerFlowLookup, SvVoltageLookup
 from .unit_converter import convert_dataframe
-from .xml_builder import CimXmlBuilder, CimXmlObject
+from .xml_builder import CimXmlBuilder, CimXmlObject, full_model_to_xml_object
@@ -0,0 +1,100 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+_ESCAPES = {
+    "t": "\t",
+    "b": "\b",
+    "n": "\n",
+    "r": "\r",
+    "f": "\f",
+    '"': '"',
+    "'": "'",
+    "\\": "\\",
+}
+_ESCAPE_PATTERN = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))")
+
+
+def parse_term(term: str) -> tuple[str, bool]:
+    """
+    Parses an RDF term in N-Triples syntax, as used in N-Triples documents
+    and SPARQL TSV results.
+
+    Args:
+        term (str): The term, e.g. `<iri>`, `"literal"^^<datatype>` or `_:b0`
+
+    Returns:
+        tuple[str, bool]: IRIs without angle brackets and literals only with their
+            lexical form, and whether the term is an IRI. Blank nodes and abbreviated
+            literals (e.g. numbers in TSV results) are returned unchanged.
+    """
+    if term.startswith("<"):
+        iri = term[1:-1]
+        return (_unescape(iri) if "\\" in iri else iri), True
+
+    if term.startswith('"'):
+        # the lexical form ends before the datatype or language tag
+        value = term[1 : term.rindex('"')]
+        if "\\" in value:
+            value = _unescape(value)
+        return value, False
+
+    return term, False
+
+
+def parse_ntriples_line(line: str) -> tuple[str, str, str, bool] | None:
+    """
+    Parses a line of an N-Triples document, as written by Fuseki.
+    Terms are expected to be separated by a single space.
+
+    Args:
+        line (str): A line of the N-Triples document
+
+    Returns:
+        tuple[str, str, str, bool] | None: Subject, predicate, object and
+            whether the object is an IRI, see `parse_term`.
+            None for empty lines and comments.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    subject, predicate, obj = line.split(" ", 2)
+    obj = obj[:-1].rstrip()  # remove the trailing "."
+
+    return parse_term(subject)[0], parse_term(predicate)[0], *parse_term(obj)
+
+
+def parse_tsv_triple(line: str) -> tuple[str, str, str, bool]:
+    """
+    Parses a row of a SPARQL TSV result with the variables subject, predicate
+    and object.
+
+    Returns:
+        tuple[str, str, str, bool]: Subject, predicate, object and
+            whether the object is an IRI, see `parse_term`.
+    """
+    subject, predicate, obj = line.rstrip("\r\n").split("\t")
+    return parse_term(subject)[0], parse_term(predicate)[0], *parse_term(obj)
+
+
+def _unescape(value: str) -> str:
+    def replace(match: re.Match) -> str:
+        code = match.group(1) or match.group(2)
+        if code:
+            return chr(int(code, 16))
+        return _ESCAPES.get(match.group(3), match.group(0))
+
+    return _ESCAPE_PATTERN.sub(replace, value)
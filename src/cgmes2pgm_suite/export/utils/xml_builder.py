@@ -14,6 +14,8 @@
 
 from dataclasses import dataclass, field
 
+from cgmes2pgm_suite.common import CgmesFullModel
+
 
 @dataclass
 class CimXmlObject:
@@ -126,6 +128,20 @@ class CimXmlBuilder:
 
         self.file.write(obj.build() + "\n")
 
+    def add_built_objects(self, content: str):
+        """
+        Adds objects, that are already in RDF/XML format, to the file.
+        Used to write many objects of the same structure without creating
+        a `CimXmlObject` for each of them.
+
+        Args:
+            content (str): RDF/XML representation of the objects, see `CimXmlObject.build`
+        """
+        if not self.file:
+            raise ValueError("File is not open. Use 'with' statement to open the file.")
+
+        self.file.write(content)
+
     def _write_rdf_header(self):
         if not self.file:
             return
@@ -139,3 +155,16 @@ class CimXmlBuilder:
     def _write_rdf_footer(self):
         if self.file:
             self.file.write("</rdf:RDF>\n")
+
+
+def full_model_to_xml_object(model_info: CgmesFullModel) -> CimXmlObject:
+    """Converts the model header of a profile to a `CimXmlObject`."""
+    rdf_object = CimXmlObject(iri=model_info.iri, type_="md:FullModel")
+    for _, predicate, obj in model_info.to_triples():
+        if predicate == "rdf:type":
+            continue
+        if obj.startswith("<"):
+            rdf_object.add_reference(predicate, obj[1:-1])
+        else:
+            rdf_object.add_attribute(predicate, obj.strip('"'))
+    return rdf_object
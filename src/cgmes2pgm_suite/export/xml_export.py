@@ -12,12 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import pandas as pd
+import logging
+from collections.abc import Iterable, Iterator
+from urllib.parse import quote
+
+import requests
 from cgmes2pgm_converter.common import CgmesDataset, Profile
 
-from .utils import CimXmlBuilder, CimXmlObject
+from .utils import (
+    CimXmlBuilder,
+    CimXmlObject,
+    parse_ntriples_line,
+    parse_tsv_triple,
+)
 
 DEFAULT_TYPE = "rdf:Description"
+MODEL_HEADER_TYPES = ("md:FullModel", "dm:DifferenceModel")
+REQUEST_TIMEOUT = 600
+
+
+class UngroupedTriplesError(ValueError):
+    """Raised if the triples of a subject are not consecutive."""
 
 
 class GraphToXMLExport:
@@ -32,12 +47,15 @@ class GraphToXMLExport:
         dataset: CgmesDataset,
         source_graph: Profile | str | list[str],
         target_path: str,
+        use_graph_store: bool = True,
     ):
         """
         Args:
             dataset (CgmesDataset): The dataset to be converted to XML
             source_graph (Profile|str|list[str]): The name of the source graph to be exported
             target_path (str): The path where the XML file will be saved
+            use_graph_store (bool): Fetch a single source graph as N-Triples via the
+                Graph Store Protocol (`<base_url>/data`) instead of SPARQL queries
 
         `source_graph` can be a Profile (in which case all graphs for the profile are used),
         a single graph IRI (str) or a list of graph IRIs (list[str]). In case of multiple graphs,
@@ -48,49 +66,68 @@ class GraphToXMLExport:
         self.dataset = dataset
         self.source_graph = source_graph
         self.target_path = target_path
+        self.use_graph_store = use_graph_store
+        self._prefixed: dict[str, str] = {}
 
     def export(self):
         """
         Exports the dataset to an XML file.
         This method retrieves the graph from the dataset and writes it to an XML file at the specified target path.
+
+        A single source graph is fetched as N-Triples via the Graph Store Protocol.
+        Otherwise, or if the triples of a subject are not consecutive in the
+        N-Triples, the triples are requested ordered by subject with a single
+        SPARQL query. In both cases the response is streamed and each object
+        is written as soon as all of its triples are read.
         """
+        if self.use_graph_store and len(self._get_source_graphs()) == 1:
+            try:
+                self._export(_ensure_grouped(self._iter_graph_store_triples()))
+                return
+            except (requests.RequestException, UngroupedTriplesError) as e:
+                logging.info(
+                    "Graph Store export of %s failed, using SPARQL: %s",
+                    self.source_graph,
+                    e,
+                )
+
+        self._export(self._iter_triples())
+
+    def _export(self, triples: Iterable[tuple[str, str, str, bool]]):
         with CimXmlBuilder(
             path=self.target_path, namespaces=self.dataset.get_prefixes()
         ) as file_builder:
-            triples = self._get_all_triples()
-            grouped = triples.groupby("s")
-            model_header_subject = self._get_model_header()
-
-            # Get all FullModel triples
-            full_model_triples = triples[
-                triples["o"].str.contains("FullModel", na=False)
-            ]
-            full_model_ids = full_model_triples["s"].tolist()
-
-            subjects = list(grouped.groups.keys())
-
-            # use only the first FullModel if multiple are present, filter out the others
-            ordered_subjects = [model_header_subject] + [
-                s for s in subjects if s not in full_model_ids
-            ]
-
-            for subject in ordered_subjects:
-                predicates_objects = grouped.get_group(subject)
-                rdf_object = self._build_rdf_object(str(subject), predicates_objects)
-                file_builder.add_object(rdf_object)
-
-    def _build_rdf_object(
-        self, subject: str, predicates_objects: pd.DataFrame
-    ) -> CimXmlObject:
-        mrid = self._to_urn(subject)
-        rdf_object = CimXmlObject(iri=mrid, type_=DEFAULT_TYPE)
-        for _, row in predicates_objects.iterrows():
-            self._add_tuple_to_object(rdf_object, row)
-        return rdf_object
-
-    def _add_tuple_to_object(self, rdf_object: CimXmlObject, row: pd.Series):
-        predicate = self.apply_prefix(row["p"])
-        obj = row["o"]
+            file_builder.add_object(self._get_model_header_object())
+
+            for rdf_object in self._iter_rdf_objects(triples):
+                # the model header is written first, other headers are not exported
+                if rdf_object.type_ not in MODEL_HEADER_TYPES:
+                    file_builder.add_object(rdf_object)
+
+    def _iter_rdf_objects(
+        self, triples: Iterable[tuple[str, str, str, bool]]
+    ) -> Iterator[CimXmlObject]:
+        """Build one object per subject from triples grouped by subject"""
+        rdf_object = None
+        current_subject = None
+
+        for subject, predicate, obj, is_iri in triples:
+            if subject != current_subject:
+                if rdf_object is not None:
+                    yield rdf_object
+                current_subject = subject
+                rdf_object = CimXmlObject(
+                    iri=self._to_urn(str(subject)), type_=DEFAULT_TYPE
+                )
+            self._add_tuple_to_object(rdf_object, predicate, obj, is_iri)
+
+        if rdf_object is not None:
+            yield rdf_object
+
+    def _add_tuple_to_object(
+        self, rdf_object: CimXmlObject, predicate: str, obj, is_iri: bool
+    ):
+        predicate = self.apply_prefix(predicate)
 
         if predicate == "rdf:type":
             if rdf_object.type_ != DEFAULT_TYPE:
@@ -99,29 +136,33 @@ class GraphToXMLExport:
                 )
             rdf_object.set_type(self.apply_prefix(obj))
 
-        elif row["isIRI"]:
+        elif is_iri:
             obj_uuid = self._to_urn(str(obj), is_reference=True)
             rdf_object.add_reference(name=predicate, iri=obj_uuid)
 
         else:
             rdf_object.add_attribute(name=predicate, value=str(obj))
 
-    def _get_all_triples(self) -> pd.DataFrame:
+    def _iter_triples(self) -> Iterator[tuple[str, str, str, bool]]:
+        """All triples of the source graphs ordered by subject, streamed as
+        SPARQL TSV result. The syntax of the object determines whether it is an IRI."""
 
-        query_named = f"""
-        SELECT ?s ?p ?o (isIRI(?o) as ?isIRI)
-        WHERE {{
-            VALUES ?g {{ $SOURCE_GRAPHS }}
-            GRAPH ?g {{
+        query_named = """
+        SELECT ?s ?p ?o
+        WHERE {
+            VALUES ?g { $SOURCE_GRAPHS }
+            GRAPH ?g {
                 ?s ?p ?o .
-            }}
-        }}
+            }
+        }
+        ORDER BY ?s
         """
         query_default = """
-        SELECT ?s ?p ?o (isIRI(?o) as ?isIRI)
-        WHERE {{
+        SELECT ?s ?p ?o
+        WHERE {
             ?s ?p ?o .
-        }}
+        }
+        ORDER BY ?s
         """
 
         if self.source_graph == "default":
@@ -129,17 +170,102 @@ class GraphToXMLExport:
         else:
             query = self._named_query(query_named)
 
-        return self.dataset.query(query, add_prefixes=False)
+        with requests.post(
+            f"{self.dataset.base_url}/query",
+            data={"query": query},
+            headers={"Accept": "text/tab-separated-values"},
+            stream=True,
+            timeout=REQUEST_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+            lines = response.iter_lines(decode_unicode=False)
+            next(lines, None)  # header with the variable names
+            for line in lines:
+                if line:
+                    yield parse_tsv_triple(line.decode("utf-8"))
+
+    def _iter_graph_store_triples(self) -> Iterator[tuple[str, str, str, bool]]:
+        """Triples of the source graph, fetched as N-Triples via the Graph Store Protocol.
+        The syntax of the object determines whether it is an IRI."""
+
+        graph = self._get_source_graphs()[0]
+        if graph == "default":
+            url = f"{self.dataset.base_url}/data?default"
+        else:
+            url = f"{self.dataset.base_url}/data?graph={quote(graph, safe='')}"
+
+        with requests.get(
+            url,
+            headers={"Accept": "application/n-triples"},
+            stream=True,
+            timeout=REQUEST_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=False):
+                triple = parse_ntriples_line(line.decode("utf-8"))
+                if triple is not None:
+                    yield triple
+
+    def _get_model_header_object(self) -> CimXmlObject:
+        """Model header (FullModel or DifferenceModel) of the (first) source graph"""
+
+        # validates, that there is exactly one model header
+        self._get_model_header()
+
+        query_default = """
+            SELECT ?s ?p ?o (isIRI(?o) as ?isIRI)
+            WHERE {
+                VALUES ?_type {md:FullModel dm:DifferenceModel}
+                ?s a ?_type ;
+                    ?p ?o .
+            }
+        """
+
+        query_named = """
+            SELECT ?s ?p ?o (isIRI(?o) as ?isIRI)
+            WHERE {
+                VALUES ?g { $SOURCE_GRAPHS }
+                GRAPH ?g {
+                    VALUES ?_type {md:FullModel dm:DifferenceModel}
+                    ?s a ?_type ;
+                        ?p ?o .
+                }
+            }
+        """
+
+        if self.source_graph == "default":
+            query = query_default
+        else:
+            query = self._named_query(query_named, only_one_graph=True)
+
+        triples = self.dataset.query(query)
+        return next(
+            self._iter_rdf_objects(
+                zip(
+                    triples["s"].tolist(),
+                    triples["p"].tolist(),
+                    triples["o"].tolist(),
+                    triples["isIRI"].tolist(),
+                )
+            )
+        )
 
     def apply_prefix(self, predicate: str) -> str:
 
+        # the same few predicates and types occur in every object
+        if predicate in self._prefixed:
+            return self._prefixed[predicate]
+
         # predicate may be full uri, replace with prefix if available
+        prefixed = predicate
         for prefix, uri in self.dataset.get_prefixes().items():
             if predicate.startswith(uri):
-                return f"{prefix}:{predicate[len(uri):]}"
+                prefixed = f"{prefix}:{predicate[len(uri):]}"
+                break
 
         # if no prefix found, return the full uri
-        return predicate
+        self._prefixed[predicate] = prefixed
+        return prefixed
 
     def _to_urn(self, iri: str, is_reference=False) -> str:
         """
@@ -208,22 +334,42 @@ class GraphToXMLExport:
 
         return result.iloc[0]["s"]
 
-    def _named_query(self, query_named: str, only_one_graph: bool = False) -> str:
-        args = {"$SOURCE_GRAPHS": ""}
+    def _get_source_graphs(self) -> list[str]:
         if isinstance(self.source_graph, list):
-            sg = self.source_graph
-            if only_one_graph and len(self.source_graph) > 1:
-                sg = [self.source_graph[0]]
-            args["$SOURCE_GRAPHS"] = " ".join(f"<{g}>" for g in sg)
+            return self.source_graph
         elif isinstance(self.source_graph, Profile):
-            sg = self.dataset.named_graphs.get(self.source_graph)
-            if only_one_graph and len(sg) > 1:
-                sg = [list(sg)[0]]
-            args["$SOURCE_GRAPHS"] = " ".join(f"<{g}>" for g in sg)
+            return list(self.dataset.named_graphs.get(self.source_graph))
         elif isinstance(self.source_graph, str):
-            args["$SOURCE_GRAPHS"] = f"<{self.source_graph}>"
+            return [self.source_graph]
         else:
             raise ValueError(
                 f"Invalid source_graph type: {type(self.source_graph)}. Must be Profile, str or list of str."
             )
+
+    def _named_query(self, query_named: str, only_one_graph: bool = False) -> str:
+        graphs = self._get_source_graphs()
+        if only_one_graph:
+            graphs = graphs[:1]
+        args = {"$SOURCE_GRAPHS": " ".join(f"<{g}>" for g in graphs)}
         return self.dataset.format_query(query_named, args)
+
+
+def _ensure_grouped(
+    triples: Iterable[tuple[str, str, str, bool]],
+) -> Iterator[tuple[str, str, str, bool]]:
+    """Pass through triples, that are grouped by subject
+
+    Raises:
+        UngroupedTriplesError: If the triples of a subject are not consecutive
+    """
+    subjects = set()
+    current_subject = None
+    for triple in triples:
+        if triple[0] != current_subject:
+            current_subject = triple[0]
+            if current_subject in subjects:
+                raise UngroupedTriplesError(
+                    f"Triples of {current_subject} are not grouped by subject"
+                )
+            subjects.add(current_subject)
+        yield triple
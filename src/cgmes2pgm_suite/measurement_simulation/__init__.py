@@ -20,7 +20,10 @@ based on an provided SV-Profile.
 from .meas_ranges import (
     MeasurementRange,
     MeasurementRangeSet,
+    MeasurementRangeTable,
     MeasurementSimulationConfiguration,
+    RandomStream,
+    RandomStreams,
 )
 from .measurement_builder import (
     MeasurementBuilder,
@@ -28,3 +31,8 @@ from .measurement_builder import (
     ValueSourceBuilder,
     VoltageMeasurementBuilder,
 )
+from .measurement_series_builder import MeasurementSeriesBuilder
+from .measurement_value_updater import MeasurementValueUpdater
+from .pgm_measurement_simulator import PgmMeasurementSimulator, SvValues
+from .simulated_values import SimulatedAnalogValues
+from .sv_snapshot import SvSnapshot
@@ -12,25 +12,88 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import IntEnum
 
 import numpy as np
 
+# Number of values drawn from the generator of a single chunk
+DEFAULT_CHUNK_SIZE = 4096
 
-class RandomNumberGenerator:
-    _seed = None
-    _rng = None
 
-    @staticmethod
-    def set_seed(seed: int):
-        RandomNumberGenerator._seed = seed
-        RandomNumberGenerator._rng = np.random.default_rng(seed)
+class RandomStream(IntEnum):
+    """Independent random number streams of the measurement simulation"""
 
-    @staticmethod
-    def get_rng():
-        if RandomNumberGenerator._rng is None:
-            RandomNumberGenerator._rng = np.random.default_rng()
-        return RandomNumberGenerator._rng
+    VOLTAGE = 0
+    ACTIVE_POWER = 1
+    REACTIVE_POWER = 2
+
+
+class RandomStreams:
+    """
+    Reproducible random number streams derived from a single seed.
+
+    Each generator is identified by a key, e.g. the `RandomStream` and the chunk,
+    and seeded with the same child `SeedSequence` that `SeedSequence.spawn` creates
+    for this key. Generators do not depend on the order in which they are created,
+    so the simulation can be split among parallel workers (e.g. by value type,
+    chunks of values or time steps) with bit-identical results for a given seed
+    and `chunk_size`.
+
+    Args:
+        seed (int | None): Seed of all streams, None for fresh entropy
+        chunk_size (int): Number of values per chunk in `standard_normal`
+    """
+
+    def __init__(self, seed: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self.chunk_size = chunk_size
+        self._n_updates = 0
+
+    def next_update(self) -> int:
+        """Number of the next update of existing values, used as key of its streams.
+
+        Repeated updates in a session draw new noise, that is reproducible
+        for a given seed and order of the updates.
+        """
+        self._n_updates += 1
+        return self._n_updates
+
+    def get_rng(self, *key: int) -> np.random.Generator:
+        """Generator of the child seed sequence with the given spawn key."""
+        seed_sequence = np.random.SeedSequence(
+            self._seed_sequence.entropy,
+            spawn_key=self._seed_sequence.spawn_key + tuple(int(k) for k in key),
+        )
+        return np.random.default_rng(seed_sequence)
+
+    def standard_normal(self, n: int, *key: int, start: int = 0) -> np.ndarray:
+        """Standard normal values `start` to `start + n` of a stream.
+
+        The values of a stream are drawn in chunks of `chunk_size` values, each from
+        its own generator `get_rng(*key, chunk)`. A worker can draw any slice of the
+        stream and gets the same values as a single draw of the whole stream.
+
+        Args:
+            n (int): Number of values
+            *key (int): Key of the stream, e.g. `RandomStream.VOLTAGE`
+            start (int): Position of the first value in the stream
+
+        Returns:
+            np.ndarray: `n` standard normal values
+        """
+        end = start + n
+        chunks = [
+            self.get_rng(*key, chunk).standard_normal(
+                min(self.chunk_size, end - chunk * self.chunk_size)
+            )
+            for chunk in range(start // self.chunk_size, -(-end // self.chunk_size))
+        ]
+        if not chunks:
+            return np.zeros(0)
+
+        offset = start % self.chunk_size
+        return np.concatenate(chunks)[offset : offset + n]
 
 
 @dataclass
@@ -49,12 +112,38 @@ class MeasurementRange:
         max_abs = np.maximum(np.abs(self.max_value), np.abs(self.min_value))
         return np.abs((1 - self.accuracy) * max_abs / 3)
 
-    def distort_measurement(self, value: float) -> float:
-        return float(
-            RandomNumberGenerator.get_rng().normal(
-                value, self._get_sigma() * self.sigma_factor
-            )
-        )
+    def distort_measurement(self, value: float, rng: np.random.Generator) -> float:
+        return float(rng.normal(value, self._get_sigma() * self.sigma_factor))
+
+
+@dataclass
+class MeasurementRangeTable:
+    """
+    Measurement ranges of multiple values as arrays, see `MeasurementRangeSet.get_by_values`.
+
+    Attributes:
+        min_value (np.ndarray): Lower bound of the range of each value
+        max_value (np.ndarray): Upper bound of the range of each value
+        accuracy (np.ndarray): Accuracy of the range, NaN if not set
+        sigma (np.ndarray): Sigma of the range, NaN if not set
+        sigma_factor (np.ndarray): Factor to multiply sigma when distorting measurements
+    """
+
+    min_value: np.ndarray
+    max_value: np.ndarray
+    accuracy: np.ndarray
+    sigma: np.ndarray
+    sigma_factor: np.ndarray
+
+    def get_sigma(self) -> np.ndarray:
+        """Sigma of each range, derived from the accuracy if not set."""
+        max_abs = np.maximum(np.abs(self.max_value), np.abs(self.min_value))
+        sigma_from_accuracy = np.abs((1 - self.accuracy) * max_abs / 3)
+        return np.where(np.isnan(self.sigma), sigma_from_accuracy, self.sigma)
+
+    def get_sigma_values(self) -> list[float | None]:
+        """Configured sigma of each range, None if not set (same as `MeasurementRange.sigma`)"""
+        return [None if np.isnan(s) else float(s) for s in self.sigma]
 
 
 class MeasurementRangeSet:
@@ -76,9 +165,25 @@ class MeasurementRangeSet:
         self.apply_range = apply_range
         self.zero_threshold = zero_threshold
 
+        # Attributes of the ranges as arrays for `get_by_values`, None as NaN
+        self._columns = {
+            attr: np.array(
+                [
+                    np.nan if getattr(r, attr) is None else getattr(r, attr)
+                    for r in ranges
+                ],
+                dtype=float,
+            )
+            for attr in ("min_value", "max_value", "accuracy", "sigma", "sigma_factor")
+        }
+        # With disjoint ranges, the first range containing a value is the last
+        # range starting at or below it
+        self._disjoint = bool(
+            np.all(self._columns["max_value"][:-1] <= self._columns["min_value"][1:])
+        )
+
     @staticmethod
     def from_dict(data):
-
         apply_range = True
         zero_threshold = 0
 
@@ -110,7 +215,6 @@ class MeasurementRangeSet:
         return MeasurementRangeSet(ranges, default_range, apply_range, zero_threshold)
 
     def get_by_value(self, value: float) -> MeasurementRange:
-
         for r in self.ranges:
             if r.min_value <= value < r.max_value:
                 return r
@@ -122,7 +226,81 @@ class MeasurementRangeSet:
             self.default_range.sigma,
         )
 
-    def distort_measurement(self, meas_range: MeasurementRange, value: float) -> float:
+    def get_by_values(self, values) -> MeasurementRangeTable:
+        """Vectorized `get_by_value` for an array of values.
+
+        Args:
+            values (array_like): Values to look up, e.g. the nominal voltages
+
+        Returns:
+            MeasurementRangeTable: Range of each value
+        """
+        values = np.asarray(values, dtype=float)
+        idx = self._find_ranges(values)
+        found = idx >= 0
+        idx = np.where(found, idx, 0)
+
+        def column(attr: str, default: np.ndarray | float | None) -> np.ndarray:
+            default = np.nan if default is None else default
+            default = np.broadcast_to(np.asarray(default, dtype=float), values.shape)
+            if not self.ranges:
+                return default.copy()
+            return np.where(found, self._columns[attr][idx], default)
+
+        default = self.default_range
+        return MeasurementRangeTable(
+            min_value=column("min_value", values * default.min_value),
+            max_value=column("max_value", values * default.max_value),
+            accuracy=column("accuracy", default.accuracy),
+            sigma=column("sigma", default.sigma),
+            # the sigma factor of the default range is not applied, see `get_by_value`
+            sigma_factor=column("sigma_factor", 1.0),
+        )
+
+    def _find_ranges(self, values: np.ndarray) -> np.ndarray:
+        """Index of the first range containing each value, -1 if there is none."""
+        if not self.ranges:
+            return np.full(values.shape, -1)
+
+        min_values = self._columns["min_value"]
+        max_values = self._columns["max_value"]
+
+        if self._disjoint:
+            idx = np.searchsorted(min_values, values, side="right") - 1
+            inside = (idx >= 0) & (values < max_values[np.maximum(idx, 0)])
+            return np.where(inside, idx, -1)
+
+        inside = (min_values <= values[:, None]) & (values[:, None] < max_values)
+        return np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+
+    def distort_measurements(
+        self, values, ranges: MeasurementRangeTable, noise: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized `distort_measurement` for an array of values.
+
+        The noise is passed in as standard normal values, one per value,
+        see `RandomStreams.standard_normal`.
+
+        Args:
+            values (array_like): Values to distort
+            ranges (MeasurementRangeTable): Range of each value, see `get_by_values`
+            noise (np.ndarray): Standard normal noise of each value
+
+        Returns:
+            np.ndarray: Distorted values
+        """
+        values = np.asarray(values, dtype=float)
+        if not self.apply_range:
+            return values.copy()
+
+        scale = ranges.get_sigma() * ranges.sigma_factor
+        return np.where(
+            np.abs(values) < self.zero_threshold, 0.0, values + scale * noise
+        )
+
+    def distort_measurement(
+        self, meas_range: MeasurementRange, value: float, rng: np.random.Generator
+    ) -> float:
         """Use given range object to distort the given value. If application of range is disabled,
         then the value will be returned unmodified, i.e. the SV value will be returned. Values (abs)
         below the configured threshold (zeroThreshold) will not be distorted.
@@ -133,7 +311,7 @@ class MeasurementRangeSet:
         if abs(value) < self.zero_threshold:
             return 0
 
-        return meas_range.distort_measurement(value)
+        return meas_range.distort_measurement(value, rng)
 
 
 @dataclass
@@ -144,11 +322,22 @@ class MeasurementSimulationConfiguration:
     Attributes:
         power_ranges (MeasurementRangeSet): Set of measurement ranges for PQ values.
         voltage_ranges (MeasurementRangeSet): Set of measurement ranges for voltage values.
+        direct (bool): Simulate the sensors directly in the converted PGM model
+            instead of writing OP- and MEAS-Profile into the dataset.
+        update_values (bool): Only replace the values of existing measurements
+            instead of dropping and rebuilding OP- and MEAS-Profile.
+        mrid_namespace (str | None): Namespace to derive deterministic mRIDs of the
+            simulated objects, None for random mRIDs
+        random_streams (RandomStreams): Random number streams derived from `seed`
     """
 
     seed: int
     power_ranges: MeasurementRangeSet
     voltage_ranges: MeasurementRangeSet
+    direct: bool = False
+    update_values: bool = False
+    mrid_namespace: str | None = None
+    random_streams: RandomStreams = field(init=False, repr=False)
 
     def __post_init__(self):
-        RandomNumberGenerator.set_seed(self.seed)
+        self.random_streams = RandomStreams(self.seed)
@@ -16,10 +16,13 @@ import logging
 
 from cgmes2pgm_converter.common import CgmesDataset, Profile, Timer
 
-from cgmes2pgm_suite.common import CgmesFullModel
+from cgmes2pgm_suite.common import CgmesFullModel, MridGenerator
 
 from .meas_ranges import MeasurementSimulationConfiguration
+from .measurement_value_updater import MeasurementValueUpdater
 from .power_measurement_builder import PowerMeasurementBuilder
+from .simulated_values import DEFAULT_TIMESTAMP, SimulatedAnalogValues
+from .sv_snapshot import SvSnapshot
 from .value_source_builder import ValueSourceBuilder
 from .voltage_measurement_builder import VoltageMeasurementBuilder
 
@@ -29,6 +32,7 @@ class MeasurementBuilder:
     """
     Simulates measurements based on the SV-Profile in the CGMES dataset.
     The current OP- and MEAS-Profile are dropped and replaced by the simulated measurements.
+    With `update_from_sv`, existing measurements only get new values.
     """
 
     def __init__(
@@ -56,74 +60,109 @@ class MeasurementBuilder:
 
         self._datasource = datasource
         self._config = config
+        self._mrid_generator = MridGenerator(config.mrid_namespace)
+
+    @property
+    def model_info_op(self) -> CgmesFullModel:
+        """Model header of the OP-Profile."""
+        return self._model_info_op
 
     def build_from_sv(self):
+        values = self.build_op_from_sv()
+
+        if self._model_info_meas is not None:
+            self._init_graph(self._model_info_meas)
+            [
+                self._datasource.insert_triples(self._model_info_meas.to_triples(), pr)
+                for pr in self._to_graph(Profile.MEAS)
+            ]
+
+        with Timer("Building Measurement Values", loglevel=logging.INFO):
+            for vals in values:
+                vals_meas = vals.to_meas_df(
+                    vals.distort(self._config.random_streams),
+                    DEFAULT_TIMESTAMP,
+                    self._datasource.cim_namespace,
+                )
+                [
+                    self._datasource.insert_df(vals_meas, pr, include_mrid=False)
+                    for pr in self._to_graph(Profile.MEAS)
+                ]
+
+    def update_from_sv(self):
+        """
+        Simulates new values for the AnalogValues in the OP-Profile and replaces
+        only the values in the MEAS-Profile. If there are no AnalogValues yet,
+        OP- and MEAS-Profile are built, see `build_from_sv`.
+        """
+        updater = MeasurementValueUpdater(self._datasource, self._config)
+        if not updater.has_analog_values():
+            logging.info("No existing measurements to update, building new ones")
+            self.build_from_sv()
+            return
+
+        updater.update()
+
+    def build_op_from_sv(self) -> list[SimulatedAnalogValues]:
+        """
+        Drops the current OP- and MEAS-Profile and builds the OP-Profile
+        with the Analogs and AnalogValues, but without MEAS-Profile.
+
+        Returns:
+            list[SimulatedAnalogValues]: Voltage, P and Q AnalogValues to be written
+                to the MEAS-Profile
+        """
 
         self._datasource.drop_profile(Profile.OP)
         self._datasource.drop_profile(Profile.MEAS)
 
-        self._build_model_info()
+        self._init_graph(self._model_info_op)
+        [
+            self._datasource.insert_triples(self._model_info_op.to_triples(), pr)
+            for pr in self._to_graph(Profile.OP)
+        ]
 
-        builder = ValueSourceBuilder(self._datasource)
+        builder = ValueSourceBuilder(self._datasource, self._mrid_generator)
         builder.build_from_sv()
         sources = builder.get_sources()
 
+        # SV values and topology are queried once for both builders
+        sv_snapshot = SvSnapshot(self._datasource)
+
         builder = VoltageMeasurementBuilder(
             self._datasource,
             self._config.voltage_ranges,
             sources,
+            sv_snapshot=sv_snapshot,
+            mrid_generator=self._mrid_generator,
+            random_streams=self._config.random_streams,
         )
         with Timer("Building Voltage Measurements", loglevel=logging.INFO):
-            builder.build_from_sv()
+            voltage_values = builder.build_op_from_sv()
 
         builder = PowerMeasurementBuilder(
             self._datasource,
             self._config.power_ranges,
             sources,
+            sv_snapshot=sv_snapshot,
+            mrid_generator=self._mrid_generator,
+            random_streams=self._config.random_streams,
         )
         with Timer("Building Power Measurements", loglevel=logging.INFO):
-            builder.build_from_sv()
-
-    def _build_model_info(self):
-        """
-        Builds the model information for the OP and MEAS profiles.
-        """
+            power_values = builder.build_op_from_sv()
 
-        self._init_graphs_for_measurements()
-
-        [
-            self._datasource.insert_triples(self._model_info_op.to_triples(), pr)
-            for pr in self._to_graph(Profile.OP)
-        ]
+        return [voltage_values, *power_values]
 
-        if self._model_info_meas is not None:
-            [
-                self._datasource.insert_triples(self._model_info_meas.to_triples(), pr)
-                for pr in self._to_graph(Profile.MEAS)
-            ]
-
-    def _init_graphs_for_measurements(self):
-        # determine profiles in OP FullModel
-        profiles = [Profile.parse(p) for p in self._model_info_op.profile]
-        # determine graph name for these profiles
+    def _init_graph(self, model_info: CgmesFullModel):
+        """Assigns the same graph name to all profiles of the model"""
+        profiles = [Profile.parse(p) for p in model_info.profile]
         graph_name = self._datasource.named_graphs.determine_graph_name(
             [p.profile for p in profiles],
-            [self._model_info_op.modeling_authority_set],
+            [model_info.modeling_authority_set],
         )
-        # add same graph name for above profiles
         for p in profiles:
             self._datasource.named_graphs.add(p, graph_name)
 
-        # do the same for MEAS FullModel if it exists
-        if self._model_info_meas is not None:
-            profiles = [Profile.parse(p) for p in self._model_info_meas.profile]
-            graph_name = self._datasource.named_graphs.determine_graph_name(
-                [p.profile for p in profiles],
-                [self._model_info_meas.modeling_authority_set],
-            )
-            for p in profiles:
-                self._datasource.named_graphs.add(p, graph_name)
-
     def _to_graph(self, profile: Profile) -> list[Profile | str]:
         to_graph: list[Profile | str] = [profile]
         if not self._datasource.split_profiles:
@@ -0,0 +1,245 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from cgmes2pgm_converter.common import CgmesDataset, Profile, Timer
+
+from cgmes2pgm_suite.common import CgmesFullModel
+from cgmes2pgm_suite.export.utils import CimXmlBuilder, full_model_to_xml_object
+
+from .meas_ranges import MeasurementSimulationConfiguration
+from .measurement_builder import MeasurementBuilder
+from .simulated_values import SimulatedAnalogValues
+
+MEAS_PROFILE = "http://iec.ch/TC57/ns/CIM/OperationMeas/4.0"
+
+
+class MeasurementSeriesBuilder:
+    """
+    Simulates a time series of measurements based on the SV-Profile.
+
+    The OP-Profile with the Analogs, AnalogValues and sigmas is built once by
+    `build_op`. Afterwards, a separate MEAS-Profile is created for each timestamp,
+    either as named graph in the dataset (`write_graphs`) or as CIM/XML file
+    (`write_xml`). The values of all steps are drawn vectorized per step, so only
+    one step is kept in memory.
+
+    The noise of consecutive steps follows an AR(1) process
+    `e_t = correlation * e_(t-1) + sqrt(1 - correlation²) * n_t` with standard normal
+    `n_t`, scaled by the sigma of the measurement range. Each step has the same
+    distribution as a single simulation, `correlation=0` draws independent noise.
+    The innovations `n_t` are drawn from their own streams per step. Only with
+    `correlation=0` the steps are independent and can be split across workers,
+    otherwise the noise of a step depends on all previous steps and the series is
+    simulated in order.
+
+    Active and reactive powers can be scaled per step, e.g. by a load profile.
+    Voltages are not scaled.
+
+    Args:
+        datasource (CgmesDataset): Dataset with the SV-Profile
+        config (MeasurementSimulationConfiguration): Measurement ranges
+        timestamps (Iterable[datetime | str]): Timestamp of each step,
+            naive timestamps are interpreted as UTC
+        power_scaling (np.ndarray | None): Factor of the powers per step
+        correlation (float): Correlation of the noise of consecutive steps in [0, 1)
+    """
+
+    def __init__(
+        self,
+        datasource: CgmesDataset,
+        config: MeasurementSimulationConfiguration,
+        timestamps: Iterable[datetime | str],
+        power_scaling: np.ndarray | None = None,
+        correlation: float = 0.0,
+    ):
+        self._datasource = datasource
+        self._config = config
+        self._timestamps = [_format_timestamp(t) for t in timestamps]
+        self._power_scaling = (
+            np.ones(len(self._timestamps))
+            if power_scaling is None
+            else np.asarray(power_scaling, dtype=float)
+        )
+        self._correlation = correlation
+
+        if self._power_scaling.shape != (len(self._timestamps),):
+            raise ValueError(
+                f"Expected one power scaling factor per timestamp ({len(self._timestamps)}),"
+                f" got shape {self._power_scaling.shape}"
+            )
+        if not 0 <= correlation < 1:
+            raise ValueError(f"Correlation must be in [0, 1), got {correlation}")
+
+        self._model_info_op: CgmesFullModel | None = None
+        self._values: list[SimulatedAnalogValues] = []
+
+    def build_op(self):
+        """
+        Drops the current OP- and MEAS-Profile and builds the OP-Profile
+        shared by all steps.
+        """
+        builder = MeasurementBuilder(
+            self._datasource, self._config, separate_models=True
+        )
+        self._values = builder.build_op_from_sv()
+        self._model_info_op = builder.model_info_op
+
+    def iter_snapshots(self) -> Iterator[tuple[str, list[np.ndarray]]]:
+        """Simulate the measurement values step by step.
+
+        Yields:
+            tuple[str, list[np.ndarray]]: Timestamp and values of each
+                `SimulatedAnalogValues` of the OP-Profile
+        """
+        if self._model_info_op is None:
+            raise ValueError("OP-Profile is not built yet, call `build_op` first.")
+
+        streams = self._config.random_streams
+        innovation_factor = np.sqrt(1 - self._correlation**2)
+        noise: list[np.ndarray | None] = [None] * len(self._values)
+
+        for step, timestamp in enumerate(self._timestamps):
+            snapshot = []
+            for i, vals in enumerate(self._values):
+                value = (
+                    vals.value * self._power_scaling[step]
+                    if vals.is_power
+                    else vals.value
+                )
+
+                # innovations are reproducible per step, the noise itself depends
+                # on the previous step unless correlation is 0
+                innovation = streams.standard_normal(len(value), vals.stream, step)
+                if noise[i] is None:
+                    noise[i] = innovation
+                else:
+                    noise[i] = (
+                        self._correlation * noise[i] + innovation_factor * innovation
+                    )
+
+                snapshot.append(
+                    vals.range_set.distort_measurements(value, vals.ranges, noise[i])
+                )
+
+            yield timestamp, snapshot
+
+    def write_graphs(self) -> list[str]:
+        """
+        Write the MEAS-Profile of each step into a separate named graph.
+
+        The graphs are not registered as MEAS-Profile of the dataset, add the graph
+        of the step to be converted to `CgmesDataset.named_graphs`.
+
+        Returns:
+            list[str]: Name of the graph of each step
+        """
+        prefix = self._datasource.named_graphs.determine_graph_name(
+            [Profile.MEAS], [self._model_info_op.modeling_authority_set]
+        )
+        graphs = []
+
+        with Timer(
+            f"Writing {len(self._timestamps)} MEAS-Profiles", loglevel=logging.INFO
+        ):
+            for timestamp, snapshot in self.iter_snapshots():
+                graph = f"{prefix}_{_compact_timestamp(timestamp)}"
+                model_info = self._create_model_info(timestamp)
+                self._datasource.insert_triples(model_info.to_triples(), graph)
+
+                for vals, values in zip(self._values, snapshot):
+                    self._datasource.insert_df(
+                        vals.to_meas_df(
+                            values, timestamp, self._datasource.cim_namespace
+                        ),
+                        graph,
+                        include_mrid=False,
+                    )
+                graphs.append(graph)
+
+        return graphs
+
+    def write_xml(self, folder: str) -> list[str]:
+        """
+        Write the MEAS-Profile of each step into a separate CIM/XML file
+        `meas_<timestamp>.xml` without inserting it into the dataset.
+
+        Args:
+            folder (str): Folder of the files
+
+        Returns:
+            list[str]: Path of the file of each step
+        """
+        os.makedirs(folder, exist_ok=True)
+        namespaces = self._datasource.get_prefixes()
+
+        # rdf:about is the same in all steps
+        headers = [
+            f'  <cim:AnalogValue rdf:about="urn:uuid:{mrid}">\n'
+            "    <cim:AnalogValue.value>"
+            for vals in self._values
+            for mrid in vals.mrid
+        ]
+        paths = []
+
+        with Timer(
+            f"Writing {len(self._timestamps)} MEAS-Profiles", loglevel=logging.INFO
+        ):
+            for timestamp, snapshot in self.iter_snapshots():
+                path = os.path.join(folder, f"meas_{_compact_timestamp(timestamp)}.xml")
+                trailer = (
+                    "</cim:AnalogValue.value>\n"
+                    f"    <cim:MeasurementValue.timeStamp>{timestamp}"
+                    "</cim:MeasurementValue.timeStamp>\n"
+                    "  </cim:AnalogValue>\n"
+                )
+                values = np.concatenate(snapshot).tolist()
+
+                with CimXmlBuilder(path, namespaces) as file_builder:
+                    file_builder.add_object(
+                        full_model_to_xml_object(self._create_model_info(timestamp))
+                    )
+                    file_builder.add_built_objects(
+                        "".join(
+                            f"{header}{value}{trailer}"
+                            for header, value in zip(headers, values)
+                        )
+                    )
+                paths.append(path)
+
+        return paths
+
+    def _create_model_info(self, timestamp: str) -> CgmesFullModel:
+        return CgmesFullModel(
+            profile=[MEAS_PROFILE],
+            description=f"Simulated measurements {timestamp}",
+            dependent_on=[self._model_info_op.iri],
+            scenario_time=timestamp,
+        )
+
+
+def _format_timestamp(timestamp: datetime | str) -> str:
+    ts = pd.Timestamp(timestamp)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _compact_timestamp(timestamp: str) -> str:
+    return timestamp.replace("-", "").replace(":", "")
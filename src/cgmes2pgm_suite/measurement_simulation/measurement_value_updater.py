@@ -0,0 +1,204 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+import pandas as pd
+from cgmes2pgm_converter.common import CgmesDataset, Profile, Timer
+from cgmes2pgm_converter.common.cgmes_dataset import MAX_TRIPLES_PER_INSERT
+
+from .meas_ranges import MeasurementSimulationConfiguration, RandomStream
+from .simulated_values import DEFAULT_TIMESTAMP, SimulatedAnalogValues
+from .sv_snapshot import SvSnapshot, select_in_profile
+
+# Snapshot attribute, value and key columns and random stream of each measurement type
+_SV_COLUMNS = {
+    "Voltage": ("voltages", "u", "psr", "tn", RandomStream.VOLTAGE),
+    "ThreePhaseActivePower": (
+        "power_flows",
+        "p",
+        "term",
+        "term",
+        RandomStream.ACTIVE_POWER,
+    ),
+    "ThreePhaseReactivePower": (
+        "power_flows",
+        "q",
+        "term",
+        "term",
+        RandomStream.REACTIVE_POWER,
+    ),
+}
+
+
+class MeasurementValueUpdater:
+    """
+    Re-simulates the values of existing AnalogValues from the current SV-Profile.
+
+    The Analogs, AnalogValues and MeasurementValueSources of the OP-Profile are kept.
+    Only value and timestamp of the AnalogValues in the MEAS-Profile are replaced
+    in the graph holding the previous value, keeping the IRIs of the AnalogValues.
+    The cost is proportional to the number of values.
+    AnalogValues are matched to the SV-Profile by the TopologicalNode (voltages)
+    or Terminal (powers) of their Analog.
+    """
+
+    analog_value_query = """
+        ?av cim:AnalogValue.Analog ?analog;
+            cim:IdentifiedObject.mRID ?mrid.
+        ?analog cim:Measurement.measurementType ?type;
+                cim:Measurement.Terminal ?term;
+                cim:Measurement.PowerSystemResource ?psr.
+    """
+
+    update_query = """
+        DELETE {
+            $GRAPH_START
+                ?av cim:AnalogValue.value ?old_value.
+                ?av cim:MeasurementValue.timeStamp ?old_timestamp.
+            $GRAPH_END
+        }
+        INSERT {
+            $GRAPH_START
+                ?av cim:AnalogValue.value ?value.
+                ?av cim:MeasurementValue.timeStamp "$TIMESTAMP".
+            $GRAPH_END
+        }
+        WHERE {
+            VALUES (?av ?value) { $VALUES }
+            $GRAPH_START
+                ?av cim:AnalogValue.value ?old_value.
+                OPTIONAL { ?av cim:MeasurementValue.timeStamp ?old_timestamp. }
+            $GRAPH_END
+        }
+    """
+
+    def __init__(
+        self,
+        datasource: CgmesDataset,
+        config: MeasurementSimulationConfiguration,
+        sv_snapshot: SvSnapshot | None = None,
+    ):
+        self._datasource = datasource
+        self._config = config
+        self._sv_snapshot = sv_snapshot or SvSnapshot(datasource)
+
+    def has_analog_values(self) -> bool:
+        """Whether the OP-Profile contains AnalogValues, that can be updated."""
+        if not self._datasource.named_graphs.get(Profile.MEAS):
+            return False
+        return not self._get_analog_values().empty
+
+    def update(self, timestamp: str = DEFAULT_TIMESTAMP):
+        """Replace value and timestamp of all AnalogValues with newly simulated values.
+
+        Each update draws new noise from the streams keyed by
+        `RandomStreams.next_update`.
+
+        Args:
+            timestamp (str): Timestamp of the new values
+        """
+        analog_values = self._get_analog_values()
+        update_key = self._config.random_streams.next_update()
+
+        for measurement_type, columns in _SV_COLUMNS.items():
+            sv_attr, value_col, key, sv_key, stream = columns
+            of_type = analog_values[analog_values["type"] == measurement_type]
+            sv = getattr(self._sv_snapshot, sv_attr)[[sv_key, value_col, "nomV"]]
+            matched = of_type.merge(
+                sv.drop_duplicates(sv_key), left_on=key, right_on=sv_key
+            )
+
+            n_missing = len(of_type) - len(matched)
+            if n_missing:
+                logging.warning(
+                    "%d %s AnalogValues without SV value keep their previous value",
+                    n_missing,
+                    measurement_type,
+                )
+            if matched.empty:
+                continue
+
+            range_set = (
+                self._config.voltage_ranges
+                if measurement_type == "Voltage"
+                else self._config.power_ranges
+            )
+            values = SimulatedAnalogValues(
+                mrid=matched["mrid"].tolist(),
+                value=matched[value_col].to_numpy(dtype=float),
+                ranges=range_set.get_by_values(matched["nomV"]),
+                range_set=range_set,
+                is_power=measurement_type != "Voltage",
+                stream=stream,
+            )
+
+            with Timer(
+                f"Updating {len(matched)} {measurement_type} Values",
+                loglevel=logging.INFO,
+            ):
+                self._replace_values(
+                    matched["av"].tolist(),
+                    values.distort(self._config.random_streams, update_key).tolist(),
+                    timestamp,
+                )
+
+    def _get_analog_values(self) -> pd.DataFrame:
+        """AnalogValues with the columns `av`, `mrid`, `type`, `term` and `psr`"""
+        analog_values = select_in_profile(
+            self._datasource, self.analog_value_query, Profile.OP
+        )
+        return analog_values.drop_duplicates("av")
+
+    def _replace_values(
+        self, analog_values: list[str], values: list[float], timestamp: str
+    ):
+        """Replace value and timestamp of the AnalogValues in the MEAS graphs,
+        that contain their previous value"""
+        # each AnalogValue deletes and inserts two triples
+        chunk_size = MAX_TRIPLES_PER_INSERT // 2
+        rows = [f"(<{av}> {value!r})" for av, value in zip(analog_values, values)]
+
+        for graph in self._get_graph_uris(Profile.MEAS):
+            if graph == self._datasource.named_graphs.default_graph:
+                graph_start, graph_end = "", ""
+            else:
+                graph_start, graph_end = f"GRAPH <{graph}> {{", "}"
+
+            for start in range(0, len(rows), chunk_size):
+                args = {
+                    "$GRAPH_START": graph_start,
+                    "$GRAPH_END": graph_end,
+                    "$TIMESTAMP": timestamp,
+                    "$VALUES": " ".join(rows[start : start + chunk_size]),
+                }
+                self._datasource.update(
+                    self._datasource.format_query(self.update_query, args)
+                )
+
+    def _get_graph_uris(self, profile: Profile) -> list[str]:
+        graphs = []
+        for pr in self._to_graph(profile):
+            if isinstance(pr, Profile):
+                graphs += sorted(self._datasource.named_graphs.get(pr))
+            else:
+                graphs.append(pr)
+        return graphs
+
+    def _to_graph(self, profile: Profile) -> list[Profile | str]:
+        to_graph: list[Profile | str] = [profile]
+        if not self._datasource.split_profiles:
+            to_graph.append(self._datasource.named_graphs.default_graph)
+
+        return to_graph
@@ -0,0 +1,524 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from cgmes2pgm_converter.common import (
+    CgmesDataset,
+    Profile,
+    SymPowerType,
+    VoltageMeasType,
+)
+from power_grid_model import ComponentType, MeasuredTerminalType, initialize_array
+from power_grid_model.data_types import BatchDataset, SingleDataset
+from power_grid_model_io.data_types import ExtraInfo
+
+from .meas_ranges import MeasurementSimulationConfiguration, RandomStream
+
+SENSOR_COMPONENTS = [
+    ComponentType.sym_voltage_sensor,
+    ComponentType.sym_power_sensor,
+]
+
+# Branches with the terminals stored as `_term1` and `_term2` in the extra info
+BRANCH_COMPONENTS = [
+    ComponentType.line,
+    ComponentType.link,
+    ComponentType.generic_branch,
+    ComponentType.transformer,
+]
+
+# Appliances with the terminal stored as `_terminal` in the extra info
+APPLIANCE_TERMINAL_TYPES = {
+    ComponentType.sym_load: MeasuredTerminalType.load,
+    ComponentType.sym_gen: MeasuredTerminalType.generator,
+    ComponentType.source: MeasuredTerminalType.source,
+    ComponentType.shunt: MeasuredTerminalType.shunt,
+}
+
+# Power flow result attributes of each measured terminal type
+TERMINAL_RESULT_ATTRIBUTES = {
+    MeasuredTerminalType.branch_from: ("p_from", "q_from"),
+    MeasuredTerminalType.branch_to: ("p_to", "q_to"),
+    MeasuredTerminalType.branch3_1: ("p_1", "q_1"),
+    MeasuredTerminalType.branch3_2: ("p_2", "q_2"),
+    MeasuredTerminalType.branch3_3: ("p_3", "q_3"),
+    MeasuredTerminalType.load: ("p", "q"),
+    MeasuredTerminalType.generator: ("p", "q"),
+    MeasuredTerminalType.source: ("p", "q"),
+    MeasuredTerminalType.shunt: ("p", "q"),
+}
+
+# Voltages below this value in kV are replaced by the nominal voltage (same as the converter)
+MIN_VOLTAGE_KV = 0.1
+
+
+@dataclass
+class SvValues:
+    """
+    Values of the SV-Profile used for the measurement simulation.
+
+    Attributes:
+        voltages (pd.DataFrame): Voltage of each topological node with the columns
+            `tn`, `u` (kV) and `angle` (deg)
+        power_flows (pd.DataFrame): Power flow of each terminal with the columns
+            `term`, `p` (MW) and `q` (MVar)
+    """
+
+    voltages: pd.DataFrame
+    power_flows: pd.DataFrame
+
+    default_voltage_query = """
+        SELECT ?tn ?u ?angle
+        WHERE {
+            ?_sv cim:SvVoltage.v ?u;
+                cim:SvVoltage.angle ?angle;
+                cim:SvVoltage.TopologicalNode ?tn.
+        }
+    """
+
+    graph_voltage_query = """
+        SELECT ?tn ?u ?angle
+        WHERE {
+            VALUES ?sv_graph { $SV_GRAPH }
+            GRAPH ?sv_graph {
+                ?_sv cim:SvVoltage.v ?u;
+                    cim:SvVoltage.angle ?angle;
+                    cim:SvVoltage.TopologicalNode ?tn.
+            }
+        }
+    """
+
+    default_power_query = """
+        SELECT ?term ?p ?q
+        WHERE {
+            ?_sv cim:SvPowerFlow.p ?p;
+                cim:SvPowerFlow.q ?q;
+                cim:SvPowerFlow.Terminal ?term.
+        }
+    """
+
+    graph_power_query = """
+        SELECT ?term ?p ?q
+        WHERE {
+            VALUES ?sv_graph { $SV_GRAPH }
+            GRAPH ?sv_graph {
+                ?_sv cim:SvPowerFlow.p ?p;
+                    cim:SvPowerFlow.q ?q;
+                    cim:SvPowerFlow.Terminal ?term.
+            }
+        }
+    """
+
+    @classmethod
+    def from_dataset(cls, datasource: CgmesDataset) -> "SvValues":
+        """Read the SV-Profile of a dataset, the dataset is not modified.
+
+        The IRIs are read without base uri, same as the converter stores them
+        in the extra info.
+        """
+        if datasource.split_profiles:
+            args = {
+                "$SV_GRAPH": datasource.named_graphs.format_for_query(Profile.SV),
+            }
+            voltage_query = datasource.format_query(cls.graph_voltage_query, args)
+            power_query = datasource.format_query(cls.graph_power_query, args)
+        else:
+            voltage_query = cls.default_voltage_query
+            power_query = cls.default_power_query
+
+        voltages = datasource.query(voltage_query)
+        power_flows = datasource.query(power_query)
+
+        return cls(
+            voltages=voltages.drop_duplicates("tn", ignore_index=True),
+            power_flows=power_flows.drop_duplicates("term", ignore_index=True),
+        )
+
+
+class PgmMeasurementSimulator:
+    """
+    Simulates measurements directly in the PGM input data of a converted model.
+
+    Unlike the `MeasurementBuilder`, no OP- and MEAS-Profile is written to the
+    dataset and the model does not need to be converted again. Each SV voltage
+    becomes a `sym_voltage_sensor` of its node, each SV power flow a
+    `sym_power_sensor` of the equipment of its terminal. Values are distorted and
+    sigmas are taken from the measurement ranges of the configuration,
+    the same way as in the `MeasurementBuilder`.
+
+    The nodes and terminals are matched by the IRIs in the extra info of the
+    converter (`_mrid` of nodes, `_term1`, `_term2`, `_term3` of branches and
+    `_terminal` of appliances). SV values of objects without a PGM counterpart
+    are skipped.
+
+    Args:
+        input_data (SingleDataset): Converted PGM input data
+        extra_info (ExtraInfo): Extra info of the converter
+        config (MeasurementSimulationConfiguration): Measurement ranges
+    """
+
+    def __init__(
+        self,
+        input_data: SingleDataset,
+        extra_info: ExtraInfo,
+        config: MeasurementSimulationConfiguration,
+    ):
+        self._input_data = input_data
+        self._extra_info = extra_info
+        self._config = config
+        self._node_index = self._create_node_index()
+        self._terminal_index = self._create_terminal_index()
+
+    def simulate(self, sv: SvValues) -> tuple[SingleDataset, ExtraInfo]:
+        """Create sensors with simulated measurements.
+
+        Existing sensors of the model are replaced. The input data and extra info
+        passed to the constructor are not modified.
+
+        Args:
+            sv (SvValues): Values of the SV-Profile
+
+        Returns:
+            tuple[SingleDataset, ExtraInfo]: Input data and extra info with the
+                simulated sensors
+        """
+        input_data, extra_info, next_id = self._remove_sensors()
+
+        voltage_sensors = self._create_voltage_sensors(sv.voltages, next_id)
+        next_id += voltage_sensors.size
+        power_sensors = self._create_power_sensors(sv.power_flows, next_id)
+
+        self._add_sensors(input_data, extra_info, voltage_sensors, power_sensors)
+        return input_data, extra_info
+
+    def simulate_batch(
+        self,
+        result_data: BatchDataset,
+        first_step: int = 0,
+        converged: np.ndarray | None = None,
+    ) -> tuple[SingleDataset, ExtraInfo, BatchDataset]:
+        """Create sensors with simulated measurements for each scenario of a dense
+        batch power flow result of the model.
+
+        Every node and terminal with an IRI in the extra info gets a sensor.
+        The noise of each scenario is drawn from its own random streams
+        (`RandomStreams.standard_normal` with the step as key), so consecutive
+        parts of a batch can be simulated separately with the same result.
+        Failed scenarios are not part of the update data, as PGM does not reset
+        their results and NaN values in update data keep the input values.
+
+        Args:
+            result_data (BatchDataset): Dense batch power flow result with
+                all nodes, branches and appliances of the model
+            first_step (int): Step of the first scenario
+            converged (np.ndarray | None): Whether the power flow of each scenario
+                converged, None if all converged
+
+        Returns:
+            tuple[SingleDataset, ExtraInfo, BatchDataset]: Input data and extra info
+                with the sensors of the first converged scenario and update data with
+                the measured values of all converged scenarios
+        """
+        input_data, extra_info, next_id = self._remove_sensors()
+
+        # results of failed scenarios are left over memory
+        n_scenarios = result_data[ComponentType.node].shape[0]
+        if converged is None:
+            steps = np.arange(n_scenarios)
+        else:
+            steps = np.flatnonzero(converged)
+        ref = steps[0] if steps.size else 0
+
+        node_ids = result_data[ComponentType.node]["id"][ref]
+        node_pos = pd.Series(np.arange(len(node_ids)), index=node_ids)
+        nodes = self._node_index
+        u = result_data[ComponentType.node]["u"][steps][
+            :, node_pos.reindex(nodes["node"]).to_numpy()
+        ]
+
+        terminals = self._terminal_index
+        p = np.full((u.shape[0], len(terminals)), np.nan)
+        q = np.full((u.shape[0], len(terminals)), np.nan)
+        for component in (
+            *BRANCH_COMPONENTS,
+            ComponentType.three_winding_transformer,
+            *APPLIANCE_TERMINAL_TYPES,
+        ):
+            if component not in result_data:
+                continue
+            ids = result_data[component]["id"][ref]
+            pos = pd.Series(np.arange(len(ids)), index=ids)
+            for terminal_type, (p_attr, q_attr) in TERMINAL_RESULT_ATTRIBUTES.items():
+                if p_attr not in result_data[component].dtype.names:
+                    continue
+                mask = (terminals["terminal_type"] == terminal_type).to_numpy()
+                mask &= terminals["object"].isin(ids).to_numpy()
+                idx = pos.reindex(terminals["object"][mask]).to_numpy()
+                p[:, mask] = result_data[component][p_attr][steps][:, idx]
+                q[:, mask] = result_data[component][q_attr][steps][:, idx]
+
+        v_ranges = self._config.voltage_ranges
+        pq_ranges = self._config.power_ranges
+        nom_v = nodes["u_rated"].to_numpy() / 1e3
+        u_ranges = v_ranges.get_by_values(nom_v)
+        pq_range_table = pq_ranges.get_by_values(terminals["u_rated"].to_numpy() / 1e3)
+        streams = self._config.random_streams
+
+        # results are in the conventions of the sensors, powers in W
+        u_measured = np.empty_like(u)
+        p_measured = np.empty_like(p)
+        q_measured = np.empty_like(q)
+        for i, step in enumerate(first_step + steps):
+            u_step = v_ranges.distort_measurements(
+                u[i] / 1e3,
+                u_ranges,
+                streams.standard_normal(u.shape[1], RandomStream.VOLTAGE, step),
+            )
+            u_measured[i] = np.where(u_step < MIN_VOLTAGE_KV, nom_v, u_step) * 1e3
+            p_measured[i] = 1e6 * pq_ranges.distort_measurements(
+                p[i] / 1e6,
+                pq_range_table,
+                streams.standard_normal(p.shape[1], RandomStream.ACTIVE_POWER, step),
+            )
+            q_measured[i] = 1e6 * pq_ranges.distort_measurements(
+                q[i] / 1e6,
+                pq_range_table,
+                streams.standard_normal(q.shape[1], RandomStream.REACTIVE_POWER, step),
+            )
+
+        voltage_sensors = initialize_array(
+            "input", ComponentType.sym_voltage_sensor, len(nodes)
+        )
+        voltage_sensors["id"] = np.arange(next_id, next_id + len(nodes))
+        voltage_sensors["measured_object"] = nodes["node"]
+        voltage_sensors["u_sigma"] = u_ranges.get_sigma() * 1e3
+        next_id += len(nodes)
+
+        power_sensors = initialize_array(
+            "input", ComponentType.sym_power_sensor, len(terminals)
+        )
+        sigma = pq_range_table.get_sigma() * 1e6
+        power_sensors["id"] = np.arange(next_id, next_id + len(terminals))
+        power_sensors["measured_object"] = terminals["object"]
+        power_sensors["measured_terminal_type"] = terminals["terminal_type"]
+        power_sensors["p_sigma"] = sigma
+        power_sensors["q_sigma"] = sigma
+        power_sensors["power_sigma"] = sigma
+
+        voltage_update = initialize_array(
+            "update", ComponentType.sym_voltage_sensor, u.shape
+        )
+        voltage_update["id"] = voltage_sensors["id"]
+        voltage_update["u_measured"] = u_measured
+        power_update = initialize_array(
+            "update", ComponentType.sym_power_sensor, p.shape
+        )
+        power_update["id"] = power_sensors["id"]
+        power_update["p_measured"] = p_measured
+        power_update["q_measured"] = q_measured
+
+        if u.shape[0]:
+            voltage_sensors["u_measured"] = u_measured[0]
+            power_sensors["p_measured"] = p_measured[0]
+            power_sensors["q_measured"] = q_measured[0]
+
+        self._add_sensors(input_data, extra_info, voltage_sensors, power_sensors)
+        update_data: BatchDataset = {
+            ComponentType.sym_voltage_sensor: voltage_update,
+            ComponentType.sym_power_sensor: power_update,
+        }
+        return input_data, extra_info, update_data
+
+    def _remove_sensors(self) -> tuple[SingleDataset, ExtraInfo, int]:
+        """Copy of input data and extra info without sensors and the first sensor id"""
+        input_data = {
+            component: data.copy()
+            for component, data in self._input_data.items()
+            if component not in SENSOR_COMPONENTS
+        }
+        sensor_ids = {
+            int(i)
+            for component in SENSOR_COMPONENTS
+            if component in self._input_data
+            for i in self._input_data[component]["id"]
+        }
+        extra_info = {
+            pgm_id: info
+            for pgm_id, info in self._extra_info.items()
+            if pgm_id not in sensor_ids
+        }
+
+        # ids of sensors are independent of previous simulations
+        next_id = 1 + max(
+            (int(data["id"].max()) for data in input_data.values() if data.size),
+            default=-1,
+        )
+        return input_data, extra_info, next_id
+
+    def _add_sensors(
+        self,
+        input_data: SingleDataset,
+        extra_info: ExtraInfo,
+        voltage_sensors: np.ndarray,
+        power_sensors: np.ndarray,
+    ):
+        input_data[ComponentType.sym_voltage_sensor] = voltage_sensors
+        input_data[ComponentType.sym_power_sensor] = power_sensors
+
+        for sensor in voltage_sensors:
+            extra_info[int(sensor["id"])] = {
+                "_type": VoltageMeasType.FIELD,
+                "_name": f"{self._get_name(sensor['measured_object'])} Voltage Measurement",
+            }
+        for sensor in power_sensors:
+            extra_info[int(sensor["id"])] = {
+                "_type": SymPowerType.FIELD,
+                "_name": f"{self._get_name(sensor['measured_object'])} PQ Measurement",
+            }
+
+        logging.info(
+            "Simulated %d voltage and %d power measurements",
+            voltage_sensors.size,
+            power_sensors.size,
+        )
+
+    def _create_voltage_sensors(self, voltages: pd.DataFrame, first_id: int):
+        sv = voltages.merge(self._node_index, on="tn", how="inner")
+        self._log_skipped(len(voltages) - len(sv), "voltages")
+
+        v_ranges = self._config.voltage_ranges
+        nom_v = sv["u_rated"].to_numpy() / 1e3
+        ranges = v_ranges.get_by_values(nom_v)
+        streams = self._config.random_streams
+        u = v_ranges.distort_measurements(
+            sv["u"].to_numpy(dtype=np.float64),
+            ranges,
+            streams.standard_normal(len(sv), RandomStream.VOLTAGE),
+        )
+        u = np.where(u < MIN_VOLTAGE_KV, nom_v, u)
+
+        arr = initialize_array("input", ComponentType.sym_voltage_sensor, len(sv))
+        arr["id"] = np.arange(first_id, first_id + len(sv))
+        arr["measured_object"] = sv["node"]
+        arr["u_measured"] = u * 1e3
+        arr["u_sigma"] = ranges.get_sigma() * 1e3
+        return arr
+
+    def _create_power_sensors(self, power_flows: pd.DataFrame, first_id: int):
+        sv = power_flows.merge(self._terminal_index, on="term", how="inner")
+        self._log_skipped(len(power_flows) - len(sv), "power flows")
+
+        pq_ranges = self._config.power_ranges
+        ranges = pq_ranges.get_by_values(sv["u_rated"].to_numpy() / 1e3)
+        streams = self._config.random_streams
+        p = pq_ranges.distort_measurements(
+            sv["p"].to_numpy(dtype=np.float64),
+            ranges,
+            streams.standard_normal(len(sv), RandomStream.ACTIVE_POWER),
+        )
+        q = pq_ranges.distort_measurements(
+            sv["q"].to_numpy(dtype=np.float64),
+            ranges,
+            streams.standard_normal(len(sv), RandomStream.REACTIVE_POWER),
+        )
+        sigma = ranges.get_sigma() * 1e6
+
+        # generators and sources use generator reference convention in PGM
+        terminal_types = sv["terminal_type"].to_numpy()
+        sign = np.where(
+            (terminal_types == MeasuredTerminalType.generator)
+            | (terminal_types == MeasuredTerminalType.source),
+            -1.0,
+            1.0,
+        )
+
+        arr = initialize_array("input", ComponentType.sym_power_sensor, len(sv))
+        arr["id"] = np.arange(first_id, first_id + len(sv))
+        arr["measured_object"] = sv["object"]
+        arr["measured_terminal_type"] = terminal_types
+        arr["p_measured"] = sign * p * 1e6
+        arr["q_measured"] = sign * q * 1e6
+        arr["p_sigma"] = sigma
+        arr["q_sigma"] = sigma
+        arr["power_sigma"] = sigma
+        return arr
+
+    def _create_node_index(self) -> pd.DataFrame:
+        """Node id and rated voltage by topological node IRI"""
+        nodes = self._input_data[ComponentType.node]
+        return pd.DataFrame(
+            {
+                "tn": [
+                    self._extra_info.get(int(i), {}).get("_mrid") for i in nodes["id"]
+                ],
+                "node": nodes["id"],
+                "u_rated": nodes["u_rated"],
+            }
+        ).dropna(subset="tn")
+
+    def _create_terminal_index(self) -> pd.DataFrame:
+        """Measured object, terminal type and node by terminal IRI"""
+        terms, objects, terminal_types, nodes = [], [], [], []
+
+        def add(data, key: str, terminal_type: MeasuredTerminalType, node_attr: str):
+            for pgm_id, node in zip(data["id"], data[node_attr]):
+                term = self._extra_info.get(int(pgm_id), {}).get(key)
+                if term is not None:
+                    terms.append(term)
+                    objects.append(pgm_id)
+                    terminal_types.append(terminal_type)
+                    nodes.append(node)
+
+        for component in BRANCH_COMPONENTS:
+            if component in self._input_data:
+                data = self._input_data[component]
+                add(data, "_term1", MeasuredTerminalType.branch_from, "from_node")
+                add(data, "_term2", MeasuredTerminalType.branch_to, "to_node")
+
+        if ComponentType.three_winding_transformer in self._input_data:
+            data = self._input_data[ComponentType.three_winding_transformer]
+            add(data, "_term1", MeasuredTerminalType.branch3_1, "node_1")
+            add(data, "_term2", MeasuredTerminalType.branch3_2, "node_2")
+            add(data, "_term3", MeasuredTerminalType.branch3_3, "node_3")
+
+        for component, terminal_type in APPLIANCE_TERMINAL_TYPES.items():
+            if component in self._input_data:
+                add(self._input_data[component], "_terminal", terminal_type, "node")
+
+        nodes_df = self._input_data[ComponentType.node]
+        u_rated = pd.Series(nodes_df["u_rated"], index=nodes_df["id"])
+
+        index = pd.DataFrame(
+            {
+                "term": terms,
+                "object": np.array(objects, dtype=np.int64),
+                "terminal_type": np.array(terminal_types, dtype=np.int8),
+                "u_rated": u_rated.reindex(nodes).to_numpy(),
+            }
+        )
+        # a terminal is measured once, e.g. at the first of multiple replacement objects
+        return index.drop_duplicates("term", ignore_index=True)
+
+    def _get_name(self, pgm_id) -> str:
+        return self._extra_info.get(int(pgm_id), {}).get("_name", str(pgm_id))
+
+    def _log_skipped(self, n_skipped: int, values: str):
+        if n_skipped:
+            logging.debug(
+                "Skipped %d SV %s without matching PGM object", n_skipped, values
+            )
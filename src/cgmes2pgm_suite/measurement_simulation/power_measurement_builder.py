@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import uuid
-
 import pandas as pd
 from cgmes2pgm_converter.common import (
     CIM_ID_OBJ,
@@ -23,133 +21,35 @@ from cgmes2pgm_converter.common import (
     Profile,
 )
 
-from .meas_ranges import MeasurementRangeSet
+from cgmes2pgm_suite.common import MridGenerator, quote_mrids
+
+from .meas_ranges import (
+    MeasurementRangeSet,
+    MeasurementRangeTable,
+    RandomStream,
+    RandomStreams,
+)
+from .simulated_values import DEFAULT_TIMESTAMP, SimulatedAnalogValues
+from .sv_snapshot import SvSnapshot
 
 
 # pylint: disable=too-few-public-methods
 class PowerMeasurementBuilder:
 
-    default_query = """
-        SELECT
-            (SAMPLE(?_sv) as ?sv)
-            ?term
-            (SAMPLE(?_eq) as ?eq)
-            (SAMPLE(?_name) as ?name)
-            (SAMPLE(?_tn) as ?tn)
-            (SAMPLE(?_p) as ?p)
-            (SAMPLE(?_q) as ?q)
-            (SAMPLE(?_nomV) as ?nomV)
-        WHERE {
-            ?_sv cim:SvPowerFlow.p ?_p;
-                    cim:SvPowerFlow.q ?_q;
-                    cim:SvPowerFlow.Terminal ?term.
-
-            ?term cim:Terminal.ConductingEquipment ?_eq;
-                  cim:Terminal.TopologicalNode ?_tn;
-                  cim:IdentifiedObject.name ?_name.
-
-            ?_tn cim:TopologicalNode.BaseVoltage/cim:BaseVoltage.nominalVoltage ?_nomV.
-
-            OPTIONAL {
-                ?_eq cim:RotatingMachine.GeneratingUnit ?_genUnit.
-                ?_genUnit cim:GeneratingUnit.maxOperatingP ?_maxP;
-                        cim:GeneratingUnit.minOperatingP ?_minP.
-            }
-
-            OPTIONAL {
-                ?_eq cim:ExternalNetworkInjection.maxP ?_maxP;
-                        cim:ExternalNetworkInjection.minP ?_minP.
-            }
-
-            OPTIONAL {
-                ?_trEnd cim:TransformerEnd.Terminal ?term;
-                        cim:PowerTransformerEnd.ratedS ?_maxP.
-            }
-
-            OPTIONAL {
-                ?_limitSet cim:OperationalLimitSet.Terminal ?term.
-                ?_currentLimit cim:OperationalLimit.OperationalLimitSet ?_limitSet;
-                                cim:CurrentLimit.value ?_maxI.
-            }
-            BIND(coalesce(?_maxP, xsd:string(xsd:float(?_maxI) * xsd:float(?_nomV) * 0.001)) as ?_maxIxU)
-        }
-        GROUP BY ?term
-        ORDER BY ?term
-    """
-
-    graph_query = """
-        SELECT
-            (SAMPLE(?_sv) as ?sv)
-            ?term
-            (SAMPLE(?_eq) as ?eq)
-            (SAMPLE(?_name) as ?name)
-            (SAMPLE(?_tn) as ?tn)
-            (SAMPLE(?_p) as ?p)
-            (SAMPLE(?_q) as ?q)
-            (SAMPLE(?_nomV) as ?nomV)
-            (SAMPLE(?_maxIxU) as ?maxIxU)
-        WHERE {
-
-            VALUES ?sv_graph { $SV_GRAPH }
-            GRAPH ?sv_graph {
-                ?_sv cim:SvPowerFlow.p ?_p;
-                    cim:SvPowerFlow.q ?_q;
-                    cim:SvPowerFlow.Terminal ?term.
-            }
-
-            VALUES ?eq_graph { $EQ_GRAPH }
-            GRAPH ?eq_graph {
-                ?term cim:Terminal.ConductingEquipment ?_eq;
-                    cim:IdentifiedObject.name ?_name.
-
-
-                OPTIONAL {
-                    ?_eq cim:RotatingMachine.GeneratingUnit ?_genUnit.
-                    ?_genUnit cim:GeneratingUnit.maxOperatingP ?_maxP;
-                            cim:GeneratingUnit.minOperatingP ?_minP.
-                }
-
-                OPTIONAL {
-                    ?_eq cim:ExternalNetworkInjection.maxP ?_maxP;
-                            cim:ExternalNetworkInjection.minP ?_minP.
-                }
-
-                OPTIONAL {
-                    ?_trEnd cim:TransformerEnd.Terminal ?term;
-                            cim:PowerTransformerEnd.ratedS ?_maxP.
-                }
-
-                OPTIONAL {
-                    ?_limitSet cim:OperationalLimitSet.Terminal ?term.
-                    ?_currentLimit cim:OperationalLimit.OperationalLimitSet ?_limitSet;
-                                    cim:CurrentLimit.value ?_maxI.
-                }
-                BIND(coalesce(?_maxP, xsd:string(xsd:float(?_maxI) * xsd:float(?_nomV) * 0.001)) as ?_maxIxU)
-            }
-
-            VALUES ?tp_graph { $TP_GRAPH }
-            GRAPH ?tp_graph {
-                ?term cim:Terminal.TopologicalNode ?_tn.
-                ?_tn cim:TopologicalNode.BaseVoltage ?_bv.
-            }
-
-            VALUES ?eq_graph_bv { $EQ_GRAPH }
-            GRAPH ?eq_graph_bv {
-                ?_bv cim:BaseVoltage.nominalVoltage ?_nomV.
-            }
-        }
-        GROUP BY ?term
-        ORDER BY ?term
-    """
-
     def __init__(
         self,
         datasource: CgmesDataset,
         pq_ranges: MeasurementRangeSet,
         sources: dict[MeasurementValueSource, str],
         with_sigmas: bool = True,
+        sv_snapshot: SvSnapshot | None = None,
+        mrid_generator: MridGenerator | None = None,
+        random_streams: RandomStreams | None = None,
     ):
         self._datasource = datasource
+        self._sv_snapshot = sv_snapshot or SvSnapshot(datasource)
+        self._mrid_generator = mrid_generator or MridGenerator()
+        self._random_streams = random_streams or RandomStreams()
         self._sv_power_to_p_meas: dict = {}
         self._sv_power_to_q_meas: dict = {}
         self._pq_ranges = pq_ranges
@@ -157,31 +57,35 @@ class PowerMeasurementBuilder:
         self._with_sigmas = with_sigmas
 
     def build_from_sv(self):
-        sv = self._get_sv_powers()
-
-        self._create_p_meas(sv)
-        self._create_q_meas(sv)
-        self._create_p_meas_vals(sv)
-        self._create_q_meas_vals(sv)
-
-    def _get_sv_powers(self):
-        # get IRIs with base_uri, because we are writing into the graph again and need this
-        # for referential consistency
-        if self._datasource.split_profiles:
-            named_graphs = self._datasource.named_graphs
-            args = {
-                "$TP_GRAPH": named_graphs.format_for_query(Profile.TP),
-                "$EQ_GRAPH": named_graphs.format_for_query(Profile.EQ),
-                "$SV_GRAPH": named_graphs.format_for_query(Profile.SV),
-            }
-            q = self._datasource.format_query(self.graph_query, args)
-            res = self._datasource.query(q, remove_uuid_base_uri=False)
-        else:
-            res = self._datasource.query(self.default_query, remove_uuid_base_uri=False)
-
-        return res
-
-    def _create_p_meas(self, sv: pd.DataFrame):
+        for values in self.build_op_from_sv():
+            vals_meas = values.to_meas_df(
+                values.distort(self._random_streams),
+                DEFAULT_TIMESTAMP,
+                self._datasource.cim_namespace,
+            )
+            [
+                self._datasource.insert_df(vals_meas, pr, include_mrid=False)
+                for pr in self._to_graph(Profile.MEAS)
+            ]
+
+    def build_op_from_sv(self) -> list[SimulatedAnalogValues]:
+        """Create the Analogs and AnalogValues of the OP-Profile.
+
+        Returns:
+            list[SimulatedAnalogValues]: P and Q AnalogValues to be written
+                to the MEAS-Profile
+        """
+        sv = self._sv_snapshot.power_flows
+        ranges = self._pq_ranges.get_by_values(sv["nomV"])
+
+        self._create_p_meas(sv, ranges)
+        self._create_q_meas(sv, ranges)
+        return [
+            self._create_p_meas_vals(sv, ranges),
+            self._create_q_meas_vals(sv, ranges),
+        ]
+
+    def _create_p_meas(self, sv: pd.DataFrame, ranges: MeasurementRangeTable):
         meas_p = pd.DataFrame()
 
         meas_p[f"{CIM_MEAS}.Terminal"] = "<" + sv["term"] + ">"
@@ -195,22 +99,19 @@ class PowerMeasurementBuilder:
         )
 
         meas_p[f"{CIM_ID_OBJ}.name"] = '"' + sv["name"] + ' Meas P"'
-        meas_p[f"{CIM_ID_OBJ}.mRID"] = [f'"{uuid.uuid4()}"' for _ in range(len(meas_p))]
-        self._sv_power_to_p_meas = dict(
-            zip(sv["sv"], meas_p[f"{CIM_ID_OBJ}.mRID"].replace('"', ""))
-        )
+        mrids = self._mrid_generator.create(sv["term"], "PAnalog")
+        meas_p[f"{CIM_ID_OBJ}.mRID"] = quote_mrids(mrids)
+        self._sv_power_to_p_meas = dict(zip(sv["sv"], mrids))
 
         meas_p["rdf:type"] = f"<{self._datasource.cim_namespace}Analog>"
 
-        ranges = [self._pq_ranges.get_by_value(nomV) for nomV in sv["nomV"]]
-
-        meas_p["cim:Analog.minValue"] = [r.min_value for r in ranges]
-        meas_p["cim:Analog.maxValue"] = [r.max_value for r in ranges]
+        meas_p["cim:Analog.minValue"] = ranges.min_value
+        meas_p["cim:Analog.maxValue"] = ranges.max_value
         meas_p["cim:Analog.normalValue"] = meas_p["cim:Analog.maxValue"]
 
         [self._datasource.insert_df(meas_p, pr) for pr in self._to_graph(Profile.OP)]
 
-    def _create_q_meas(self, sv: pd.DataFrame):
+    def _create_q_meas(self, sv: pd.DataFrame, ranges: MeasurementRangeTable):
         meas_q = pd.DataFrame()
 
         meas_q[f"{CIM_MEAS}.Terminal"] = "<" + sv["term"] + ">"
@@ -225,33 +126,30 @@ class PowerMeasurementBuilder:
         )
 
         meas_q[f"{CIM_ID_OBJ}.name"] = '"' + sv["name"] + ' Meas Q"'
-        meas_q[f"{CIM_ID_OBJ}.mRID"] = [f'"{uuid.uuid4()}"' for _ in range(len(meas_q))]
-        self._sv_power_to_q_meas = dict(
-            zip(sv["sv"], meas_q[f"{CIM_ID_OBJ}.mRID"].replace('"', ""))
-        )
+        mrids = self._mrid_generator.create(sv["term"], "QAnalog")
+        meas_q[f"{CIM_ID_OBJ}.mRID"] = quote_mrids(mrids)
+        self._sv_power_to_q_meas = dict(zip(sv["sv"], mrids))
 
         meas_q["rdf:type"] = f"<{self._datasource.cim_namespace}Analog>"
 
-        ranges = [self._pq_ranges.get_by_value(nomV) for nomV in sv["nomV"]]
-
-        meas_q["cim:Analog.minValue"] = [r.min_value for r in ranges]
-        meas_q["cim:Analog.maxValue"] = [r.max_value for r in ranges]
+        meas_q["cim:Analog.minValue"] = ranges.min_value
+        meas_q["cim:Analog.maxValue"] = ranges.max_value
         meas_q["cim:Analog.normalValue"] = meas_q["cim:Analog.maxValue"]
 
         [self._datasource.insert_df(meas_q, pr) for pr in self._to_graph(Profile.OP)]
 
-    def _create_p_meas_vals(self, sv: pd.DataFrame):
+    def _create_p_meas_vals(
+        self, sv: pd.DataFrame, ranges: MeasurementRangeTable
+    ) -> SimulatedAnalogValues:
         vals_p_op = pd.DataFrame()
-        vals_p_meas = pd.DataFrame()
 
-        vals_p_op[f"{CIM_ID_OBJ}.mRID"] = [f'"{uuid.uuid4()}"' for _ in range(len(sv))]
-        vals_p_meas[f"{CIM_ID_OBJ}.mRID"] = vals_p_op[f"{CIM_ID_OBJ}.mRID"]
+        mrids = self._mrid_generator.create(sv["term"], "PAnalogValue")
+        vals_p_op[f"{CIM_ID_OBJ}.mRID"] = quote_mrids(mrids)
 
         # Op-Profile
 
         vals_p_op[f"{CIM_ID_OBJ}.name"] = '"' + sv["name"] + ' P Measurement Value"'
         vals_p_op["rdf:type"] = f"<{self._datasource.cim_namespace}AnalogValue>"
-        vals_p_meas["rdf:type"] = f"<{self._datasource.cim_namespace}AnalogValue>"
 
         analogs = [self._sv_power_to_p_meas[sv] for sv in sv["sv"]]
         vals_p_op["cim:AnalogValue.Analog"] = [
@@ -261,35 +159,32 @@ class PowerMeasurementBuilder:
             MeasurementValueSource.SCADA
         ]
 
-        ranges = [self._pq_ranges.get_by_value(nomV) for nomV in sv["nomV"]]
         if self._with_sigmas:
-            vals_p_op["cim:MeasurementValue.sensorSigma"] = [r.sigma for r in ranges]
-
-        # Meas-Profile
-
-        vals_p_meas["cim:MeasurementValue.timeStamp"] = '"2021-01-01T00:00:00Z"'
-        vals_p_meas["cim:AnalogValue.value"] = [
-            self._pq_ranges.distort_measurement(r, p) for r, p in zip(ranges, sv["p"])
-        ]
+            vals_p_op["cim:MeasurementValue.sensorSigma"] = ranges.get_sigma_values()
 
         [self._datasource.insert_df(vals_p_op, pr) for pr in self._to_graph(Profile.OP)]
-        [
-            self._datasource.insert_df(vals_p_meas, pr, include_mrid=False)
-            for pr in self._to_graph(Profile.MEAS)
-        ]
 
-    def _create_q_meas_vals(self, sv: pd.DataFrame):
+        return SimulatedAnalogValues(
+            mrid=mrids,
+            value=sv["p"].to_numpy(dtype=float),
+            ranges=ranges,
+            range_set=self._pq_ranges,
+            is_power=True,
+            stream=RandomStream.ACTIVE_POWER,
+        )
+
+    def _create_q_meas_vals(
+        self, sv: pd.DataFrame, ranges: MeasurementRangeTable
+    ) -> SimulatedAnalogValues:
         vals_q_op = pd.DataFrame()
-        vals_q_meas = pd.DataFrame()
 
-        vals_q_op[f"{CIM_ID_OBJ}.mRID"] = [f'"{uuid.uuid4()}"' for _ in range(len(sv))]
-        vals_q_meas[f"{CIM_ID_OBJ}.mRID"] = vals_q_op[f"{CIM_ID_OBJ}.mRID"]
+        mrids = self._mrid_generator.create(sv["term"], "QAnalogValue")
+        vals_q_op[f"{CIM_ID_OBJ}.mRID"] = quote_mrids(mrids)
 
         # Op-Profile
 
         vals_q_op[f"{CIM_ID_OBJ}.name"] = '"' + sv["name"] + ' P Measurement Value"'
         vals_q_op["rdf:type"] = f"<{self._datasource.cim_namespace}AnalogValue>"
-        vals_q_meas["rdf:type"] = f"<{self._datasource.cim_namespace}AnalogValue>"
 
         analogs = [self._sv_power_to_q_meas[sv] for sv in sv["sv"]]
         vals_q_op["cim:AnalogValue.Analog"] = [
@@ -299,22 +194,19 @@ class PowerMeasurementBuilder:
             MeasurementValueSource.SCADA
         ]
 
-        ranges = [self._pq_ranges.get_by_value(nomV) for nomV in sv["nomV"]]
         if self._with_sigmas:
-            vals_q_op["cim:MeasurementValue.sensorSigma"] = [r.sigma for r in ranges]
-
-        # Meas-Profile
-
-        vals_q_meas["cim:MeasurementValue.timeStamp"] = '"2021-01-01T00:00:00Z"'
-        vals_q_meas["cim:AnalogValue.value"] = [
-            self._pq_ranges.distort_measurement(r, q) for r, q in zip(ranges, sv["q"])
-        ]
+            vals_q_op["cim:MeasurementValue.sensorSigma"] = ranges.get_sigma_values()
 
         [self._datasource.insert_df(vals_q_op, pr) for pr in self._to_graph(Profile.OP)]
-        [
-            self._datasource.insert_df(vals_q_meas, pr, include_mrid=False)
-            for pr in self._to_graph(Profile.MEAS)
-        ]
+
+        return SimulatedAnalogValues(
+            mrid=mrids,
+            value=sv["q"].to_numpy(dtype=float),
+            ranges=ranges,
+            range_set=self._pq_ranges,
+            is_power=True,
+            stream=RandomStream.REACTIVE_POWER,
+        )
 
     def _to_graph(self, profile: Profile) -> list[Profile | str]:
         to_graph: list[Profile | str] = [profile]
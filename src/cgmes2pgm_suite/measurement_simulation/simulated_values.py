@@ -0,0 +1,74 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from cgmes2pgm_converter.common import CIM_ID_OBJ
+
+from cgmes2pgm_suite.common import quote_mrids
+
+from .meas_ranges import (
+    MeasurementRangeSet,
+    MeasurementRangeTable,
+    RandomStream,
+    RandomStreams,
+)
+
+# Timestamp of a single simulated MEAS-Profile
+DEFAULT_TIMESTAMP = "2021-01-01T00:00:00Z"
+
+
+@dataclass
+class SimulatedAnalogValues:
+    """
+    AnalogValues created in the OP-Profile, whose values are simulated in the MEAS-Profile.
+
+    Attributes:
+        mrid (list[str]): mRID of each AnalogValue
+        value (np.ndarray): Undistorted value of the SV-Profile
+        ranges (MeasurementRangeTable): Measurement range of each value
+        range_set (MeasurementRangeSet): Range set used to distort the values
+        is_power (bool): Whether the values are active or reactive powers
+        stream (RandomStream): Random number stream of the noise
+    """
+
+    mrid: list[str]
+    value: np.ndarray
+    ranges: MeasurementRangeTable
+    range_set: MeasurementRangeSet
+    is_power: bool
+    stream: RandomStream
+
+    def distort(self, random_streams: RandomStreams, *key: int) -> np.ndarray:
+        """Distort the values once, see `MeasurementRangeSet.distort_measurements`.
+
+        Args:
+            random_streams (RandomStreams): Random number streams of the simulation
+            *key (int): Additional key of the stream, e.g. the number of an update
+        """
+        noise = random_streams.standard_normal(len(self.value), self.stream, *key)
+        return self.range_set.distort_measurements(self.value, self.ranges, noise)
+
+    def to_meas_df(
+        self, values: np.ndarray, timestamp: str, cim_namespace: str
+    ) -> pd.DataFrame:
+        """MEAS-Profile of the AnalogValues with the given values."""
+        vals_meas = pd.DataFrame()
+        vals_meas[f"{CIM_ID_OBJ}.mRID"] = quote_mrids(self.mrid)
+        vals_meas["rdf:type"] = f"<{cim_namespace}AnalogValue>"
+        vals_meas["cim:MeasurementValue.timeStamp"] = f'"{timestamp}"'
+        vals_meas["cim:AnalogValue.value"] = values
+        return vals_meas
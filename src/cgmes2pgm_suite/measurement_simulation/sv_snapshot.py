@@ -0,0 +1,139 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from functools import cached_property
+
+import pandas as pd
+from cgmes2pgm_converter.common import CgmesDataset, Profile, Timer
+
+
+class SvSnapshot:
+    """
+    SV values joined with the topology, shared by the voltage and power
+    measurement builders.
+
+    Instead of a grouped query per builder, a few flat queries without joins
+    across profiles are sent to the dataset and joined with pandas.
+    Each query is sent once on first access and shared between the builders.
+    The IRIs keep their base uri, as the builders write them into the dataset again.
+    """
+
+    sv_voltage_query = """
+        ?sv cim:SvVoltage.v ?u;
+            cim:SvVoltage.angle ?angle;
+            cim:SvVoltage.TopologicalNode ?tn.
+    """
+
+    sv_power_flow_query = """
+        ?sv cim:SvPowerFlow.p ?p;
+            cim:SvPowerFlow.q ?q;
+            cim:SvPowerFlow.Terminal ?term.
+    """
+
+    terminal_node_query = """
+        ?term cim:Terminal.TopologicalNode ?tn.
+    """
+
+    terminal_equipment_query = """
+        ?term cim:Terminal.ConductingEquipment ?eq.
+        OPTIONAL { ?term cim:IdentifiedObject.name ?name. }
+    """
+
+    topological_node_query = """
+        ?tn cim:IdentifiedObject.name ?name;
+            cim:TopologicalNode.BaseVoltage ?bv.
+    """
+
+    base_voltage_query = """
+        ?bv cim:BaseVoltage.nominalVoltage ?nomV.
+    """
+
+    def __init__(self, datasource: CgmesDataset):
+        self._datasource = datasource
+
+    @cached_property
+    def voltages(self) -> pd.DataFrame:
+        """
+        SvVoltage of each topological node with at least one terminal.
+        Columns: `tn`, `name`, `nomV`, `u`, `angle`, `term`, `eq`, `sv`,
+        `term` and `eq` are any terminal and equipment at the node.
+        """
+        sv = self._query(self.sv_voltage_query, Profile.SV)
+        sv = sv.drop_duplicates("tn")
+
+        terminals = self._terminals.drop_duplicates("tn")[["tn", "term", "eq"]]
+        voltages = sv.merge(self._nodes, on="tn").merge(terminals, on="tn")
+
+        columns = ["tn", "name", "nomV", "u", "angle", "term", "eq", "sv"]
+        return voltages[columns].sort_values("tn", ignore_index=True)
+
+    @cached_property
+    def power_flows(self) -> pd.DataFrame:
+        """
+        SvPowerFlow of each named terminal.
+        Columns: `sv`, `term`, `eq`, `name`, `tn`, `p`, `q`, `nomV`,
+        `name` is the name of the terminal.
+        """
+        sv = self._query(self.sv_power_flow_query, Profile.SV)
+        sv = sv.drop_duplicates("term")
+
+        terminals = self._terminals.dropna(subset="name")
+        power_flows = sv.merge(terminals, on="term").merge(
+            self._nodes[["tn", "nomV"]], on="tn"
+        )
+
+        columns = ["sv", "term", "eq", "name", "tn", "p", "q", "nomV"]
+        return power_flows[columns].sort_values("term", ignore_index=True)
+
+    @cached_property
+    def _nodes(self) -> pd.DataFrame:
+        """Topological nodes with the columns `tn`, `name` and `nomV`"""
+        nodes = self._query(self.topological_node_query, Profile.TP)
+        base_voltages = self._query(self.base_voltage_query, Profile.EQ)
+        nodes = nodes.drop_duplicates("tn").merge(
+            base_voltages.drop_duplicates("bv"), on="bv"
+        )
+        return nodes[["tn", "name", "nomV"]]
+
+    @cached_property
+    def _terminals(self) -> pd.DataFrame:
+        """Terminals with the columns `term`, `tn`, `eq` and `name`"""
+        terminal_nodes = self._query(self.terminal_node_query, Profile.TP)
+        terminal_equipment = self._query(self.terminal_equipment_query, Profile.EQ)
+        terminals = terminal_nodes.drop_duplicates("term").merge(
+            terminal_equipment.drop_duplicates("term"), on="term"
+        )
+        return terminals[["term", "tn", "eq", "name"]]
+
+    def _query(self, pattern: str, profile: Profile) -> pd.DataFrame:
+        return select_in_profile(self._datasource, pattern, profile)
+
+
+def select_in_profile(
+    datasource: CgmesDataset, pattern: str, profile: Profile
+) -> pd.DataFrame:
+    """Select all variables of a pattern in the graphs of a profile.
+    IRIs keep their base uri."""
+    if datasource.split_profiles:
+        args = {"$GRAPH": datasource.named_graphs.format_for_query(profile)}
+        pattern = datasource.format_query(
+            f"VALUES ?g {{ $GRAPH }} GRAPH ?g {{ {pattern} }}", args
+        )
+
+    with Timer(f"Querying {profile.name}", loglevel=logging.DEBUG):
+        res = datasource.query(
+            f"SELECT * WHERE {{ {pattern} }}", remove_uuid_base_uri=False
+        )
+    return res.drop(columns="g", errors="ignore")
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import uuid
-
 import pandas as pd
 from cgmes2pgm_converter.common import (
     CIM_ID_OBJ,
@@ -22,20 +20,27 @@ from cgmes2pgm_converter.common import (
     Profile,
 )
 
+from cgmes2pgm_suite.common import MridGenerator, quote_mrids
+
 
 class ValueSourceBuilder:
 
     def __init__(
         self,
         datasource: CgmesDataset,
+        mrid_generator: MridGenerator | None = None,
     ):
         self._datasource = datasource
+        self._mrid_generator = mrid_generator or MridGenerator()
         self._sources: dict[MeasurementValueSource, str] = {}
 
     def build_from_sv(self):
 
-        for source in MeasurementValueSource:
-            self._sources[source] = f'"{uuid.uuid4()}"'
+        mrids = self._mrid_generator.create(
+            [str(source) for source in MeasurementValueSource], "MeasurementValueSource"
+        )
+        for source, mrid in zip(MeasurementValueSource, quote_mrids(mrids)):
+            self._sources[source] = mrid
 
         df = pd.DataFrame()
         df[f"{CIM_ID_OBJ}.name"] = [f'"{source}"' for source in MeasurementValueSource]
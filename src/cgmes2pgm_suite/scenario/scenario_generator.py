@@ -0,0 +1,308 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from cgmes2pgm_converter.common import Timer
+from power_grid_model import (
+    CalculationMethod,
+    CalculationType,
+    ComponentType,
+    PowerGridModel,
+    initialize_array,
+)
+from power_grid_model.data_types import BatchDataset, SingleDataset
+from power_grid_model_io.data_types import ExtraInfo
+
+from ..measurement_simulation import (
+    MeasurementSimulationConfiguration,
+    PgmMeasurementSimulator,
+)
+from ..state_estimation import PgmCalculationParameters, PgmDataset
+from ..state_estimation.options import AUTO_THREADS
+from ..state_estimation.thread_tuning import resolve_threads
+
+# Appliances, whose power is scaled by a profile
+PROFILE_COMPONENTS = [ComponentType.sym_load, ComponentType.sym_gen]
+
+SENSOR_COMPONENTS = [
+    ComponentType.sym_voltage_sensor,
+    ComponentType.sym_power_sensor,
+    ComponentType.asym_voltage_sensor,
+    ComponentType.asym_power_sensor,
+]
+
+
+def read_profiles(path: str) -> pd.DataFrame:
+    """Read load and generation profiles from a CSV or Parquet file.
+
+    The first column contains the timestamps, every other column the profile
+    of one load or generator, see `ScenarioGenerator`.
+    Parquet files require `pyarrow` or `fastparquet`.
+
+    Args:
+        path (str): Path to a `.csv` or `.parquet` file
+
+    Returns:
+        pd.DataFrame: Profiles with the timestamps as index
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        profiles = pd.read_parquet(path)
+        if isinstance(profiles.index, pd.RangeIndex):
+            profiles = profiles.set_index(profiles.columns[0])
+        return profiles
+    if extension == ".csv":
+        return pd.read_csv(path, index_col=0)
+
+    raise ValueError(f"Unsupported profile file {path}, expected .csv or .parquet")
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Power flow results and simulated measurements of all time steps.
+
+    Attributes:
+        timestamps (list[str]): Timestamp of each time step
+        input_data (SingleDataset): Power flow input data of the model
+        update_data (BatchDataset): Powers of the loads and generators
+            with a profile in each time step
+        result_data (BatchDataset): Power flow result of each time step,
+            i.e. the values of the SV-Profile
+        converged (np.ndarray): Whether the power flow of each time step converged
+        measurement_input_data (SingleDataset): Input data with the simulated sensors
+            of the first converged time step for a state estimation
+        measurement_update_data (BatchDataset): Measured values of each time step
+            with converged power flow as update of `measurement_input_data`,
+            see `measurement_steps`
+        extra_info (ExtraInfo): Extra info including the simulated sensors
+    """
+
+    timestamps: list[str]
+    input_data: SingleDataset
+    update_data: BatchDataset
+    result_data: BatchDataset
+    converged: np.ndarray
+    measurement_input_data: SingleDataset
+    measurement_update_data: BatchDataset
+    extra_info: ExtraInfo
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def measurement_steps(self) -> np.ndarray:
+        """Time step of each scenario in `measurement_update_data`"""
+        return np.flatnonzero(self.converged)
+
+    def get_pgm_dataset(self, step: int) -> PgmDataset:
+        """Input and result data of a single time step, e.g. to export an SV-Profile
+        with the `SvProfileBuilder`."""
+        input_data = {
+            component: data.copy() for component, data in self.input_data.items()
+        }
+        for component, update in self.update_data.items():
+            data = input_data[component]
+            idx = pd.Index(data["id"]).get_indexer(update["id"][step])
+            data["p_specified"][idx] = update["p_specified"][step]
+            data["q_specified"][idx] = update["q_specified"][step]
+
+        return PgmDataset(
+            input_data=input_data,
+            result_data={
+                component: data[step] for component, data in self.result_data.items()
+            },
+            extra_info=self.extra_info,
+        )
+
+    def __str__(self):
+        divider = "---------------------------------------------"
+        n_voltage = self.measurement_input_data[ComponentType.sym_voltage_sensor].size
+        n_power = self.measurement_input_data[ComponentType.sym_power_sensor].size
+        return (
+            f"{divider}\n"
+            f"Scenarios\n"
+            f"{divider}\n"
+            f"Time steps           {self.n_steps}\n"
+            f"Not converged        {int(np.count_nonzero(~self.converged))}\n"
+            f"Voltage sensors      {n_voltage}\n"
+            f"Power sensors        {n_power}\n"
+            f"{divider}\n"
+        )
+
+
+class ScenarioGenerator:
+    """
+    Calculates load and generation profiles as a single batch power flow and
+    simulates the measurements of each time step.
+
+    The profiles contain one row per time step and one column per load or generator.
+    Columns are matched to the `sym_load` and `sym_gen` of the model by
+    `profile_key` in the extra info, e.g. the mRID of the CGMES equipment.
+    The values are factors of the active and reactive power of the converted model.
+    Appliances without a profile keep their power, sources keep their voltage.
+
+    The measurements are simulated from the power flow results with the measurement
+    ranges and seed of the configuration, see `PgmMeasurementSimulator.simulate_batch`.
+
+    Args:
+        input_data (SingleDataset): Converted PGM input data
+        extra_info (ExtraInfo): Extra info of the converter
+        config (MeasurementSimulationConfiguration): Measurement ranges and seed
+        params (PgmCalculationParameters | None): Parameters for the power flow,
+            threads are calibrated by default
+        profile_key (str): Key in the extra info to match the profile columns
+    """
+
+    def __init__(
+        self,
+        input_data: SingleDataset,
+        extra_info: ExtraInfo,
+        config: MeasurementSimulationConfiguration,
+        params: PgmCalculationParameters | None = None,
+        profile_key: str = "_mrid",
+    ):
+        self.input_data = {
+            component: data
+            for component, data in input_data.items()
+            if component not in SENSOR_COMPONENTS
+        }
+        self.extra_info = extra_info
+        self.config = config
+        self.params = params or PgmCalculationParameters(threads=AUTO_THREADS)
+        self.profile_key = profile_key
+
+    def run(self, profiles: pd.DataFrame, first_step: int = 0) -> ScenarioResult:
+        """Run the power flow of all time steps and simulate the measurements.
+
+        Long profiles can be split into parts, e.g. for parallel workers.
+        With the position of each part as `first_step`, the simulated measurements
+        are the same as in a single run.
+
+        Args:
+            profiles (pd.DataFrame): Power factors with the timestamps as index,
+                see `read_profiles`
+            first_step (int): Position of the first row in the whole profile
+
+        Returns:
+            ScenarioResult: Power flow results and simulated measurements
+        """
+        update_data = self._create_update_data(profiles)
+        model = PowerGridModel(self.input_data)
+
+        with Timer(
+            f"Scenario Power Flow ({len(profiles)} time steps)",
+            loglevel=logging.INFO,
+        ):
+            threads = resolve_threads(
+                self.params,
+                CalculationType.power_flow,
+                self.input_data,
+                update_data,
+                lambda t, data: self._calculate(model, t, data),
+            )
+            result_data = self._calculate(model, threads, update_data)
+
+        converged = np.ones(len(profiles), dtype=bool)
+        if model.batch_error is not None:
+            converged[model.batch_error.failed_scenarios] = False
+            logging.warning(
+                "Power flow failed in %d of %d time steps",
+                np.count_nonzero(~converged),
+                len(profiles),
+            )
+
+        simulator = PgmMeasurementSimulator(
+            self.input_data, self.extra_info, self.config
+        )
+        with Timer("Simulating Scenario Measurements", loglevel=logging.INFO):
+            meas_input, extra_info, meas_update = simulator.simulate_batch(
+                result_data, first_step, converged
+            )
+
+        return ScenarioResult(
+            timestamps=[str(t) for t in profiles.index],
+            input_data=self.input_data,
+            update_data=update_data,
+            result_data=result_data,
+            converged=converged,
+            measurement_input_data=meas_input,
+            measurement_update_data=meas_update,
+            extra_info=extra_info,
+        )
+
+    def _calculate(
+        self, model: PowerGridModel, threads: int, update_data: BatchDataset
+    ) -> BatchDataset:
+        return model.calculate_power_flow(
+            update_data=update_data,
+            calculation_method=CalculationMethod.newton_raphson,
+            max_iterations=self.params.max_iterations,
+            error_tolerance=self.params.error_tolerance,
+            threading=threads,
+            symmetric=True,
+            continue_on_batch_error=True,
+        )
+
+    def _create_update_data(self, profiles: pd.DataFrame) -> BatchDataset:
+        """Dense batch with the scaled powers of the appliances with a profile"""
+        factors = profiles.to_numpy(dtype=np.float64)
+        columns = pd.Index(profiles.columns.astype(str))
+        matched = np.zeros(len(columns), dtype=bool)
+        update_data: BatchDataset = {}
+
+        for component in PROFILE_COMPONENTS:
+            data = self.input_data.get(component)
+            if data is None or not data.size:
+                continue
+
+            keys = pd.Index(
+                [
+                    str(self.extra_info.get(int(i), {}).get(self.profile_key))
+                    for i in data["id"]
+                ]
+            )
+            column_idx = columns.get_indexer(keys)
+            has_profile = column_idx >= 0
+            matched[column_idx[has_profile]] = True
+            if not np.any(has_profile):
+                continue
+
+            update = initialize_array(
+                "update", component, (len(profiles), int(np.count_nonzero(has_profile)))
+            )
+            factor = factors[:, column_idx[has_profile]]
+            update["id"] = data["id"][has_profile]
+            update["p_specified"] = data["p_specified"][has_profile] * factor
+            update["q_specified"] = data["q_specified"][has_profile] * factor
+            update_data[component] = update
+
+        if not np.all(matched):
+            logging.warning(
+                "%d profiles without load or generator: %s",
+                np.count_nonzero(~matched),
+                columns[~matched].tolist()[:10],
+            )
+        if not update_data:
+            raise ValueError(
+                f"No profile matches a load or generator by {self.profile_key}"
+            )
+
+        return update_data
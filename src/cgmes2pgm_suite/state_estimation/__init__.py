@@ -12,6 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .options import PgmCalculationParameters, StesOptions
-from .results import PgmDataset, StateEstimationResult
+from .bad_data import EliminatedMeasurement
+from .monte_carlo import MonteCarloResult, MonteCarloStudy
+from .observability import ObservabilityResult, check_observability
+from .options import (
+    AUTO_THREADS,
+    PgmCalculationParameters,
+    ResultRetention,
+    StesOptions,
+    ValidationMode,
+)
+from .result_spill import load_spilled_datasets, spill_result
+from .results import PgmDataset, StateEstimationResult, StateEstimationSummary
+from .subnet_cache import SubnetCache
+from .telemetry import RunTelemetry, TelemetryTable
+from .validation import structural_fingerprint, validate_state_estimation_input
 from .wrapper import StateEstimationWrapper
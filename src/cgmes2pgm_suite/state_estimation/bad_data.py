@@ -0,0 +1,111 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+import numpy as np
+from power_grid_model import ComponentType, initialize_array
+from power_grid_model.data_types import SingleDataset
+
+# Sigma of an eliminated measurement is multiplied by this factor,
+# so that its weight in the state estimation becomes negligible
+ELIMINATION_SIGMA_FACTOR = 1e4
+
+QUANTITY_COMPONENTS = {
+    "u": ComponentType.sym_voltage_sensor,
+    "p": ComponentType.sym_power_sensor,
+    "q": ComponentType.sym_power_sensor,
+}
+
+
+@dataclass
+class EliminatedMeasurement:
+    """
+    Measurement removed by the bad data elimination.
+
+    Attributes:
+        sensor_id (int): PGM id of the sensor
+        quantity (str): Eliminated quantity of the sensor: "u", "p" or "q"
+        normalized_residual (float): `residual / sigma` of the measurement
+            in the state estimation before its elimination
+        j (float): Value of the objective function before the elimination
+    """
+
+    sensor_id: int
+    quantity: str
+    normalized_residual: float
+    j: float
+
+    @property
+    def component(self) -> ComponentType:
+        return QUANTITY_COMPONENTS[self.quantity]
+
+
+def get_sensor_sigma(sensors: np.ndarray, quantity: str) -> np.ndarray:
+    """Effective sigma of the sensors for a quantity (`u`, `p` or `q`),
+    `power_sigma` if the sigma of `p` or `q` is not given.
+
+    Args:
+        sensors (np.ndarray): PGM input data of the voltage or power sensors
+        quantity (str): Measured quantity: "u", "p" or "q"
+
+    Returns:
+        np.ndarray: Sigma of each sensor
+    """
+    sigma = sensors[f"{quantity}_sigma"]
+    if quantity == "u":
+        return sigma
+    return np.where(np.isnan(sigma), sensors["power_sigma"], sigma)
+
+
+def create_elimination_update(
+    input_data: SingleDataset,
+    measurement: EliminatedMeasurement,
+    eliminated: list[EliminatedMeasurement] | None = None,
+) -> SingleDataset:
+    """Create update data, that deweights the given measurement.
+
+    PGM does not support removing components from an existing model,
+    so the sigma of the measurement is increased instead.
+    Power sensors get both `p_sigma` and `q_sigma`, as PGM requires both
+    if one of them is set.
+
+    Args:
+        input_data (SingleDataset): Input data of the model
+        measurement (EliminatedMeasurement): Measurement to eliminate
+        eliminated (list[EliminatedMeasurement] | None): Measurements eliminated
+            before, that keep their increased sigma
+
+    Returns:
+        SingleDataset: Update data for `PowerGridModel.update`
+    """
+    component = measurement.component
+    sensors = input_data[component]
+    sensor = sensors[sensors["id"] == measurement.sensor_id]
+    deweighted = {
+        m.quantity
+        for m in [*(eliminated or []), measurement]
+        if m.sensor_id == measurement.sensor_id
+    }
+
+    update = initialize_array("update", component, 1)
+    update["id"] = measurement.sensor_id
+    quantities = ["u"] if component == ComponentType.sym_voltage_sensor else ["p", "q"]
+    for quantity in quantities:
+        sigma = get_sensor_sigma(sensor, quantity)[0]
+        if quantity in deweighted:
+            sigma *= ELIMINATION_SIGMA_FACTOR
+        update[f"{quantity}_sigma"] = sigma
+
+    return {component: update}
@@ -0,0 +1,67 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from power_grid_model import CalculationMethod, CalculationType, PowerGridModel
+from power_grid_model.data_types import BatchDataset, Dataset, SingleDataset
+
+from .options import PgmCalculationParameters
+from .thread_tuning import resolve_threads
+
+
+def calculate_state_estimation(
+    model: PowerGridModel,
+    params: PgmCalculationParameters,
+    update_data: BatchDataset | None = None,
+    continue_on_batch_error: bool = False,
+    input_data: SingleDataset | None = None,
+) -> Dataset:
+    """Run a symmetric Newton-Raphson state estimation on the given model.
+
+    Args:
+        model (PowerGridModel): Model to run the state estimation on
+        params (PgmCalculationParameters): Parameters for the calculation
+        update_data (BatchDataset | None): Optional update data to run a batch calculation
+        continue_on_batch_error (bool): Return the results of the successful scenarios
+            of a batch calculation instead of raising an error,
+            failed scenarios are available via `model.batch_error`
+        input_data (SingleDataset | None): Input data of the model, used to cache
+            the calibrated thread count if `params.threads` is "auto"
+
+    Returns:
+        Dataset: Result data of the state estimation,
+            a batch dataset if `update_data` is given
+
+    Raises:
+        SparseMatrixError, IterationDiverge: If the state estimation fails
+    """
+
+    def calculate(threads: int, data: BatchDataset | None, continue_on_error: bool):
+        return model.calculate_state_estimation(
+            update_data=data,
+            calculation_method=CalculationMethod.newton_raphson,
+            max_iterations=params.max_iterations,
+            error_tolerance=params.error_tolerance,
+            threading=threads,
+            symmetric=True,
+            continue_on_batch_error=continue_on_error,
+        )
+
+    threads = resolve_threads(
+        params,
+        CalculationType.state_estimation,
+        input_data,
+        update_data,
+        lambda t, data: calculate(t, data, continue_on_error=True),
+    )
+    return calculate(threads, update_data, continue_on_batch_error)
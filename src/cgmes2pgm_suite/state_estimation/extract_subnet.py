@@ -34,9 +34,7 @@ def connect_branch(topo_branch, topo, connect=True):
     if src1_id is None or src2_id is None:
         return False
 
-    pgm_branch = topo_branch.get(ComponentType.line)
-    if pgm_branch is None:
-        pgm_branch = topo_branch[ComponentType.generic_branch]
+    pgm_branch = get_pgm_branch(topo_branch)
 
     pgm_src1 = topo[src1_id].get(ComponentType.source)
     pgm_src2 = topo[src2_id].get(ComponentType.source)
@@ -81,6 +79,14 @@ def connect_branch(topo_branch, topo, connect=True):
     return True
 
 
+def get_pgm_branch(topo_branch):
+    """Get the PGM line or generic branch of a topology item."""
+    pgm_branch = topo_branch.get(ComponentType.line)
+    if pgm_branch is None:
+        pgm_branch = topo_branch[ComponentType.generic_branch]
+    return pgm_branch
+
+
 def extract_subnet_from_input_data(
     input_data, extra_info, subnet
 ) -> dict[ComponentType, np.ndarray]:
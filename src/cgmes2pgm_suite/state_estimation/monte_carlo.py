@@ -0,0 +1,285 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+from cgmes2pgm_converter.common import Timer
+from power_grid_model import ComponentType, PowerGridModel, initialize_array
+from power_grid_model.data_types import BatchDataset, SingleDataset
+from power_grid_model_io.data_types import ExtraInfo
+
+from .bad_data import get_sensor_sigma
+from .calculation import calculate_state_estimation
+from .options import PgmCalculationParameters
+from .results import StateEstimationResult
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    Statistics of a Monte Carlo study of the state estimation.
+
+    Attributes:
+        n_scenarios (int): Number of simulated measurement realizations
+        failed_scenarios (np.ndarray): Indices of the scenarios that did not converge
+        j (np.ndarray): Objective function J of each converged scenario
+        e_j (float): Expected value of J, see `StateEstimationResult.e_j`
+        node_ids (np.ndarray): Ids of the nodes in `voltage_errors`
+        voltage_errors (np.ndarray): Estimated minus reference node voltage in p.u.
+            with shape (converged scenarios, nodes)
+        bad_data_hit_rates (dict[str, np.ndarray]): Share of converged scenarios,
+            in which a measurement "u", "p" or "q" of a sensor is detected as bad data.
+            NaN for substituted measurements.
+        sensor_ids (dict[str, np.ndarray]): Sensor ids of `bad_data_hit_rates`
+    """
+
+    n_scenarios: int
+    failed_scenarios: np.ndarray
+    j: np.ndarray
+    e_j: float
+    node_ids: np.ndarray
+    voltage_errors: np.ndarray
+    bad_data_hit_rates: dict[str, np.ndarray] = field(default_factory=dict)
+    sensor_ids: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def n_converged(self) -> int:
+        return self.n_scenarios - len(self.failed_scenarios)
+
+    @property
+    def j_mean(self) -> float:
+        return float(np.mean(self.j)) if self.j.size else np.nan
+
+    @property
+    def j_std(self) -> float:
+        return float(np.std(self.j)) if self.j.size else np.nan
+
+    def j_percentile(self, q: float) -> float:
+        return float(np.percentile(self.j, q)) if self.j.size else np.nan
+
+    @property
+    def share_j_exceeded(self) -> float:
+        """Share of converged scenarios with J above `E(J) + 3σ`"""
+        if not self.j.size:
+            return np.nan
+        return float(np.mean(self.j > self.e_j + 3 * np.sqrt(2 * self.e_j)))
+
+    @property
+    def max_voltage_error(self) -> float:
+        """Maximum absolute node voltage error over all scenarios in p.u."""
+        if not self.voltage_errors.size:
+            return np.nan
+        return float(np.max(np.abs(self.voltage_errors)))
+
+    @property
+    def rms_voltage_error(self) -> np.ndarray:
+        """Root mean square voltage error of each node in p.u."""
+        return np.sqrt(np.mean(self.voltage_errors**2, axis=0))
+
+    def __str__(self):
+        divider = "---------------------------------------------"
+
+        mean_hit_rates = {
+            quantity: np.nanmean(rates) if np.any(~np.isnan(rates)) else np.nan
+            for quantity, rates in self.bad_data_hit_rates.items()
+        }
+        return (
+            f"{divider}\n"
+            f"Monte Carlo State Estimation\n"
+            f"{divider}\n"
+            f"Scenarios            {self.n_scenarios}\n"
+            f"Converged            {self.n_converged}\n"
+            f"{divider}\n"
+            f"E(J)                 {self.e_j:.2f}\n"
+            f"J mean               {self.j_mean:.2f}\n"
+            f"J std                {self.j_std:.2f}\n"
+            f"J 95% percentile     {self.j_percentile(95):.2f}\n"
+            f"J > E(J) + 3σ        {self.share_j_exceeded:.2%}\n"
+            f"{divider}\n"
+            f"Max voltage error    {self.max_voltage_error:.6f} p.u.\n"
+            f"{divider}\n"
+            f"Bad data rate U      {mean_hit_rates.get('u', np.nan):.2%}\n"
+            f"Bad data rate P      {mean_hit_rates.get('p', np.nan):.2%}\n"
+            f"Bad data rate Q      {mean_hit_rates.get('q', np.nan):.2%}\n"
+            f"{divider}\n"
+        )
+
+
+class MonteCarloStudy:
+    """
+    Monte Carlo study of the state estimation to validate the sensor placement.
+
+    A reference state is estimated once from the given input data. The estimated
+    measurement values (`measured - residual`) are used as true values, which are
+    distorted `n_scenarios` times with normally distributed noise using the sigmas of
+    the sensors. All realizations are solved in a single batch state estimation.
+
+    Args:
+        input_data (SingleDataset): Converted input data with sensors
+        extra_info (ExtraInfo): Extra information of the input data
+        params (PgmCalculationParameters): Parameters for the state estimation
+        n_scenarios (int): Number of measurement realizations
+        seed (int | None): Seed of the random number generator
+    """
+
+    def __init__(
+        self,
+        input_data: SingleDataset,
+        extra_info: ExtraInfo,
+        params: PgmCalculationParameters | None = None,
+        n_scenarios: int = 100,
+        seed: int | None = None,
+    ):
+        self.input_data = input_data
+        self.extra_info = extra_info
+        self.params = params or PgmCalculationParameters()
+        self.n_scenarios = n_scenarios
+        self.rng = np.random.default_rng(seed)
+
+    def run(self) -> MonteCarloResult:
+        """Run the Monte Carlo study.
+
+        Returns:
+            MonteCarloResult: Statistics of the converged scenarios
+
+        Raises:
+            SparseMatrixError, IterationDiverge: If the reference state estimation fails
+        """
+        model = PowerGridModel(self.input_data)
+
+        with Timer("Reference State Estimation", loglevel=logging.INFO):
+            reference = StateEstimationResult(
+                "reference",
+                self.input_data,
+                self.extra_info,
+                calculate_state_estimation(model, self.params),
+                self.params,
+            )
+
+        update_data = self._create_update_data(reference)
+
+        with Timer(
+            f"Monte Carlo State Estimation ({self.n_scenarios} scenarios)",
+            loglevel=logging.INFO,
+        ):
+            batch_result = calculate_state_estimation(
+                model,
+                self.params,
+                update_data,
+                continue_on_batch_error=True,
+                input_data=self.input_data,
+            )
+
+        failed = (
+            np.asarray(model.batch_error.failed_scenarios)
+            if model.batch_error is not None
+            else np.array([], dtype=np.int64)
+        )
+        if failed.size:
+            logging.warning(
+                "State Estimation failed in %d of %d scenarios",
+                failed.size,
+                self.n_scenarios,
+            )
+
+        converged = np.ones(self.n_scenarios, dtype=bool)
+        converged[failed] = False
+
+        return self._evaluate(reference, batch_result, converged, failed)
+
+    def _create_update_data(self, reference: StateEstimationResult) -> BatchDataset:
+        """Draw noisy measurements around the reference state for all scenarios"""
+
+        update_data: BatchDataset = {}
+
+        sensors = self.input_data[ComponentType.sym_voltage_sensor]
+        results = reference.result_data[ComponentType.sym_voltage_sensor]
+        u_update = initialize_array(
+            "update", ComponentType.sym_voltage_sensor, (self.n_scenarios, len(sensors))
+        )
+        u_update["id"] = sensors["id"]
+        u_update["u_measured"] = self._distort(
+            sensors["u_measured"] - results["u_residual"], sensors["u_sigma"]
+        )
+        update_data[ComponentType.sym_voltage_sensor] = u_update
+
+        sensors = self.input_data[ComponentType.sym_power_sensor]
+        results = reference.result_data[ComponentType.sym_power_sensor]
+        pq_update = initialize_array(
+            "update", ComponentType.sym_power_sensor, (self.n_scenarios, len(sensors))
+        )
+        pq_update["id"] = sensors["id"]
+        for quantity in ("p", "q"):
+            pq_update[f"{quantity}_measured"] = self._distort(
+                sensors[f"{quantity}_measured"] - results[f"{quantity}_residual"],
+                get_sensor_sigma(sensors, quantity),
+            )
+        update_data[ComponentType.sym_power_sensor] = pq_update
+
+        return update_data
+
+    def _distort(self, true_values: np.ndarray, sigma: np.ndarray) -> np.ndarray:
+        noise = self.rng.standard_normal((self.n_scenarios, true_values.shape[0]))
+        return true_values + noise * sigma
+
+    def _evaluate(
+        self,
+        reference: StateEstimationResult,
+        batch_result: BatchDataset,
+        converged: np.ndarray,
+        failed: np.ndarray,
+    ) -> MonteCarloResult:
+        masks = reference.measurement_masks
+        tolerance = self.params.bad_data_tolerance
+
+        sensors = {
+            "u": self.input_data[ComponentType.sym_voltage_sensor],
+            "p": self.input_data[ComponentType.sym_power_sensor],
+            "q": self.input_data[ComponentType.sym_power_sensor],
+        }
+        residuals = {
+            "u": batch_result[ComponentType.sym_voltage_sensor]["u_residual"],
+            "p": batch_result[ComponentType.sym_power_sensor]["p_residual"],
+            "q": batch_result[ComponentType.sym_power_sensor]["q_residual"],
+        }
+
+        j = np.zeros(int(np.count_nonzero(converged)))
+        hit_rates = {}
+        for quantity, residual in residuals.items():
+            normalized = (
+                residual[converged][:, masks[quantity]]
+                / get_sensor_sigma(sensors[quantity], quantity)[masks[quantity]]
+            )
+            j += np.sum(normalized**2, axis=1)
+
+            rates = np.full(masks[quantity].shape, np.nan)
+            if normalized.shape[0]:
+                rates[masks[quantity]] = np.mean(np.abs(normalized) > tolerance, axis=0)
+            hit_rates[quantity] = rates
+
+        node_u_pu = batch_result[ComponentType.node]["u_pu"][converged]
+        reference_u_pu = reference.result_data[ComponentType.node]["u_pu"]
+
+        return MonteCarloResult(
+            n_scenarios=self.n_scenarios,
+            failed_scenarios=failed,
+            j=j,
+            e_j=reference.e_j,
+            node_ids=reference.result_data[ComponentType.node]["id"],
+            voltage_errors=node_u_pu - reference_u_pu,
+            bad_data_hit_rates=hit_rates,
+            sensor_ids={quantity: s["id"] for quantity, s in sensors.items()},
+        )
@@ -0,0 +1,346 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Topological observability pre-check of the state estimation.
+
+The check only evaluates necessary conditions of observability, so a subnet reported
+as unobservable can not be estimated by PGM, while an observable subnet may still fail:
+
+- The subnet contains at least one voltage sensor.
+- The number of measurements is at least the number of state variables `2 * n - 1`.
+- The flow islands, formed by branches with power flow measurements, can be
+  connected to a single island using branches adjacent to nodes with an
+  injection measurement.
+
+Islands without an active source are de-energized and not checked.
+Nodes without energized loads, generators or sources are treated as measured zero
+injections. Shunts are part of the admittance matrix in PGM and do not count as injections.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+from power_grid_model import ComponentType, MeasuredTerminalType
+from power_grid_model.data_types import SingleDataset
+
+BRANCH_COMPONENTS = [
+    ComponentType.line,
+    ComponentType.generic_branch,
+    ComponentType.link,
+    ComponentType.transformer,
+]
+
+APPLIANCE_COMPONENTS = [
+    ComponentType.sym_load,
+    ComponentType.sym_gen,
+    ComponentType.source,
+]
+
+BRANCH_TERMINALS = [MeasuredTerminalType.branch_from, MeasuredTerminalType.branch_to]
+BRANCH3_TERMINALS = [
+    MeasuredTerminalType.branch3_1,
+    MeasuredTerminalType.branch3_2,
+    MeasuredTerminalType.branch3_3,
+]
+
+
+@dataclass
+class UnobservableIsland:
+    """
+    Energized island of the network, that is not observable.
+
+    Attributes:
+        node_ids (frozenset[int]): Ids of the nodes in the island
+        reason (str): Violated condition
+    """
+
+    node_ids: frozenset[int]
+    reason: str
+
+
+@dataclass
+class ObservabilityResult:
+    """
+    Result of the topological observability check.
+
+    Attributes:
+        n_islands (int): Number of energized islands in the checked data
+        unobservable_islands (list[UnobservableIsland]): Islands that are not observable
+    """
+
+    n_islands: int = 0
+    unobservable_islands: list[UnobservableIsland] = field(default_factory=list)
+
+    @property
+    def observable(self) -> bool:
+        return not self.unobservable_islands
+
+    @property
+    def reasons(self) -> list[str]:
+        return [island.reason for island in self.unobservable_islands]
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = np.arange(size)
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return False
+        self.parent[root_j] = root_i
+        return True
+
+    def roots(self) -> np.ndarray:
+        return np.array([self.find(i) for i in range(len(self.parent))], dtype=int)
+
+
+def check_observability(input_data: SingleDataset) -> ObservabilityResult:
+    """Check the necessary conditions of observability for every energized island.
+
+    Args:
+        input_data (SingleDataset): PGM input data including the sensors
+
+    Returns:
+        ObservabilityResult: Result of the check
+    """
+    node_ids = input_data[ComponentType.node]["id"]
+    if node_ids.size == 0:
+        return ObservabilityResult()
+
+    node_idx = {int(node_id): i for i, node_id in enumerate(node_ids)}
+    branches = _get_energized_branches(input_data, node_idx)
+    branch3 = _get_energized_branch3(input_data, node_idx)
+
+    islands = _UnionFind(len(node_ids))
+    for nodes in [*branches.values(), *branch3.values()]:
+        _union_all(islands, nodes)
+
+    n_meas, has_voltage, flow_islands, injection_nodes = _collect_measurements(
+        input_data, node_idx, branches, branch3
+    )
+    flow_roots = flow_islands.roots()
+
+    # Each injection measurement can connect adjacent flow islands
+    for nodes in [*branches.values(), *branch3.values()]:
+        if np.any(injection_nodes[list(nodes)]):
+            _union_all(flow_islands, nodes)
+    merged_roots = flow_islands.roots()
+
+    island_roots = islands.roots()
+    result = ObservabilityResult()
+    for root in _get_energized_roots(input_data, node_idx, island_roots):
+        nodes = np.flatnonzero(island_roots == root)
+        result.n_islands += 1
+
+        reason = _check_island(
+            nodes,
+            n_meas,
+            has_voltage,
+            flow_roots,
+            merged_roots,
+            injection_nodes,
+        )
+        if reason is not None:
+            result.unobservable_islands.append(
+                UnobservableIsland(
+                    node_ids=frozenset(int(node_ids[i]) for i in nodes),
+                    reason=reason,
+                )
+            )
+
+    return result
+
+
+def _check_island(
+    nodes: np.ndarray,
+    n_meas: np.ndarray,
+    has_voltage: np.ndarray,
+    flow_roots: np.ndarray,
+    merged_roots: np.ndarray,
+    injection_nodes: np.ndarray,
+) -> str | None:
+    if not np.any(has_voltage[nodes]):
+        return "no voltage sensor"
+
+    n_statevars = 2 * len(nodes) - 1
+    n_island_meas = int(np.sum(n_meas[nodes]))
+    if n_island_meas < n_statevars:
+        return f"{n_island_meas} measurements for {n_statevars} state variables"
+
+    if np.unique(merged_roots[nodes]).size > 1:
+        return "flow islands cannot be connected by injection measurements"
+
+    # Each injection measurement can connect at most one further flow island
+    n_flow_islands = np.unique(flow_roots[nodes]).size
+    n_injections = int(np.count_nonzero(injection_nodes[nodes]))
+    if n_flow_islands - 1 > n_injections:
+        return (
+            f"{n_flow_islands} flow islands, "
+            f"but only {n_injections} injection measurements"
+        )
+
+    return None
+
+
+def _get_energized_roots(
+    input_data: SingleDataset, node_idx: dict[int, int], island_roots: np.ndarray
+) -> np.ndarray:
+    """Roots of the islands fed by at least one active source"""
+    sources = input_data.get(ComponentType.source)
+    if sources is None:
+        return np.empty(0, dtype=int)
+
+    source_nodes = [node_idx[n] for n in sources["node"][sources["status"] == 1]]
+    return np.unique(island_roots[source_nodes]).astype(int)
+
+
+def _union_all(union_find: _UnionFind, nodes: tuple[int, ...]):
+    for node in nodes[1:]:
+        union_find.union(nodes[0], node)
+
+
+def _get_energized_branches(
+    input_data: SingleDataset, node_idx: dict[int, int]
+) -> dict[int, tuple[int, int]]:
+    branches = {}
+    for component in BRANCH_COMPONENTS:
+        data = input_data.get(component)
+        if data is None:
+            continue
+        energized = (data["from_status"] == 1) & (data["to_status"] == 1)
+        for branch_id, from_node, to_node in zip(
+            data["id"][energized],
+            data["from_node"][energized],
+            data["to_node"][energized],
+        ):
+            branches[int(branch_id)] = (node_idx[from_node], node_idx[to_node])
+    return branches
+
+
+def _get_energized_branch3(
+    input_data: SingleDataset, node_idx: dict[int, int]
+) -> dict[int, tuple[int, int, int]]:
+    data = input_data.get(ComponentType.three_winding_transformer)
+    if data is None:
+        return {}
+
+    energized = (data["status_1"] == 1) & (data["status_2"] == 1)
+    energized &= data["status_3"] == 1
+    return {
+        int(trafo_id): (node_idx[node_1], node_idx[node_2], node_idx[node_3])
+        for trafo_id, node_1, node_2, node_3 in zip(
+            data["id"][energized],
+            data["node_1"][energized],
+            data["node_2"][energized],
+            data["node_3"][energized],
+        )
+    }
+
+
+def _collect_measurements(
+    input_data: SingleDataset,
+    node_idx: dict[int, int],
+    branches: dict[int, tuple[int, int]],
+    branch3: dict[int, tuple[int, int, int]],
+) -> tuple[np.ndarray, np.ndarray, _UnionFind, np.ndarray]:
+    """Assign the measurements to the nodes of the network.
+
+    Returns:
+        n_meas: Number of measurements per node
+        has_voltage: True for nodes with a voltage sensor
+        flow_islands: Nodes connected by branches with a power flow measurement
+        injection_nodes: True for nodes with a (zero) injection measurement
+    """
+    n_nodes = len(node_idx)
+    n_meas = np.zeros(n_nodes, dtype=int)
+    has_voltage = np.zeros(n_nodes, dtype=bool)
+    flow_islands = _UnionFind(n_nodes)
+
+    voltage_sensors = input_data.get(ComponentType.sym_voltage_sensor)
+    if voltage_sensors is not None and voltage_sensors.size:
+        idx = np.array([node_idx[n] for n in voltage_sensors["measured_object"]])
+        has_voltage[idx] = True
+        np.add.at(n_meas, idx, 1 + ~np.isnan(voltage_sensors["u_angle_measured"]))
+
+    # Links have no impedance, their nodes are treated as a single flow island
+    links = input_data.get(ComponentType.link)
+    if links is not None:
+        for link_id in links["id"]:
+            if int(link_id) in branches:
+                _union_all(flow_islands, branches[int(link_id)])
+                n_meas[branches[int(link_id)][0]] += 2
+
+    appliance_nodes = _get_appliance_nodes(input_data, node_idx)
+    measured_appliances = set()
+    injection_measured = np.zeros(n_nodes, dtype=bool)
+
+    power_sensors = input_data.get(ComponentType.sym_power_sensor)
+    if power_sensors is None:
+        power_sensors = []
+
+    for obj, terminal in (
+        (int(s["measured_object"]), s["measured_terminal_type"]) for s in power_sensors
+    ):
+        if terminal in BRANCH_TERMINALS:
+            nodes = branches.get(obj)
+        elif terminal in BRANCH3_TERMINALS:
+            nodes = branch3.get(obj)
+        elif terminal == MeasuredTerminalType.node:
+            nodes = (node_idx[obj],)
+            injection_measured[nodes[0]] = True
+        else:
+            nodes = (appliance_nodes[obj],) if obj in appliance_nodes else None
+            measured_appliances.add(obj)
+
+        if nodes is None:
+            continue
+        _union_all(flow_islands, nodes)
+        n_meas[nodes[0]] += 2
+
+    # Injection is measured if all energized appliances are measured,
+    # nodes without appliances are zero injections
+    has_appliances = np.zeros(n_nodes, dtype=bool)
+    unmeasured_appliances = np.zeros(n_nodes, dtype=bool)
+    for appliance_id, idx in appliance_nodes.items():
+        has_appliances[idx] = True
+        if appliance_id not in measured_appliances:
+            unmeasured_appliances[idx] = True
+
+    n_meas[~has_appliances] += 2
+    injection_nodes = injection_measured | ~unmeasured_appliances
+
+    return n_meas, has_voltage, flow_islands, injection_nodes
+
+
+def _get_appliance_nodes(
+    input_data: SingleDataset, node_idx: dict[int, int]
+) -> dict[int, int]:
+    appliance_nodes = {}
+    for component in APPLIANCE_COMPONENTS:
+        data = input_data.get(component)
+        if data is None:
+            continue
+        energized = data["status"] == 1
+        for appliance_id, node in zip(data["id"][energized], data["node"][energized]):
+            appliance_nodes[int(appliance_id)] = node_idx[node]
+    return appliance_nodes
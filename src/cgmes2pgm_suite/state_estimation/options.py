@@ -13,6 +13,10 @@
 # limitations under the License.
 
 from dataclasses import dataclass, field
+from enum import StrEnum
+
+# Value of `PgmCalculationParameters.threads` to calibrate the thread count
+AUTO_THREADS = "auto"
 
 
 @dataclass
@@ -20,19 +24,49 @@ class PgmCalculationParameters:
     """Parameters for the PGM calculation.
 
     Attributes:
-        threads (int): Number of threads to use for the calculation.
+        threads (int | str): Number of threads to use for the calculation.
             -1 means no threading, 0 means use all available threads.
+            "auto" calibrates the thread count of large batch calculations once per
+            model and calculation type.
         max_iter (int): Maximum number of iterations for the calculation.
         error_tolerance (float): Tolerance for the error in the calculation.
         bad_data_tolerance (int): Tolerance for bad data in the calculation.
     """
 
-    threads: int = -1
+    threads: int | str = -1
     max_iterations: int = 100
     error_tolerance: float = 1e-6
     bad_data_tolerance: float = 3.0
 
 
+class ResultRetention(StrEnum):
+    """Which full results of a state estimation session are kept in memory.
+
+    - ALL: Keep all results
+    - CONVERGED: Keep full results of converged runs, summaries of failed runs
+    - FINAL: Keep full results of converged runs, that are not superseded by a later
+        converged run containing all of their nodes (e.g. previous reconnect steps)
+    """
+
+    ALL = "all"
+    CONVERGED = "converged"
+    FINAL = "final"
+
+
+class ValidationMode(StrEnum):
+    """Validation of the input data before the state estimation.
+
+    - FULL: Validate the input data with PGM on every run
+    - CACHED: Reuse the validation of input data with the same structure
+        (ids, topology, statuses and parameters) and only check the sensor values
+    - SKIP: Do not validate the input data
+    """
+
+    FULL = "full"
+    CACHED = "cached"
+    SKIP = "skip"
+
+
 @dataclass
 class StesOptions:
     """Options for the state estimation process.
@@ -47,6 +81,29 @@ class StesOptions:
         reconnect_branches (bool): Whether to reconnect branches.
             If the network has been split, trying to reconnect branches
             until State Estimation diverges.
+        reconnect_workers (int): Number of worker processes used to reconnect branches.
+            The next candidates are evaluated speculatively in parallel and committed in order.
+            1 reconnects all branches sequentially.
+        bad_data_elimination (bool): Whether to eliminate bad data iteratively.
+            The measurement with the largest normalized residual is deweighted and the
+            state estimation is repeated, until J is within `E(J) + 3σ`.
+        max_bad_data_eliminations (int): Maximum number of measurements to eliminate.
+        check_observability (bool): Whether to check the observability of the network
+            topologically before each state estimation. Unobservable networks and
+            reconnect candidates are skipped without building a PGM model.
+        result_retention (ResultRetention): Which full results are kept in memory,
+            all other runs are replaced by a `StateEstimationSummary`.
+        result_spill_folder (str | None): Folder to store replaced full results
+            as `.npz` files. None to discard them.
+        validation_mode (ValidationMode): Validation of the input data before running
+            the state estimation.
+        incremental_subnets (bool): Whether to reuse the converged results of subnets,
+            whose input data did not change since the previous run
+            (only with `compute_islands_separately`).
+        incremental_tolerance (float): Maximum change of a measured value in multiples
+            of its sigma for a subnet to be considered unchanged.
+        incremental_cache_folder (str | None): Folder to persist the subnet results
+            between runs of the suite. None to only keep them in memory.
     """
 
     pgm_parameters: PgmCalculationParameters = field(
@@ -55,3 +112,13 @@ class StesOptions:
     compute_islands_separately: bool = False
     compute_only_subnets: list = field(default_factory=list)
     reconnect_branches: bool = False
+    reconnect_workers: int = 1
+    bad_data_elimination: bool = False
+    max_bad_data_eliminations: int = 10
+    check_observability: bool = False
+    result_retention: ResultRetention = ResultRetention.ALL
+    result_spill_folder: str | None = None
+    validation_mode: ValidationMode = ValidationMode.FULL
+    incremental_subnets: bool = False
+    incremental_tolerance: float = 0.1
+    incremental_cache_folder: str | None = None
@@ -0,0 +1,261 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers to evaluate reconnect candidates of `StateEstimationWrapper._reconnect_branches`
+speculatively in worker processes.
+"""
+
+import time
+from dataclasses import dataclass, field
+from multiprocessing import util
+
+import numpy as np
+from cgmes2pgm_converter.common import Topology
+from power_grid_model import ComponentType, PowerGridModel
+from power_grid_model.data_types import SingleDataset
+from power_grid_model.errors import IterationDiverge, SparseMatrixError
+from power_grid_model_io.data_types import ExtraInfo
+
+from ..common import ModelStoreHandle, SharedModelStore
+from .calculation import calculate_state_estimation
+from .extract_subnet import (
+    connect_branch,
+    extract_subnet_from_input_data,
+    get_pgm_branch,
+)
+from .observability import check_observability
+from .options import PgmCalculationParameters
+from .telemetry import (
+    RunTelemetry,
+    create_not_observable_telemetry,
+    create_telemetry,
+)
+
+# Attributes changed by `connect_branch`
+STATUS_ATTRIBUTES = {
+    ComponentType.line: ["from_status", "to_status"],
+    ComponentType.generic_branch: ["from_status", "to_status"],
+    ComponentType.source: ["status"],
+}
+
+
+@dataclass
+class ReconnectEvaluation:
+    """
+    Outcome of the evaluation of a single reconnect candidate.
+
+    Attributes:
+        branch_id (int): PGM id of the branch to reconnect
+        connected (bool): True if the branch and its sources could change their status
+        from_subnet_before (str | None): Subnet of the from node before reconnecting
+        to_subnet_before (str | None): Subnet of the to node before reconnecting
+        from_subnet_after (str | None): Subnet of the from node after reconnecting
+        to_subnet_after (str | None): Subnet of the to node after reconnecting
+        n_subnets (int): Number of subnets after reconnecting
+        subnet_nodes (frozenset[int]): Ids of all nodes in the subnet(s) of the branch
+            after reconnecting
+        sub_input_data (SingleDataset | None): Input data of the evaluated subnet
+        result_data (SingleDataset | None): Result of the state estimation,
+            None if it failed or was not run
+        error (str | None): First line of the error message if the state estimation failed
+        telemetry (RunTelemetry | None): Convergence and timing information,
+            without run name
+    """
+
+    branch_id: int
+    connected: bool
+    from_subnet_before: str | None = None
+    to_subnet_before: str | None = None
+    from_subnet_after: str | None = None
+    to_subnet_after: str | None = None
+    n_subnets: int = 0
+    subnet_nodes: frozenset[int] = field(default_factory=frozenset)
+    sub_input_data: SingleDataset | None = None
+    result_data: SingleDataset | None = None
+    error: str | None = None
+    telemetry: RunTelemetry | None = None
+
+    @property
+    def same_subnet(self) -> bool:
+        return self.from_subnet_after == self.to_subnet_after
+
+    @property
+    def converged(self) -> bool:
+        return self.result_data is not None
+
+
+def branch_status_snapshot(
+    input_data: SingleDataset,
+) -> dict[ComponentType, dict[str, np.ndarray]]:
+    """Copy all status attributes that are changed when reconnecting branches."""
+    return {
+        component: {attr: input_data[component][attr].copy() for attr in attributes}
+        for component, attributes in STATUS_ATTRIBUTES.items()
+    }
+
+
+def apply_branch_status(
+    input_data: SingleDataset, snapshot: dict[ComponentType, dict[str, np.ndarray]]
+):
+    """Write a snapshot created by `branch_status_snapshot` back into the input data."""
+    for component, attributes in snapshot.items():
+        for attr, values in attributes.items():
+            input_data[component][attr] = values
+
+
+def evaluate_reconnect_candidate(
+    input_data: SingleDataset,
+    extra_info: ExtraInfo,
+    branch_id: int,
+    params: PgmCalculationParameters,
+    observability_check: bool = False,
+) -> ReconnectEvaluation:
+    """Reconnect a branch, run the state estimation on the resulting subnet
+    and restore the previous status of the branch and its sources.
+
+    The input data is modified during the evaluation, but left unchanged afterwards.
+    If `observability_check` is set, unobservable subnets are not estimated.
+    """
+
+    topo = Topology(input_data, extra_info)
+    topo_item = topo[branch_id]
+
+    if not connect_branch(topo_item, topo, connect=True):
+        return ReconnectEvaluation(branch_id=branch_id, connected=False)
+
+    try:
+        return _evaluate_connected_branch(
+            input_data, extra_info, topo, branch_id, params, observability_check
+        )
+    finally:
+        connect_branch(topo_item, topo, connect=False)
+
+
+def _evaluate_connected_branch(
+    input_data: SingleDataset,
+    extra_info: ExtraInfo,
+    topo_before: Topology,
+    branch_id: int,
+    params: PgmCalculationParameters,
+    observability_check: bool,
+) -> ReconnectEvaluation:
+    pgm_branch = get_pgm_branch(topo_before[branch_id])
+    from_node = pgm_branch["from_node"]
+    to_node = pgm_branch["to_node"]
+
+    topo_after = Topology(input_data, extra_info)
+    evaluation = ReconnectEvaluation(
+        branch_id=branch_id,
+        connected=True,
+        from_subnet_before=topo_before[from_node]["_subnet"],
+        to_subnet_before=topo_before[to_node]["_subnet"],
+        from_subnet_after=topo_after[from_node]["_subnet"],
+        to_subnet_after=topo_after[to_node]["_subnet"],
+        n_subnets=len(topo_after.get_topology_subnets().get_subnets()),
+    )
+    evaluation.subnet_nodes = frozenset(
+        int(node[ComponentType.node]["id"])
+        for node in topo_after.get_nodes()
+        if node["_subnet"] in (evaluation.from_subnet_after, evaluation.to_subnet_after)
+    )
+
+    if not evaluation.same_subnet:
+        return evaluation
+
+    evaluation.sub_input_data = extract_subnet_from_input_data(
+        input_data, extra_info, evaluation.from_subnet_after
+    )
+    if observability_check:
+        observability = check_observability(evaluation.sub_input_data)
+        if not observability.observable:
+            evaluation.error = "Not observable: " + "; ".join(observability.reasons)
+            evaluation.telemetry = create_not_observable_telemetry(
+                "", evaluation.sub_input_data, observability.reasons
+            )
+            return evaluation
+
+    start = time.perf_counter()
+    model = PowerGridModel(evaluation.sub_input_data)
+    build_time = time.perf_counter() - start
+
+    error = None
+    start = time.perf_counter()
+    try:
+        evaluation.result_data = calculate_state_estimation(model, params)
+    except (SparseMatrixError, IterationDiverge) as e:
+        evaluation.error = str(e).split("\n", maxsplit=1)[0]
+        error = e
+
+    evaluation.telemetry = create_telemetry(
+        "",
+        evaluation.sub_input_data,
+        build_time,
+        time.perf_counter() - start,
+        error,
+    )
+
+    return evaluation
+
+
+# State of a worker process, set once by `init_reconnect_worker`
+_worker_state: dict = {}
+
+
+def init_reconnect_worker(
+    handle: ModelStoreHandle,
+    params: PgmCalculationParameters,
+    observability_check: bool = False,
+):
+    """Initializer for worker processes, attaches to the model in shared memory.
+
+    Only the components with status attributes are copied, since they are changed
+    by `apply_branch_status` and `connect_branch`.
+    """
+    store = SharedModelStore.attach(handle)
+    input_data = dict(store.input_data)
+    for component in STATUS_ATTRIBUTES:
+        input_data[component] = input_data[component].copy()
+
+    _worker_state["store"] = store
+    _worker_state["input_data"] = input_data
+    _worker_state["extra_info"] = store.extra_info
+    _worker_state["params"] = params
+    _worker_state["observability_check"] = observability_check
+
+    # close the views when the worker exits, the creating process unlinks the memory
+    util.Finalize(store, _close_worker_store, exitpriority=10)
+
+
+def _close_worker_store():
+    store = _worker_state.pop("store", None)
+    _worker_state.clear()
+    if store is not None:
+        store.close()
+
+
+def evaluate_in_worker(
+    snapshot: dict[ComponentType, dict[str, np.ndarray]], branch_id: int
+) -> ReconnectEvaluation:
+    """Evaluate a reconnect candidate on the accepted topology given by `snapshot`."""
+    input_data = _worker_state["input_data"]
+    apply_branch_status(input_data, snapshot)
+
+    return evaluate_reconnect_candidate(
+        input_data,
+        _worker_state["extra_info"],
+        branch_id,
+        _worker_state["params"],
+        _worker_state["observability_check"],
+    )
@@ -0,0 +1,92 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+
+import numpy as np
+from power_grid_model import ComponentType
+from power_grid_model.data_types import SingleDataset
+
+from .results import StateEstimationResult
+
+INPUT_PREFIX = "input/"
+RESULT_PREFIX = "result/"
+
+
+def spill_result(result: StateEstimationResult, folder: str, index: int) -> str:
+    """Store the input and result data of a result as `.npz` file.
+
+    Args:
+        result (StateEstimationResult): Result to store
+        folder (str): Target folder, created if it does not exist
+        index (int): Index of the result in the session, used as file name prefix
+
+    Returns:
+        str: Path of the written file
+    """
+    os.makedirs(folder, exist_ok=True)
+    file_name = f"{index:04d}_{sanitize_file_name(result.run_name)}.npz"
+    path = os.path.join(folder, file_name)
+    save_datasets(path, result.input_data, result.result_data)
+    return path
+
+
+def sanitize_file_name(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+def save_datasets(
+    path: str,
+    input_data: SingleDataset,
+    result_data: SingleDataset | None,
+    **arrays: np.ndarray,
+):
+    """Store input and result data as `.npz` file.
+
+    Args:
+        path (str): Path of the file
+        input_data (SingleDataset): Input data
+        result_data (SingleDataset | None): Result data, None if not available
+        **arrays (np.ndarray): Additional arrays to store, names must not contain "/"
+    """
+    arrays |= {INPUT_PREFIX + ComponentType(k).value: v for k, v in input_data.items()}
+    if result_data:
+        arrays |= {
+            RESULT_PREFIX + ComponentType(k).value: v for k, v in result_data.items()
+        }
+    np.savez(path, **arrays)
+
+
+def load_spilled_datasets(path: str) -> tuple[SingleDataset, SingleDataset | None]:
+    """Load the input and result data stored by `spill_result` or `save_datasets`.
+
+    Args:
+        path (str): Path of the `.npz` file
+
+    Returns:
+        tuple[SingleDataset, SingleDataset | None]: Input data and result data,
+            result data is None if the run did not converge
+    """
+    input_data: SingleDataset = {}
+    result_data: SingleDataset = {}
+    with np.load(path) as arrays:
+        for key in arrays.files:
+            if "/" not in key:
+                continue
+            prefix, component = key.split("/", maxsplit=1)
+            dataset = input_data if prefix + "/" == INPUT_PREFIX else result_data
+            dataset[ComponentType(component)] = arrays[key]
+
+    return input_data, result_data or None
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Optional
 
 import numpy as np
@@ -22,7 +24,74 @@ from power_grid_model import ComponentType
 from power_grid_model.data_types import SingleDataset
 from power_grid_model_io.data_types import ExtraInfo
 
+from .bad_data import QUANTITY_COMPONENTS, EliminatedMeasurement, get_sensor_sigma
 from .options import PgmCalculationParameters
+from .telemetry import RunTelemetry
+
+VOLTAGE_TYPES = list(VoltageMeasType)
+POWER_TYPES = list(SymPowerType)
+
+# Power sensor types with an actual active / reactive power measurement
+P_MEASURED_CODES = [
+    POWER_TYPES.index(t) for t in SymPowerType.just_q_replaced() | {SymPowerType.FIELD}
+]
+Q_MEASURED_CODES = [
+    POWER_TYPES.index(t) for t in SymPowerType.just_p_replaced() | {SymPowerType.FIELD}
+]
+
+
+class MergedData(Mapping):
+    """
+    Read-only mapping of components to DataFrames with merged input and result data.
+
+    The DataFrame of a component is only created on first access. If the result ids
+    match the input ids (as returned by PGM), the columns are taken directly from the
+    structured arrays, otherwise input and result are joined on the id.
+    """
+
+    def __init__(self, input_data: SingleDataset, result_data: SingleDataset):
+        self._input_data = input_data
+        self._result_data = result_data
+        self._frames: dict = {}
+
+    def __getitem__(self, key) -> pd.DataFrame:
+        if key not in self._frames:
+            self._frames[key] = self._merge_component(key)
+        return self._frames[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._input_data)
+
+    def __len__(self) -> int:
+        return len(self._input_data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._input_data
+
+    def _merge_component(self, key) -> pd.DataFrame:
+        input_array = self._input_data[key]
+        result_array = self._result_data.get(key)
+
+        if result_array is None:
+            return pd.DataFrame(input_array)
+
+        if not np.array_equal(input_array["id"], result_array["id"]):
+            return pd.DataFrame(input_array).join(
+                pd.DataFrame(result_array).set_index("id"),
+                on="id",
+                how="left",
+                validate="1:1",
+                rsuffix="_result",
+            )
+
+        columns = {name: input_array[name] for name in input_array.dtype.names}
+        for name in result_array.dtype.names:
+            if name == "id":
+                continue
+            column = f"{name}_result" if name in columns else name
+            columns[column] = result_array[name]
+
+        return pd.DataFrame(columns, copy=False)
 
 
 @dataclass
@@ -33,41 +102,89 @@ class PgmDataset:
     Attributes:
         input_data (SingleDataset): Input data of the dataset
         result_data (SingleDataset | None): Result data of the dataset
-        data (SingleDataset): Merged input and result data
+        data (Mapping): Merged input and result data as DataFrames per component,
+            created lazily on first access. The input data, if there is no result data.
         extra_info (ExtraInfo): Extra information
     """
 
     input_data: SingleDataset
     result_data: Optional[SingleDataset] = None
     extra_info: ExtraInfo = field(default_factory=dict)
-    data: SingleDataset = field(init=False)
+    data: Mapping = field(init=False)
 
     def __post_init__(self):
         self.data = (
-            self._merge_data(self.input_data, self.result_data)
+            MergedData(self.input_data, self.result_data)
             if self.result_data
             else self.input_data
         )
 
-    def _merge_data(
-        self,
-        input_data: SingleDataset,
-        result_data: SingleDataset,
-    ) -> SingleDataset:
-        data = {}
-        for key, value in input_data.items():
-            data[key] = pd.DataFrame(value)
-
-        for key, value in result_data.items():
-            data[key] = data[key].join(
-                pd.DataFrame(value).set_index("id"),
-                on="id",
-                how="left",
-                validate="1:1",
-                rsuffix="_result",
-            )
 
-        return data
+@dataclass
+class StateEstimationSummary:
+    """
+    Compact record of a state estimation run without input and result data.
+
+    Attributes:
+        run_name (str): Name of the stes-run
+        converged (bool): True if the state estimation converged
+        n_nodes (int): Number of nodes
+        n_meas (int): Number of measurements including substituted measurements
+        n_meas_actual (int): Number of measurements excluding substituted measurements
+        n_statevars (int): Number of state variables
+        j (float): Value of the objective function
+        e_j (float): Expected value of the objective function
+        sigma_j (float): Standard deviation of the objective function
+        redundancy (float): Redundancy of the provided measurements
+        n_bad_u (int): Number of bad voltage measurements
+        n_bad_p (int): Number of bad active power measurements
+        n_bad_q (int): Number of bad reactive power measurements
+        n_eliminated (int): Number of measurements removed by the bad data elimination
+        duration (float | None): Duration of the calculation in seconds
+        spill_path (str | None): Path of the `.npz` file containing the full datasets,
+            see `load_spilled_datasets`
+    """
+
+    run_name: str
+    converged: bool
+    n_nodes: int
+    n_meas: int
+    n_meas_actual: int
+    n_statevars: int
+    j: float
+    e_j: float
+    sigma_j: float
+    redundancy: float
+    n_bad_u: int = 0
+    n_bad_p: int = 0
+    n_bad_q: int = 0
+    n_eliminated: int = 0
+    duration: float | None = None
+    spill_path: str | None = None
+
+    def __str__(self):
+        divider = "---------------------------------------------"
+
+        minus_three_sigma = self.e_j - 3 * self.sigma_j
+        plus_three_sigma = self.e_j + 3 * self.sigma_j
+        return (
+            f"{divider}\n"
+            f"State Estimation Results\n"
+            f"{divider}\n"
+            f"Run name            {self.run_name}\n"
+            f"Converged           {self.converged}\n"
+            f"{divider}\n"
+            f"J                    {self.j:.2f}\n"
+            f"E(J)                 {self.e_j:.2f}\n"
+            f"E(J) ± 3σ           [{minus_three_sigma:.2f}; {plus_three_sigma:.2f}]\n"
+            f"Redundancy           {self.redundancy:.2f}\n"
+            f"{divider}\n"
+            f"Bad measurements U   {self.n_bad_u}\n"
+            f"Bad measurements P   {self.n_bad_p}\n"
+            f"Bad measurements Q   {self.n_bad_q}\n"
+            f"Eliminated meas.     {self.n_eliminated}\n"
+            f"{divider}\n"
+        )
 
 
 # TODO: have PgmDataset as an attribute instead of using inheritance
@@ -91,6 +208,10 @@ class StateEstimationResult(PgmDataset):
             `sigma_j = sqrt(2 * E(J))`
         redundancy (float): Redundancy of the provided measurements
             `Redundancy = n_meas_actual / n_statevars`
+        eliminated_measurements (list[EliminatedMeasurement]): Measurements removed by
+            the bad data elimination in order of their elimination.
+            They are not considered in n_meas_actual, J and the bad measurements.
+        telemetry (RunTelemetry | None): Convergence and timing information of the run
     """
 
     def __init__(
@@ -100,6 +221,8 @@ class StateEstimationResult(PgmDataset):
         extra_info: ExtraInfo,
         result_data: SingleDataset | None,
         params: PgmCalculationParameters,
+        eliminated_measurements: list[EliminatedMeasurement] | None = None,
+        telemetry: RunTelemetry | None = None,
     ):
 
         super().__init__(
@@ -111,6 +234,8 @@ class StateEstimationResult(PgmDataset):
         self.run_name = run_name
         self.converged = self.result_data is not None
         self.params = params
+        self.eliminated_measurements = eliminated_measurements or []
+        self.telemetry = telemetry
 
         self.n_meas = (
             input_data[ComponentType.sym_power_sensor].shape[0] * 2
@@ -125,86 +250,138 @@ class StateEstimationResult(PgmDataset):
         self.redundancy = self.n_meas_actual / self.n_statevars
 
     def __str__(self):
-        divider = "---------------------------------------------"
-
-        minus_three_sigma = self.e_j - 3 * self.sigma_j
-        plus_three_sigma = self.e_j + 3 * self.sigma_j
-        return (
-            f"{divider}\n"
-            f"State Estimation Results\n"
-            f"{divider}\n"
-            f"Run name            {self.run_name}\n"
-            f"Converged           {self.converged}\n"
-            f"{divider}\n"
-            f"J                    {self.j:.2f}\n"
-            f"E(J)                 {self.e_j:.2f}\n"
-            f"E(J) ± 3σ           [{minus_three_sigma:.2f}; {plus_three_sigma:.2f}]\n"
-            f"Redundancy           {self.redundancy:.2f}\n"
-            f"{divider}\n"
-            f"Bad measurements U   {len(self.get_bad_measurements_u())}\n"
-            f"Bad measurements P   {len(self.get_bad_measurements_p())}\n"
-            f"Bad measurements Q   {len(self.get_bad_measurements_q())}\n"
-            f"{divider}\n"
+        return str(self.summarize())
+
+    @property
+    def duration(self) -> float | None:
+        """Duration of the calculation in seconds"""
+        return self.telemetry.solve_time if self.telemetry else None
+
+    def summarize(self, spill_path: str | None = None) -> StateEstimationSummary:
+        """Create a compact summary of this result without input and result data"""
+        return StateEstimationSummary(
+            run_name=self.run_name,
+            converged=self.converged,
+            n_nodes=self.input_data[ComponentType.node].shape[0],
+            n_meas=self.n_meas,
+            n_meas_actual=self.n_meas_actual,
+            n_statevars=self.n_statevars,
+            j=self.j,
+            e_j=self.e_j,
+            sigma_j=self.sigma_j,
+            redundancy=self.redundancy,
+            n_bad_u=len(self.get_bad_measurements_u()),
+            n_bad_p=len(self.get_bad_measurements_p()),
+            n_bad_q=len(self.get_bad_measurements_q()),
+            n_eliminated=len(self.eliminated_measurements),
+            duration=self.duration,
+            spill_path=spill_path,
         )
 
-    def _calc_n_meas_actual(self) -> int:
-        n = 0
-
-        # Voltage measurements
-        for sensor_id in self.input_data[ComponentType.sym_voltage_sensor]["id"]:
-            if self.extra_info[sensor_id]["_type"] == VoltageMeasType.FIELD:
-                n += 1
+    def is_j_within_bounds(self) -> bool:
+        """True if J does not exceed the upper chi-square bound `E(J) + 3σ`"""
+        return self.j <= self.e_j + 3 * self.sigma_j
+
+    @cached_property
+    def _voltage_type_codes(self) -> np.ndarray:
+        """Index of the `VoltageMeasType` of each voltage sensor, -1 if unknown"""
+        return self._get_type_codes(ComponentType.sym_voltage_sensor, VOLTAGE_TYPES)
+
+    @cached_property
+    def _power_type_codes(self) -> np.ndarray:
+        """Index of the `SymPowerType` of each power sensor, -1 if unknown"""
+        return self._get_type_codes(ComponentType.sym_power_sensor, POWER_TYPES)
+
+    def _get_type_codes(self, component: ComponentType, types: list) -> np.ndarray:
+        codes = {t: i for i, t in enumerate(types)}
+        ids = self.input_data[component]["id"]
+        return np.fromiter(
+            (codes.get(self.extra_info[sensor_id]["_type"], -1) for sensor_id in ids),
+            dtype=np.int8,
+            count=len(ids),
+        )
 
-        # Power measurements
-        for sensor_id in self.input_data[ComponentType.sym_power_sensor]["id"]:
-            t = self.extra_info[sensor_id]["_type"]
-            if t == SymPowerType.FIELD:
-                n += 2
-            elif t in SymPowerType.just_p_replaced() | SymPowerType.just_q_replaced():
-                n += 1
+    @property
+    def measurement_masks(self) -> dict[str, np.ndarray]:
+        """Boolean masks of the actual (not substituted, not eliminated) measurements
+        per quantity "u", "p" and "q" in the order of the sensors in `input_data`
+        """
+        return {"u": self._u_mask, "p": self._p_mask, "q": self._q_mask}
+
+    def _not_eliminated(self, component: ComponentType, quantity: str) -> np.ndarray:
+        eliminated = [
+            m.sensor_id for m in self.eliminated_measurements if m.quantity == quantity
+        ]
+        return ~np.isin(self.input_data[component]["id"], eliminated)
+
+    @cached_property
+    def _u_mask(self) -> np.ndarray:
+        """Voltage sensors with an actual (not substituted) measurement"""
+        field_code = VOLTAGE_TYPES.index(VoltageMeasType.FIELD)
+        return (self._voltage_type_codes == field_code) & self._not_eliminated(
+            ComponentType.sym_voltage_sensor, "u"
+        )
 
-        return n
+    @cached_property
+    def _p_mask(self) -> np.ndarray:
+        """Power sensors with an actual (not substituted) active power measurement"""
+        return np.isin(self._power_type_codes, P_MEASURED_CODES) & self._not_eliminated(
+            ComponentType.sym_power_sensor, "p"
+        )
 
-    def _calc_j(self) -> float:
+    @cached_property
+    def _q_mask(self) -> np.ndarray:
+        """Power sensors with an actual (not substituted) reactive power measurement"""
+        return np.isin(self._power_type_codes, Q_MEASURED_CODES) & self._not_eliminated(
+            ComponentType.sym_power_sensor, "q"
+        )
 
-        def calc_rel_deviation(residual, sigma):
-            return (residual / sigma) ** 2
+    @cached_property
+    def _normalized_residuals(self) -> dict[str, np.ndarray]:
+        """Residuals divided by sigma for all actual measurements, NaN for substituted ones"""
+        if not self.result_data:
+            return {}
+
+        u_sensors = self.input_data[ComponentType.sym_voltage_sensor]
+        u_results = self.result_data[ComponentType.sym_voltage_sensor]
+        pq_sensors = self.input_data[ComponentType.sym_power_sensor]
+        pq_results = self.result_data[ComponentType.sym_power_sensor]
+
+        return {
+            "u": np.where(
+                self._u_mask,
+                u_results["u_residual"] / get_sensor_sigma(u_sensors, "u"),
+                np.nan,
+            ),
+            "p": np.where(
+                self._p_mask,
+                pq_results["p_residual"] / get_sensor_sigma(pq_sensors, "p"),
+                np.nan,
+            ),
+            "q": np.where(
+                self._q_mask,
+                pq_results["q_residual"] / get_sensor_sigma(pq_sensors, "q"),
+                np.nan,
+            ),
+        }
 
-        j = 0.0
+    def _calc_n_meas_actual(self) -> int:
+        return int(
+            np.count_nonzero(self._u_mask)
+            + np.count_nonzero(self._p_mask)
+            + np.count_nonzero(self._q_mask)
+        )
 
+    def _calc_j(self) -> float:
         if not self.result_data:
-            return j
-
-        # Voltage measurements
-        for i, sensor_id in enumerate(
-            self.result_data[ComponentType.sym_voltage_sensor]["id"]
-        ):
-            if self.extra_info[sensor_id]["_type"] == VoltageMeasType.FIELD:
-                j += calc_rel_deviation(
-                    self.result_data[ComponentType.sym_voltage_sensor]["u_residual"][i],
-                    self.input_data[ComponentType.sym_voltage_sensor]["u_sigma"][i],
-                )
-
-        for i, sensor_id in enumerate(
-            self.result_data[ComponentType.sym_power_sensor]["id"]
-        ):
-            t = self.extra_info[sensor_id]["_type"]
-
-            # Active power measurements
-            if t in (SymPowerType.just_q_replaced() | {SymPowerType.FIELD}):
-                j += calc_rel_deviation(
-                    self.result_data[ComponentType.sym_power_sensor]["p_residual"][i],
-                    self.input_data[ComponentType.sym_power_sensor]["p_sigma"][i],
-                )
-
-            # Reactive power measurements
-            if t in (SymPowerType.just_p_replaced() | {SymPowerType.FIELD}):
-                j += calc_rel_deviation(
-                    self.result_data[ComponentType.sym_power_sensor]["q_residual"][i],
-                    self.input_data[ComponentType.sym_power_sensor]["q_sigma"][i],
-                )
-
-        return j
+            return 0.0
+
+        residuals = self._normalized_residuals
+        return float(
+            np.sum(residuals["u"][self._u_mask] ** 2)
+            + np.sum(residuals["p"][self._p_mask] ** 2)
+            + np.sum(residuals["q"][self._q_mask] ** 2)
+        )
 
     def _calc_e_j(self) -> float:
         return self.n_meas_actual - self.n_statevars
@@ -219,24 +396,7 @@ class StateEstimationResult(PgmDataset):
         Returns:
             list: List of sensor IDs
         """
-
-        if not self.result_data:
-            return []
-
-        bad_measurements = []
-        for i, sensor_id in enumerate(
-            self.result_data[ComponentType.sym_voltage_sensor]["id"]
-        ):
-            if self.extra_info[sensor_id]["_type"] != VoltageMeasType.FIELD:
-                continue
-
-            if self._is_bad_measurement(
-                self.result_data[ComponentType.sym_voltage_sensor]["u_residual"][i],
-                self.input_data[ComponentType.sym_voltage_sensor]["u_sigma"][i],
-            ):
-                bad_measurements.append(sensor_id)
-
-        return bad_measurements
+        return self._get_bad_measurements(ComponentType.sym_voltage_sensor, "u")
 
     def get_bad_measurements_p(self):
         """Creates a list of power measurements, that are considered as bad data:
@@ -248,27 +408,7 @@ class StateEstimationResult(PgmDataset):
         Returns:
             list: List of sensor IDs
         """
-
-        if not self.result_data:
-            return []
-
-        bad_measurements = []
-        for i, sensor_id in enumerate(
-            self.result_data[ComponentType.sym_power_sensor]["id"]
-        ):
-            t = self.extra_info[sensor_id]["_type"]
-
-            if t not in (SymPowerType.just_q_replaced() | {SymPowerType.FIELD}):
-                continue
-
-            if self._is_bad_measurement(
-                self.result_data[ComponentType.sym_power_sensor]["p_residual"][i],
-                self.input_data[ComponentType.sym_power_sensor]["p_sigma"][i],
-            ):
-
-                bad_measurements.append(sensor_id)
-
-        return bad_measurements
+        return self._get_bad_measurements(ComponentType.sym_power_sensor, "p")
 
     def get_bad_measurements_q(self):
         """Creates a list of power measurements, that are considered as bad data:
@@ -280,27 +420,44 @@ class StateEstimationResult(PgmDataset):
         Returns:
             list: List of sensor IDs
         """
+        return self._get_bad_measurements(ComponentType.sym_power_sensor, "q")
 
+    def _get_bad_measurements(self, component: ComponentType, quantity: str) -> list:
         if not self.result_data:
             return []
 
-        bad_measurements = []
-        for i, sensor_id in enumerate(
-            self.result_data[ComponentType.sym_power_sensor]["id"]
-        ):
-            t = self.extra_info[sensor_id]["_type"]
-            if t not in (SymPowerType.just_p_replaced() | {SymPowerType.FIELD}):
-                continue
+        ids = self.result_data[component]["id"]
+        return ids[self._bad_data_masks[quantity]].tolist()
 
-            if self._is_bad_measurement(
-                self.result_data[ComponentType.sym_power_sensor]["q_residual"][i],
-                self.input_data[ComponentType.sym_power_sensor]["q_sigma"][i],
-            ):
-                bad_measurements.append(sensor_id)
+    def get_largest_normalized_residual(self) -> EliminatedMeasurement | None:
+        """Find the measurement with the largest `|residual / sigma|`,
+        which is the next candidate for the bad data elimination.
 
-        return bad_measurements
+        Returns:
+            EliminatedMeasurement | None: The measurement, None if there is none
+        """
+        candidates = []
+        for quantity, residuals in self._normalized_residuals.items():
+            if np.all(np.isnan(residuals)):
+                continue
+            idx = int(np.nanargmax(np.abs(residuals)))
+            candidates.append((abs(residuals[idx]), quantity, idx))
+
+        if not candidates:
+            return None
+
+        _, quantity, idx = max(candidates)
+        component = QUANTITY_COMPONENTS[quantity]
+        return EliminatedMeasurement(
+            sensor_id=int(self.input_data[component]["id"][idx]),
+            quantity=quantity,
+            normalized_residual=float(self._normalized_residuals[quantity][idx]),
+            j=self.j,
+        )
 
-    def _is_bad_measurement(
-        self, residual: np.ndarray, sigma: np.ndarray
-    ) -> np.ndarray:
-        return np.abs(residual) > self.params.bad_data_tolerance * sigma
+    @cached_property
+    def _bad_data_masks(self) -> dict[str, np.ndarray]:
+        return {
+            quantity: np.abs(residuals) > self.params.bad_data_tolerance
+            for quantity, residuals in self._normalized_residuals.items()
+        }
@@ -0,0 +1,227 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+from power_grid_model import ComponentType
+from power_grid_model.data_types import SingleDataset
+
+from .bad_data import EliminatedMeasurement
+from .result_spill import load_spilled_datasets, sanitize_file_name, save_datasets
+from .results import StateEstimationResult
+from .validation import structural_fingerprint
+
+ELIMINATED_DTYPE = np.dtype(
+    [
+        ("sensor_id", np.int64),
+        ("quantity", "U1"),
+        ("normalized_residual", np.float64),
+        ("j", np.float64),
+    ]
+)
+
+
+@dataclass
+class CachedSubnetResult:
+    """
+    Converged state estimation result of a subnet from a previous run.
+
+    Attributes:
+        fingerprint (str): Structural fingerprint of `input_data`
+        input_data (SingleDataset): Input data of the cached run
+        result_data (SingleDataset): Result data of the cached run
+        eliminated_measurements (list[EliminatedMeasurement]): Measurements removed
+            by the bad data elimination
+    """
+
+    fingerprint: str
+    input_data: SingleDataset
+    result_data: SingleDataset
+    eliminated_measurements: list[EliminatedMeasurement] = field(default_factory=list)
+
+
+class SubnetCache:
+    """
+    Cache of converged subnet results to skip the state estimation of subnets,
+    whose input data did not change since the previous run.
+
+    A subnet is unchanged, if its structural fingerprint (ids, topology, statuses and
+    parameters) is equal and no measured value changed by more than `tolerance`
+    times its sigma. Changed sigmas always trigger a new calculation.
+
+    The cache can be passed to multiple `StateEstimationWrapper` instances, e.g.
+    in consecutive cycles of a long running process. If `folder` is given, the
+    entries are also stored as `.npz` files and loaded in later processes.
+
+    Args:
+        folder (str | None): Folder to persist the entries, None to keep them in memory
+    """
+
+    def __init__(self, folder: str | None = None):
+        self.folder = folder
+        self._entries: dict[str, CachedSubnetResult] = {}
+
+    def get(
+        self, subnet: str, input_data: SingleDataset, tolerance: float
+    ) -> CachedSubnetResult | None:
+        """Get the cached result of a subnet, if its input data is unchanged.
+
+        Args:
+            subnet (str): Name of the subnet
+            input_data (SingleDataset): Current input data of the subnet
+            tolerance (float): Maximum change of a measured value in multiples
+                of its sigma
+
+        Returns:
+            CachedSubnetResult | None: Cached result, None if the subnet changed
+        """
+        entry = self._entries.get(subnet) or self._load(subnet)
+        if entry is None:
+            return None
+
+        if entry.fingerprint != structural_fingerprint(input_data):
+            logging.debug("Structure of subnet %s changed", subnet)
+            return None
+
+        change = max_sensor_change(entry.input_data, input_data)
+        if change > tolerance:
+            logging.debug("Measurements of subnet %s changed by %.2f σ", subnet, change)
+            return None
+
+        return entry
+
+    def put(self, subnet: str, result: StateEstimationResult):
+        """Store a converged result of a subnet."""
+        if not result.converged:
+            return
+
+        entry = CachedSubnetResult(
+            fingerprint=structural_fingerprint(result.input_data),
+            input_data=result.input_data,
+            result_data=result.result_data,
+            eliminated_measurements=list(result.eliminated_measurements),
+        )
+        self._entries[subnet] = entry
+
+        if self.folder:
+            os.makedirs(self.folder, exist_ok=True)
+            eliminated = np.array(
+                [
+                    (m.sensor_id, m.quantity, m.normalized_residual, m.j)
+                    for m in entry.eliminated_measurements
+                ],
+                dtype=ELIMINATED_DTYPE,
+            )
+            save_datasets(
+                self._get_path(subnet),
+                entry.input_data,
+                entry.result_data,
+                fingerprint=np.array(entry.fingerprint),
+                eliminated=eliminated,
+            )
+
+    def _load(self, subnet: str) -> CachedSubnetResult | None:
+        if not self.folder or not os.path.exists(self._get_path(subnet)):
+            return None
+
+        path = self._get_path(subnet)
+        input_data, result_data = load_spilled_datasets(path)
+        with np.load(path) as arrays:
+            fingerprint = str(arrays["fingerprint"])
+            eliminated = arrays["eliminated"]
+
+        entry = CachedSubnetResult(
+            fingerprint=fingerprint,
+            input_data=input_data,
+            result_data=result_data,
+            eliminated_measurements=[
+                EliminatedMeasurement(
+                    int(m["sensor_id"]),
+                    str(m["quantity"]),
+                    float(m["normalized_residual"]),
+                    float(m["j"]),
+                )
+                for m in eliminated
+            ],
+        )
+        self._entries[subnet] = entry
+        return entry
+
+    def _get_path(self, subnet: str) -> str:
+        return os.path.join(self.folder, f"{sanitize_file_name(subnet)}.npz")
+
+
+def max_sensor_change(previous: SingleDataset, current: SingleDataset) -> float:
+    """Largest change of a measured value between two structurally equal datasets
+    in multiples of its sigma.
+
+    Returns:
+        float: Largest change, `inf` if a sigma changed or a measurement appeared
+            or disappeared
+    """
+    change = 0.0
+
+    u_previous = previous.get(ComponentType.sym_voltage_sensor)
+    u_current = current.get(ComponentType.sym_voltage_sensor)
+    if u_current is not None and u_current.size:
+        if not np.array_equal(u_previous["u_sigma"], u_current["u_sigma"]):
+            return np.inf
+        sigma = u_current["u_sigma"]
+        change = max(
+            change,
+            _max_normalized_change(
+                u_previous["u_measured"], u_current["u_measured"], sigma
+            ),
+            # sigma of the angle in rad is u_sigma / u_measured
+            _max_normalized_change(
+                u_previous["u_angle_measured"],
+                u_current["u_angle_measured"],
+                sigma / u_current["u_measured"],
+            ),
+        )
+
+    pq_previous = previous.get(ComponentType.sym_power_sensor)
+    pq_current = current.get(ComponentType.sym_power_sensor)
+    if pq_current is not None and pq_current.size:
+        for attr in ("power_sigma", "p_sigma", "q_sigma"):
+            if not np.array_equal(pq_previous[attr], pq_current[attr], equal_nan=True):
+                return np.inf
+        for quantity in ("p", "q"):
+            sigma = np.where(
+                np.isnan(pq_current[f"{quantity}_sigma"]),
+                pq_current["power_sigma"],
+                pq_current[f"{quantity}_sigma"],
+            )
+            change = max(
+                change,
+                _max_normalized_change(
+                    pq_previous[f"{quantity}_measured"],
+                    pq_current[f"{quantity}_measured"],
+                    sigma,
+                ),
+            )
+
+    return change
+
+
+def _max_normalized_change(
+    previous: np.ndarray, current: np.ndarray, sigma: np.ndarray
+) -> float:
+    both_nan = np.isnan(previous) & np.isnan(current)
+    change = np.abs(current - previous) / sigma
+    change = np.where(both_nan, 0.0, np.nan_to_num(change, nan=np.inf))
+    return float(np.max(change)) if change.size else 0.0
@@ -0,0 +1,137 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+from power_grid_model import ComponentType
+from power_grid_model.data_types import SingleDataset
+
+ITERATIONS_PATTERN = re.compile(r"after (\d+) iterations")
+
+
+@dataclass
+class RunTelemetry:
+    """
+    Convergence and timing information of a single state estimation run.
+
+    Attributes:
+        run_name (str): Name of the stes-run
+        converged (bool): True if the state estimation converged
+        n_nodes (int): Number of nodes
+        n_voltage_sensors (int): Number of voltage sensors
+        n_power_sensors (int): Number of power sensors
+        build_time (float | None): Duration of the model construction in seconds,
+            None if the model has been reused
+        solve_time (float | None): Duration of the calculation in seconds,
+            None if the calculation has not been run
+        n_iterations (int | None): Number of iterations reached.
+            PGM only reports it for diverged calculations.
+        error_class (str | None): Class of the error, if the calculation failed
+        error_message (str | None): First line of the error message
+        reused (bool): True if the result of a previous run has been reused
+    """
+
+    run_name: str
+    converged: bool
+    n_nodes: int = 0
+    n_voltage_sensors: int = 0
+    n_power_sensors: int = 0
+    build_time: float | None = None
+    solve_time: float | None = None
+    n_iterations: int | None = None
+    error_class: str | None = None
+    error_message: str | None = None
+    reused: bool = False
+
+
+def create_telemetry(
+    run_name: str,
+    input_data: SingleDataset,
+    build_time: float | None = None,
+    solve_time: float | None = None,
+    error: Exception | None = None,
+) -> RunTelemetry:
+    """Create the telemetry of a run from its input data and an optional error."""
+
+    telemetry = RunTelemetry(
+        run_name=run_name,
+        converged=error is None and solve_time is not None,
+        n_nodes=input_data[ComponentType.node].shape[0],
+        n_voltage_sensors=input_data[ComponentType.sym_voltage_sensor].shape[0],
+        n_power_sensors=input_data[ComponentType.sym_power_sensor].shape[0],
+        build_time=build_time,
+        solve_time=solve_time,
+    )
+
+    if error is not None:
+        message = str(error).split("\n", maxsplit=1)[0]
+        match = ITERATIONS_PATTERN.search(message)
+        telemetry.n_iterations = int(match.group(1)) if match else None
+        telemetry.error_class = type(error).__name__
+        telemetry.error_message = message
+
+    return telemetry
+
+
+def create_not_observable_telemetry(
+    run_name: str, input_data: SingleDataset, reasons: list[str]
+) -> RunTelemetry:
+    """Create the telemetry of a run skipped by the observability check."""
+    telemetry = create_telemetry(run_name, input_data)
+    telemetry.error_class = "NotObservable"
+    telemetry.error_message = "; ".join(reasons)
+    return telemetry
+
+
+@dataclass
+class TelemetryTable:
+    """
+    Telemetry of all runs of a state estimation session.
+
+    Attributes:
+        runs (list[RunTelemetry]): Telemetry of the runs in order of their execution
+    """
+
+    runs: list[RunTelemetry] = field(default_factory=list)
+
+    def add(self, telemetry: RunTelemetry):
+        self.runs.append(telemetry)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [asdict(run) for run in self.runs],
+            columns=list(RunTelemetry.__dataclass_fields__),
+        )
+
+    def to_csv(self, path: str):
+        self.to_dataframe().to_csv(path, index=False)
+
+    def to_json(self, path: str):
+        self.to_dataframe().to_json(path, orient="records", indent=2)
+
+    def __str__(self):
+        df = self.to_dataframe()
+        divider = "---------------------------------------------"
+        return (
+            f"{divider}\n"
+            f"State Estimation Telemetry\n"
+            f"{divider}\n"
+            f"Runs                 {len(df)}\n"
+            f"Converged            {int(df['converged'].sum())}\n"
+            f"Build time           {df['build_time'].sum():.3f} s\n"
+            f"Solve time           {df['solve_time'].sum():.3f} s\n"
+            f"{divider}\n"
+        )
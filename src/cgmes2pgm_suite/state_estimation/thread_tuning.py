@@ -0,0 +1,151 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import time
+from collections.abc import Callable
+
+import numpy as np
+from power_grid_model import CalculationType
+from power_grid_model.data_types import BatchDataset, SingleDataset
+
+from .options import AUTO_THREADS, PgmCalculationParameters
+from .validation import structural_fingerprint
+
+# Number of scenarios per available thread used for the calibration
+CALIBRATION_SCENARIOS_PER_THREAD = 4
+
+# Minimum ratio of batch size to calibration scenarios for a calibration,
+# smaller batches use a heuristic
+MIN_CALIBRATION_RATIO = 20
+
+# Chosen thread count by structural fingerprint of the model and calculation type
+_thread_cache: dict[tuple[str, CalculationType], int] = {}
+
+
+def resolve_threads(
+    params: PgmCalculationParameters,
+    calculation_type: CalculationType,
+    input_data: SingleDataset | None,
+    update_data: BatchDataset | None,
+    calculate: Callable[[int, BatchDataset], object],
+) -> int:
+    """Get the PGM `threading` argument for a calculation.
+
+    Explicit thread counts are returned unchanged. In auto mode, single
+    calculations run without threading. Large batch calculations are calibrated:
+    the first scenarios of the batch are calculated once per candidate thread count
+    after a warm-up run, and the fastest one is cached by the structural fingerprint
+    of `input_data` and the calculation type. Smaller batches use one thread per
+    `CALIBRATION_SCENARIOS_PER_THREAD` scenarios, as a calibration would take
+    longer than it can save.
+
+    Args:
+        params (PgmCalculationParameters): Parameters for the calculation
+        calculation_type (CalculationType): Type of the calculation,
+            power flow and state estimation are calibrated separately
+        input_data (SingleDataset | None): Input data of the model,
+            required to cache the calibration
+        update_data (BatchDataset | None): Update data of a batch calculation
+        calculate (Callable[[int, BatchDataset], object]): Runs the calculation
+            with the given thread count and update data
+
+    Returns:
+        int: Thread count, -1 for no threading
+    """
+    if params.threads != AUTO_THREADS:
+        return int(params.threads)
+
+    batch_size = _get_batch_size(update_data)
+    if batch_size < 2:
+        return -1
+
+    key = (structural_fingerprint(input_data), calculation_type) if input_data else None
+    if key in _thread_cache:
+        return _thread_cache[key]
+
+    cpu_count = os.cpu_count() or 1
+    n_scenarios = CALIBRATION_SCENARIOS_PER_THREAD * cpu_count
+    if cpu_count == 1 or batch_size < MIN_CALIBRATION_RATIO * n_scenarios:
+        return _estimate_threads(batch_size, cpu_count)
+
+    threads = _calibrate(update_data, n_scenarios, cpu_count, calculate)
+    if key is not None:
+        _thread_cache[key] = threads
+
+    return threads
+
+
+def _estimate_threads(batch_size: int, cpu_count: int) -> int:
+    """At least `CALIBRATION_SCENARIOS_PER_THREAD` scenarios per thread"""
+    threads = min(cpu_count, batch_size // CALIBRATION_SCENARIOS_PER_THREAD)
+    return threads if threads > 1 else -1
+
+
+def _calibrate(
+    update_data: BatchDataset,
+    n_scenarios: int,
+    cpu_count: int,
+    calculate: Callable[[int, BatchDataset], object],
+) -> int:
+    calibration_data = {
+        k: _slice_scenarios(v, n_scenarios) for k, v in update_data.items()
+    }
+
+    # Warm-up, so the first candidate does not pay for the cold start
+    calculate(-1, {k: _slice_scenarios(v, 1) for k, v in update_data.items()})
+
+    durations = {}
+    for threads in _get_candidates(cpu_count):
+        start = time.perf_counter()
+        calculate(threads, calibration_data)
+        durations[threads] = time.perf_counter() - start
+
+    threads = min(durations, key=durations.__getitem__)
+    logging.info(
+        "Thread calibration with %d scenarios: %s, using threads=%d",
+        n_scenarios,
+        ", ".join(f"{t}: {d * 1000:.1f} ms" for t, d in durations.items()),
+        threads,
+    )
+    return threads
+
+
+def _get_candidates(cpu_count: int) -> list[int]:
+    """No threading and powers of two up to the number of cpus"""
+    candidates = [-1]
+    threads = 2
+    while threads < cpu_count:
+        candidates.append(threads)
+        threads *= 2
+    candidates.append(cpu_count)
+    return candidates
+
+
+def _get_batch_size(update_data: BatchDataset | None) -> int:
+    if not update_data:
+        return 0
+    data = next(iter(update_data.values()))
+    if isinstance(data, dict):
+        return len(data["indptr"]) - 1
+    return data.shape[0] if data.ndim == 2 else 1
+
+
+def _slice_scenarios(data: np.ndarray | dict, n_scenarios: int) -> np.ndarray | dict:
+    """First `n_scenarios` of a dense or sparse batch"""
+    if isinstance(data, dict):
+        indptr = data["indptr"][: n_scenarios + 1]
+        return {"indptr": indptr, "data": data["data"][: indptr[-1]]}
+    return data[:n_scenarios]
@@ -0,0 +1,183 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import logging
+from collections import OrderedDict
+
+import numpy as np
+from cgmes2pgm_converter.common import Timer
+from power_grid_model import CalculationType, ComponentType
+from power_grid_model.data_types import SingleDataset
+from power_grid_model.validation import ValidationError, validate_input_data
+from power_grid_model.validation.errors import (
+    NotGreaterThanError,
+    PQSigmaPairError,
+    SingleFieldValidationError,
+)
+
+from .options import ValidationMode
+
+# Sensor attributes, that are excluded from the structural fingerprint
+# and checked separately in the cached validation mode
+SENSOR_VALUE_ATTRIBUTES = {
+    ComponentType.sym_voltage_sensor: ["u_sigma", "u_measured", "u_angle_measured"],
+    ComponentType.sym_power_sensor: [
+        "power_sigma",
+        "p_measured",
+        "q_measured",
+        "p_sigma",
+        "q_sigma",
+    ],
+}
+
+MAX_CACHED_VALIDATIONS = 16
+
+# Validation errors of already validated structures by fingerprint
+_validation_cache: OrderedDict[str, list] = OrderedDict()
+
+
+def structural_fingerprint(input_data: SingleDataset) -> str:
+    """Hash of all attributes of the input data except the sensor values.
+
+    Covers component ids, topology fields, statuses and parameters, so that two
+    datasets with the same fingerprint only differ in their measured values and sigmas.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for component in sorted(input_data, key=str):
+        data = input_data[component]
+        excluded = SENSOR_VALUE_ATTRIBUTES.get(component, [])
+        digest.update(f"{component}:{data.shape}".encode())
+        for name in data.dtype.names:
+            if name not in excluded:
+                digest.update(name.encode())
+                digest.update(np.ascontiguousarray(data[name]).tobytes())
+    return digest.hexdigest()
+
+
+class NotFiniteError(SingleFieldValidationError):
+    """
+    The value of a field is NaN or infinite.
+    """
+
+    _message = "Field {field} is not a finite number for {n} {objects}."
+
+
+def validate_sensor_values(input_data: SingleDataset) -> list[ValidationError]:
+    """Check the measured values and sigmas of the sensors.
+
+    Returns:
+        list[ValidationError]: Errors of the invalid sensors, empty if all sensors
+            are valid
+    """
+    errors: list[ValidationError] = []
+
+    voltage_sensors = input_data.get(ComponentType.sym_voltage_sensor)
+    if voltage_sensors is not None:
+        for attr in ("u_measured", "u_sigma"):
+            ids = _get_ids(voltage_sensors, ~(voltage_sensors[attr] > 0))
+            if ids:
+                errors.append(
+                    NotGreaterThanError(ComponentType.sym_voltage_sensor, attr, ids, 0)
+                )
+
+    power_sensors = input_data.get(ComponentType.sym_power_sensor)
+    if power_sensors is not None:
+        for attr in ("p_measured", "q_measured"):
+            ids = _get_ids(power_sensors, ~np.isfinite(power_sensors[attr]))
+            if ids:
+                errors.append(NotFiniteError(ComponentType.sym_power_sensor, attr, ids))
+        for attr in ("p_sigma", "q_sigma"):
+            # p_sigma and q_sigma are optional if power_sigma is given
+            ids = _get_ids(
+                power_sensors,
+                (power_sensors[attr] <= 0)
+                | (np.isnan(power_sensors[attr]) & ~(power_sensors["power_sigma"] > 0)),
+            )
+            if ids:
+                errors.append(
+                    NotGreaterThanError(ComponentType.sym_power_sensor, attr, ids, 0)
+                )
+        ids = _get_ids(
+            power_sensors,
+            np.isnan(power_sensors["p_sigma"]) != np.isnan(power_sensors["q_sigma"]),
+        )
+        if ids:
+            errors.append(
+                PQSigmaPairError(
+                    ComponentType.sym_power_sensor, ["p_sigma", "q_sigma"], ids
+                )
+            )
+
+    return errors
+
+
+def _get_ids(sensors: np.ndarray, invalid: np.ndarray) -> list[int]:
+    return sensors["id"][invalid].tolist()
+
+
+def _is_sensor_value_error(error: ValidationError) -> bool:
+    if isinstance(error.component, list):
+        return False
+    fields = error.field if isinstance(error.field, list) else [error.field]
+    attributes = SENSOR_VALUE_ATTRIBUTES.get(error.component, [])
+    return all(field in attributes for field in fields)
+
+
+def validate_state_estimation_input(
+    input_data: SingleDataset, mode: ValidationMode = ValidationMode.FULL
+) -> list[ValidationError]:
+    """Validate the input data of a state estimation.
+
+    Args:
+        input_data (SingleDataset): Input data to validate
+        mode (ValidationMode): FULL validates with PGM every time, CACHED reuses the
+            result of a previous full validation with the same structural fingerprint
+            and checks the sensor values with `validate_sensor_values` on every call,
+            SKIP does not validate.
+
+    Returns:
+        list[ValidationError]: Validation errors, empty if the input data is valid
+    """
+    if mode == ValidationMode.SKIP:
+        return []
+
+    if mode == ValidationMode.CACHED:
+        fingerprint = structural_fingerprint(input_data)
+        if fingerprint in _validation_cache:
+            _validation_cache.move_to_end(fingerprint)
+            logging.debug("Using cached input validation %s", fingerprint)
+            return _validation_cache[fingerprint] + validate_sensor_values(input_data)
+
+    with Timer("Input Validation", loglevel=logging.DEBUG):
+        errors = (
+            validate_input_data(
+                input_data=input_data,
+                calculation_type=CalculationType.state_estimation,
+                symmetric=True,
+            )
+            or []
+        )
+
+    if mode == ValidationMode.CACHED:
+        # sensor values are checked separately on every call,
+        # so the errors do not depend on the state of the cache
+        _validation_cache[fingerprint] = [
+            e for e in errors if not _is_sensor_value_error(e)
+        ]
+        if len(_validation_cache) > MAX_CACHED_VALIDATIONS:
+            _validation_cache.popitem(last=False)
+        return _validation_cache[fingerprint] + validate_sensor_values(input_data)
+
+    return errors
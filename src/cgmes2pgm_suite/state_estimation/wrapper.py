@@ -13,24 +13,44 @@
 # limitations under the License.
 
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from typing import Optional
 
 import numpy as np
 from cgmes2pgm_converter.common import Timer, Topology
-from power_grid_model import (
-    CalculationMethod,
-    CalculationType,
-    ComponentType,
-    PowerGridModel,
-)
+from power_grid_model import ComponentType, PowerGridModel
 from power_grid_model.data_types import SingleDataset
 from power_grid_model.errors import IterationDiverge, SparseMatrixError
-from power_grid_model.validation import validate_input_data
 from power_grid_model_io.data_types import ExtraInfo
 
-from .extract_subnet import connect_branch, extract_subnet_from_input_data
-from .options import StesOptions
-from .results import StateEstimationResult
+from ..common import SharedModelStore
+from .bad_data import EliminatedMeasurement, create_elimination_update
+from .calculation import calculate_state_estimation
+from .extract_subnet import (
+    connect_branch,
+    extract_subnet_from_input_data,
+    get_pgm_branch,
+)
+from .observability import check_observability
+from .options import ResultRetention, StesOptions
+from .parallel_reconnect import (
+    ReconnectEvaluation,
+    branch_status_snapshot,
+    evaluate_in_worker,
+    evaluate_reconnect_candidate,
+    init_reconnect_worker,
+)
+from .result_spill import spill_result
+from .results import StateEstimationResult, StateEstimationSummary
+from .subnet_cache import SubnetCache
+from .telemetry import (
+    TelemetryTable,
+    create_not_observable_telemetry,
+    create_telemetry,
+)
+from .validation import validate_state_estimation_input
 
 
 class StateEstimationWrapper:
@@ -40,27 +60,39 @@ class StateEstimationWrapper:
         extra_info: ExtraInfo,
         stes_options: StesOptions | None = None,
         network_name: str = "network",
+        subnet_cache: SubnetCache | None = None,
     ):
         self.input_data = input_data
         self.extra_info = extra_info
         self.stes_options = stes_options or StesOptions()
         self.network_name = network_name
         self._model: PowerGridModel | None = None
-        self._results: list[StateEstimationResult] = []
+        self._results: list[StateEstimationResult | StateEstimationSummary] = []
+        self._model_build_time: float | None = None
+        self.telemetry = TelemetryTable()
+        self.subnet_cache = subnet_cache
+        if self.subnet_cache is None and self.stes_options.incremental_subnets:
+            self.subnet_cache = SubnetCache(self.stes_options.incremental_cache_folder)
 
         self._topology = Topology(self.input_data, self.extra_info)
 
-    def run(self) -> list[StateEstimationResult] | StateEstimationResult:
+    def run(
+        self,
+    ) -> (
+        list[StateEstimationResult | StateEstimationSummary]
+        | StateEstimationResult
+        | StateEstimationSummary
+    ):
         """Run state estimation on the input data.
 
         Returns:
-            list[StateEstimationResult]: List of state estimation results.
-                Multiple results if subnets are computed separately.
+            list[StateEstimationResult | StateEstimationSummary]: List of state
+                estimation results. Multiple results if subnets are computed separately.
+                Runs not kept according to `StesOptions.result_retention`
+                are returned as summaries.
         """
-        input_errors = validate_input_data(
-            input_data=self.input_data,
-            calculation_type=CalculationType.state_estimation,
-            symmetric=True,
+        input_errors = validate_state_estimation_input(
+            self.input_data, self.stes_options.validation_mode
         )
         if input_errors:
             raise ValueError("Validation Errors: " + str(input_errors))
@@ -78,9 +110,13 @@ class StateEstimationWrapper:
         return self._results
 
     def _single_run(self):
-        self._model = PowerGridModel(self.input_data)
+        if not self._check_observability(self.network_name, self.input_data):
+            return
+
+        self._build_model(self.input_data)
         try:
             self._run_pgm(self.network_name)
+            self._eliminate_bad_data()
         except (SparseMatrixError, IterationDiverge) as e:
             logging.error(
                 "\tState Estimation failed: %s", str(e).split("\n", maxsplit=1)[0]
@@ -114,11 +150,20 @@ class StateEstimationWrapper:
             sub_input_data = extract_subnet_from_input_data(
                 self.input_data, self.extra_info, subnet
             )
-            self._model = PowerGridModel(sub_input_data)
+            if self._reuse_subnet_result(f"{subnet}", sub_input_data):
+                continue
+
+            if not self._check_observability(f"{subnet}", sub_input_data):
+                continue
+
+            self._build_model(sub_input_data)
 
             try:
                 self._run_pgm(f"{subnet}", sub_input_data)
                 logging.info("\tState Estimation for subnet %s successful", subnet)
+                self._eliminate_bad_data()
+                if self.subnet_cache is not None:
+                    self.subnet_cache.put(f"{subnet}", self._results[-1])
             except (SparseMatrixError, IterationDiverge) as e:
                 logging.error(
                     "\tState Estimation for subnet %s failed: %s",
@@ -126,6 +171,89 @@ class StateEstimationWrapper:
                     str(e).split("\n", maxsplit=1)[0],
                 )
 
+    def _reuse_subnet_result(self, subnet: str, input_data: SingleDataset) -> bool:
+        """Add the cached result of a subnet, if its input data did not change
+        since the previous run, see `SubnetCache`.
+
+        Returns:
+            bool: True if the cached result has been reused
+        """
+        if self.subnet_cache is None:
+            return False
+
+        cached = self.subnet_cache.get(
+            subnet, input_data, self.stes_options.incremental_tolerance
+        )
+        if cached is None:
+            return False
+
+        logging.info("\tReusing unchanged State Estimation for subnet %s", subnet)
+        telemetry = create_telemetry(subnet, cached.input_data)
+        telemetry.converged = True
+        telemetry.reused = True
+        self.telemetry.add(telemetry)
+
+        self._add_result(
+            StateEstimationResult(
+                subnet,
+                cached.input_data,
+                self.extra_info,
+                cached.result_data,
+                self.stes_options.pgm_parameters,
+                eliminated_measurements=cached.eliminated_measurements,
+                telemetry=telemetry,
+            )
+        )
+        return True
+
+    def _check_observability(self, run_name: str, input_data: SingleDataset) -> bool:
+        """Check the observability of the input data before building the model,
+        if enabled in `StesOptions.check_observability`.
+
+        A failed result is stored for unobservable input data.
+
+        Returns:
+            bool: False if the input data is not observable
+        """
+        if not self.stes_options.check_observability:
+            return True
+
+        with Timer("Observability Check", loglevel=logging.DEBUG):
+            observability = check_observability(input_data)
+
+        if observability.observable:
+            return True
+
+        for island in observability.unobservable_islands:
+            logging.error(
+                "\tSkipping State Estimation %s, island with %d nodes is not observable: %s",
+                run_name,
+                len(island.node_ids),
+                island.reason,
+            )
+
+        telemetry = create_not_observable_telemetry(
+            run_name, input_data, observability.reasons
+        )
+        self.telemetry.add(telemetry)
+
+        self._add_result(
+            StateEstimationResult(
+                run_name,
+                input_data,
+                self.extra_info,
+                None,
+                self.stes_options.pgm_parameters,
+                telemetry=telemetry,
+            )
+        )
+        return False
+
+    def _build_model(self, input_data: SingleDataset):
+        start = time.perf_counter()
+        self._model = PowerGridModel(input_data)
+        self._model_build_time = time.perf_counter() - start
+
     def _run_pgm(
         self,
         run_name: str,
@@ -137,32 +265,170 @@ class StateEstimationWrapper:
 
         params = self.stes_options.pgm_parameters
         input_data = opt_input_data if opt_input_data is not None else self.input_data
+        build_time, self._model_build_time = self._model_build_time, None
+        start = time.perf_counter()
         try:
             with Timer("State Estimation", loglevel=logging.INFO):
-                result = self._model.calculate_state_estimation(
-                    calculation_method=CalculationMethod.newton_raphson,
-                    max_iterations=params.max_iterations,
-                    error_tolerance=params.error_tolerance,
-                    threading=params.threads,
-                    symmetric=True,
-                )
-            self._results.append(
+                result = calculate_state_estimation(self._model, params)
+            telemetry = create_telemetry(
+                run_name, input_data, build_time, time.perf_counter() - start
+            )
+            self.telemetry.add(telemetry)
+            self._add_result(
                 StateEstimationResult(
-                    run_name, input_data, self.extra_info, result, params
+                    run_name,
+                    input_data,
+                    self.extra_info,
+                    result,
+                    params,
+                    telemetry=telemetry,
                 )
             )
         except (SparseMatrixError, IterationDiverge) as e:
-            self._results.append(
+            telemetry = create_telemetry(
+                run_name, input_data, build_time, time.perf_counter() - start, e
+            )
+            self.telemetry.add(telemetry)
+            self._add_result(
                 StateEstimationResult(
                     run_name,
                     input_data,
                     self.extra_info,
                     None,
                     params,
+                    telemetry=telemetry,
                 )
             )
             raise e
 
+    def _add_result(self, result: StateEstimationResult):
+        """Add a result to the session according to `StesOptions.result_retention`.
+
+        Results that are not kept are replaced by their summary and optionally
+        spilled to `StesOptions.result_spill_folder`.
+        """
+        retention = self.stes_options.result_retention
+
+        if retention != ResultRetention.ALL and not result.converged:
+            self._results.append(self._summarize(result, len(self._results)))
+            return
+
+        if retention == ResultRetention.FINAL:
+            node_ids = result.input_data[ComponentType.node]["id"]
+            for i, previous in enumerate(self._results):
+                if (
+                    isinstance(previous, StateEstimationResult)
+                    and previous.converged
+                    and np.isin(
+                        previous.input_data[ComponentType.node]["id"], node_ids
+                    ).all()
+                ):
+                    self._results[i] = self._summarize(previous, i)
+
+        self._results.append(result)
+
+    def _summarize(
+        self, result: StateEstimationResult, index: int
+    ) -> StateEstimationSummary:
+        spill_folder = self.stes_options.result_spill_folder
+        spill_path = spill_result(result, spill_folder, index) if spill_folder else None
+        return result.summarize(spill_path)
+
+    def _eliminate_bad_data(self) -> list[EliminatedMeasurement]:
+        """Iteratively eliminate bad data from the last converged state estimation.
+
+        The measurement with the largest normalized residual `|residual / sigma|` is
+        deweighted on the existing model via update data and the state estimation is
+        repeated. This continues until J is within `E(J) + 3σ`, no measurement exceeds
+        `bad_data_tolerance` or `max_bad_data_eliminations` is reached.
+
+        The last result is replaced by the result after the elimination.
+
+        Returns:
+            list[EliminatedMeasurement]: Eliminated measurements in order of elimination
+        """
+
+        if not self.stes_options.bad_data_elimination:
+            return []
+
+        if self._model is None:
+            raise ValueError("Unexpected Error: PowerGridModel is not initialized.")
+
+        params = self.stes_options.pgm_parameters
+        result = self._results[-1]
+        eliminated: list[EliminatedMeasurement] = []
+
+        while (
+            not result.is_j_within_bounds()
+            and len(eliminated) < self.stes_options.max_bad_data_eliminations
+        ):
+            measurement = result.get_largest_normalized_residual()
+            if (
+                measurement is None
+                or abs(measurement.normalized_residual) <= params.bad_data_tolerance
+            ):
+                break
+
+            logging.info(
+                "\tBad data elimination #%d: %s of sensor %s (r/sigma=%.2f, J=%.2f, E(J)+3σ=%.2f)",
+                len(eliminated) + 1,
+                measurement.quantity,
+                self.extra_info[measurement.sensor_id].get("_name"),
+                measurement.normalized_residual,
+                result.j,
+                result.e_j + 3 * result.sigma_j,
+            )
+
+            self._model.update(
+                update_data=create_elimination_update(
+                    result.input_data, measurement, eliminated
+                )
+            )
+            run_name = f"{result.run_name} (bad data elimination #{len(eliminated) + 1})"
+            start = time.perf_counter()
+            try:
+                result_data = calculate_state_estimation(self._model, params)
+                telemetry = create_telemetry(
+                    run_name, result.input_data, None, time.perf_counter() - start
+                )
+                self.telemetry.add(telemetry)
+            except (SparseMatrixError, IterationDiverge) as e:
+                self.telemetry.add(
+                    create_telemetry(
+                        run_name,
+                        result.input_data,
+                        None,
+                        time.perf_counter() - start,
+                        e,
+                    )
+                )
+                logging.error(
+                    "\tState Estimation failed after eliminating sensor %s: %s",
+                    measurement.sensor_id,
+                    str(e).split("\n", maxsplit=1)[0],
+                )
+                break
+
+            eliminated.append(measurement)
+            result = StateEstimationResult(
+                result.run_name,
+                result.input_data,
+                self.extra_info,
+                result_data,
+                params,
+                eliminated_measurements=list(eliminated),
+                telemetry=telemetry,
+            )
+
+        logging.info(
+            "\tEliminated %d measurements, J=%.2f, E(J)+3σ=%.2f",
+            len(eliminated),
+            result.j,
+            result.e_j + 3 * result.sigma_j,
+        )
+        self._results[-1] = result
+        return eliminated
+
     def _reconnect_branches(self):
         """Consecutively reconnect previously disabled branches
         and run STES on the resulting subnets.
@@ -183,8 +449,10 @@ class StateEstimationWrapper:
         At the end the list of branches that could not be connected is printed.
         This list can be used in the configuration file to be disabled,
         so that the STES can be computed successfully on the maximum size subnet.
+
+        If `StesOptions.reconnect_workers` is greater than 1, the candidates are evaluated
+        speculatively in worker processes (see `_reconnect_branches_parallel`).
         """
-        # TODO: Split this function
 
         main_topo = Topology(self.input_data, self.extra_info)
         all_branches = [
@@ -200,6 +468,29 @@ class StateEstimationWrapper:
             and b["_extra"].get("source2") is not None
         ]
 
+        if self.stes_options.reconnect_workers > 1:
+            ignore_branches, connected_substations = self._reconnect_branches_parallel(
+                main_topo, cuttable_branches
+            )
+        else:
+            ignore_branches, connected_substations = (
+                self._reconnect_branches_sequential(main_topo, cuttable_branches)
+            )
+
+        ignored_branch_names = [
+            main_topo[_id]["_extra"]["_name"] for _id in ignore_branches
+        ]
+        ignored_branch_names.sort()
+
+        connected_substation_names = list(connected_substations)
+        connected_substation_names.sort()
+
+        self.print_in_columns("Ingored branches", ignored_branch_names, 4)
+        self.print_in_columns("Connected substations", connected_substation_names, 8)
+
+    def _reconnect_branches_sequential(
+        self, main_topo: Topology, cuttable_branches: list[dict]
+    ) -> tuple[set, set]:
         ignore_branches = set()
         connected_substations = set()
         connect_counter = 0
@@ -251,10 +542,6 @@ class StateEstimationWrapper:
                 )
                 continue
 
-            current_subs = set()
-            for ii in range(1, len(subg) + 1):
-                current_subs.add(f"subnet_{ii}")
-
             logging.info(
                 "#%d / %d / %d: Connecting subnets '%s' and '%s' with line '%s' (subnets=%d)",
                 connect_counter,
@@ -271,9 +558,19 @@ class StateEstimationWrapper:
                 self.input_data, self.extra_info, sub
             )
 
-            self._model = PowerGridModel(sub_input_data)
+            run_name = f"{total_counter}_add_{line_name}"
+            if not self._check_observability(run_name, sub_input_data):
+                ignore_branches.add(pgm_id)
+                connect_branch(topo_item, current_topo, connect=False)
+                logging.warning(
+                    "Reconnecting branch '%s' is not observable, disabling it again",
+                    line_name,
+                )
+                continue
+
+            self._build_model(sub_input_data)
             try:
-                self._run_pgm(f"{total_counter}_add_{line_name}", sub_input_data)
+                self._run_pgm(run_name, sub_input_data)
 
                 connect_counter += 1
                 connected_substations.add(from_substation)
@@ -286,16 +583,163 @@ class StateEstimationWrapper:
                     line_name,
                 )
 
-        ignored_branch_names = [
-            main_topo[_id]["_extra"]["_name"] for _id in ignore_branches
-        ]
-        ignored_branch_names.sort()
+        return ignore_branches, connected_substations
 
-        connected_substation_names = list(connected_substations)
-        connected_substation_names.sort()
+    def _reconnect_branches_parallel(
+        self, main_topo: Topology, cuttable_branches: list[dict]
+    ) -> tuple[set, set]:
+        """Reconnect branches in the same order as `_reconnect_branches_sequential`,
+        but evaluate the next `reconnect_workers` candidates concurrently.
 
-        self.print_in_columns("Ingored branches", ignored_branch_names, 4)
-        self.print_in_columns("Connected substations", connected_substation_names, 8)
+        All candidates of a window are evaluated on the accepted topology at the start
+        of the window. They are committed in order afterwards. Since most reconnections
+        touch disjoint subnets, their speculative results stay valid. A candidate is only
+        re-evaluated, if its subnet contains nodes of a subnet changed by an earlier
+        commit in the same window.
+        """
+
+        n_workers = self.stes_options.reconnect_workers
+        params = self.stes_options.pgm_parameters
+
+        ignore_branches: set = set()
+        connected_substations: set = set()
+        connect_counter = 0
+
+        with (
+            SharedModelStore.create(self.input_data, self.extra_info) as store,
+            ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=init_reconnect_worker,
+                initargs=(
+                    store.handle,
+                    params,
+                    self.stes_options.check_observability,
+                ),
+            ) as executor,
+        ):
+            for start in range(0, len(cuttable_branches), n_workers):
+                window = cuttable_branches[start : start + n_workers]
+                snapshot = branch_status_snapshot(self.input_data)
+                futures = [
+                    executor.submit(
+                        evaluate_in_worker, snapshot, get_pgm_branch(item)["id"]
+                    )
+                    for item in window
+                ]
+
+                changed_nodes: set[int] = set()
+                for offset, (topo_item, future) in enumerate(zip(window, futures)):
+                    total_counter = start + offset + 1
+                    line_name = topo_item["_extra"]["_name"]
+                    pgm_branch = get_pgm_branch(topo_item)
+                    pgm_id = pgm_branch["id"]
+
+                    evaluation = future.result()
+                    if pgm_id in ignore_branches:
+                        logging.warning("Skipping line %s", line_name)
+                        continue
+
+                    if evaluation.subnet_nodes & changed_nodes:
+                        logging.debug(
+                            "Subnet of branch '%s' changed, re-evaluating it",
+                            line_name,
+                        )
+                        evaluation = evaluate_reconnect_candidate(
+                            self.input_data,
+                            self.extra_info,
+                            pgm_id,
+                            params,
+                            self.stes_options.check_observability,
+                        )
+
+                    committed = self._commit_reconnect_evaluation(
+                        evaluation,
+                        topo_item,
+                        main_topo,
+                        f"{total_counter}_add_{line_name}",
+                    )
+                    if not committed:
+                        if evaluation.connected and evaluation.same_subnet:
+                            ignore_branches.add(pgm_id)
+                        continue
+
+                    changed_nodes |= evaluation.subnet_nodes
+                    if not evaluation.converged:
+                        continue
+
+                    logging.info(
+                        "#%d / %d / %d: Connected subnets '%s' and '%s' with line '%s' (subnets=%d)",
+                        connect_counter,
+                        total_counter,
+                        len(cuttable_branches),
+                        evaluation.from_subnet_before,
+                        evaluation.to_subnet_before,
+                        line_name,
+                        evaluation.n_subnets,
+                    )
+                    connect_counter += 1
+                    connected_substations.add(
+                        main_topo[pgm_branch["from_node"]]["_extra"]["_substation"]
+                    )
+                    connected_substations.add(
+                        main_topo[pgm_branch["to_node"]]["_extra"]["_substation"]
+                    )
+
+        return ignore_branches, connected_substations
+
+    def _commit_reconnect_evaluation(
+        self,
+        evaluation: ReconnectEvaluation,
+        topo_item: dict,
+        main_topo: Topology,
+        run_name: str,
+    ) -> bool:
+        """Apply the outcome of an evaluated reconnect candidate to the input data.
+
+        Returns:
+            bool: True if the branch has been connected in the input data
+        """
+        line_name = topo_item["_extra"]["_name"]
+
+        if not evaluation.connected:
+            logging.warning("Branch '%s' cannot be connected, skipping it", line_name)
+            return False
+
+        if not evaluation.same_subnet:
+            # keep the branch connected, same as in the sequential mode
+            logging.warning(
+                "Branch '%s' connects different subnets '%s' and '%s'",
+                line_name,
+                evaluation.from_subnet_after,
+                evaluation.to_subnet_after,
+            )
+            connect_branch(topo_item, main_topo, connect=True)
+            return True
+
+        telemetry = None
+        if evaluation.telemetry is not None:
+            telemetry = replace(evaluation.telemetry, run_name=run_name)
+            self.telemetry.add(telemetry)
+
+        self._add_result(
+            StateEstimationResult(
+                run_name,
+                evaluation.sub_input_data,
+                self.extra_info,
+                evaluation.result_data,
+                self.stes_options.pgm_parameters,
+                telemetry=telemetry,
+            )
+        )
+
+        if not evaluation.converged:
+            logging.warning(
+                "Reconnecting branch '%s' failed, disabling it again", line_name
+            )
+            return False
+
+        connect_branch(topo_item, main_topo, connect=True)
+        return True
 
     def print_in_columns(self, title: str, data: list[str], columns: int):
 
@@ -0,0 +1,90 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from cgmes2pgm_suite.export.utils import (
+    parse_ntriples_line,
+    parse_term,
+    parse_tsv_triple,
+)
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("<http://example.org/a#_1>", ("http://example.org/a#_1", True)),
+        ("<http://example.org/\\u00E4>", ("http://example.org/ä", True)),
+        ('"plain"', ("plain", False)),
+        ('""', ("", False)),
+        ('"Wert"@de', ("Wert", False)),
+        ('"a \\"quoted\\" name"@en-GB', ('a "quoted" name', False)),
+        (f'"1.5"^^<{XSD}float>', ("1.5", False)),
+        (f'"ends with \\\\"^^<{XSD}string>', ("ends with \\", False)),
+        ('"tab\\tnew\\nline\\rcr"', ("tab\tnew\nline\rcr", False)),
+        ('"\\u00E4\\U0001F600"', ("ä\U0001f600", False)),
+        ('"unknown \\q escape"', ("unknown \\q escape", False)),
+        ("_:b0", ("_:b0", False)),
+    ],
+)
+def test_parse_term(term, expected):
+    assert parse_term(term) == expected
+
+
+@pytest.mark.parametrize("term", ["42", "-1.5", "1.0e3", "true", "false"])
+def test_parse_tsv_abbreviations(term):
+    assert parse_term(term) == (term, False)
+
+
+def test_parse_ntriples_line():
+    line = '<http://example.org/s> <http://example.org/p> "a . b \\" c"@en .'
+    assert parse_ntriples_line(line) == (
+        "http://example.org/s",
+        "http://example.org/p",
+        'a . b " c',
+        False,
+    )
+
+    line = "_:b1 <http://example.org/p> <http://example.org/o> ."
+    assert parse_ntriples_line(line) == (
+        "_:b1",
+        "http://example.org/p",
+        "http://example.org/o",
+        True,
+    )
+
+
+@pytest.mark.parametrize("line", ["", "   ", "# comment"])
+def test_parse_ntriples_line_skips_empty_lines_and_comments(line):
+    assert parse_ntriples_line(line) is None
+
+
+def test_parse_tsv_triple():
+    line = '<http://example.org/s>\t<http://example.org/p>\t"a\\tb"@de\r\n'
+    assert parse_tsv_triple(line) == (
+        "http://example.org/s",
+        "http://example.org/p",
+        "a\tb",
+        False,
+    )
+
+    line = "<http://example.org/s>\t<http://example.org/p>\t1.5e0\n"
+    assert parse_tsv_triple(line) == (
+        "http://example.org/s",
+        "http://example.org/p",
+        "1.5e0",
+        False,
+    )
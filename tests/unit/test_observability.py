@@ -0,0 +1,135 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+from power_grid_model import (
+    ComponentType,
+    LoadGenType,
+    MeasuredTerminalType,
+    PowerGridModel,
+    initialize_array,
+)
+
+from cgmes2pgm_suite.state_estimation.observability import check_observability
+
+U_RATED = 10e3
+
+
+def _create_shunt_chain() -> dict:
+    """Source at node 1, shunt at node 2, load at node 3"""
+    node = initialize_array("input", ComponentType.node, 3)
+    node["id"] = [1, 2, 3]
+    node["u_rated"] = U_RATED
+
+    line = initialize_array("input", ComponentType.line, 2)
+    line["id"] = [4, 5]
+    line["from_node"] = [1, 2]
+    line["to_node"] = [2, 3]
+    line["from_status"] = 1
+    line["to_status"] = 1
+    line["r1"] = 0.25
+    line["x1"] = 0.2
+    line["c1"] = 10e-6
+    line["tan1"] = 0.0
+    line["i_n"] = 1000.0
+
+    source = initialize_array("input", ComponentType.source, 1)
+    source["id"] = 6
+    source["node"] = 1
+    source["status"] = 1
+    source["u_ref"] = 1.0
+
+    shunt = initialize_array("input", ComponentType.shunt, 1)
+    shunt["id"] = 7
+    shunt["node"] = 2
+    shunt["status"] = 1
+    shunt["g1"] = 0.01
+    shunt["b1"] = -0.02
+
+    load = initialize_array("input", ComponentType.sym_load, 1)
+    load["id"] = 8
+    load["node"] = 3
+    load["status"] = 1
+    load["type"] = LoadGenType.const_power
+    load["p_specified"] = 1e6
+    load["q_specified"] = 0.2e6
+
+    return {
+        ComponentType.node: node,
+        ComponentType.line: line,
+        ComponentType.source: source,
+        ComponentType.shunt: shunt,
+        ComponentType.sym_load: load,
+    }
+
+
+def _add_sensors(input_data: dict, power_flow: dict) -> dict:
+    voltage_sensor = initialize_array("input", ComponentType.sym_voltage_sensor, 1)
+    voltage_sensor["id"] = 9
+    voltage_sensor["measured_object"] = 1
+    voltage_sensor["u_sigma"] = 1.0
+    voltage_sensor["u_measured"] = power_flow[ComponentType.node]["u"][0]
+
+    power_sensor = initialize_array("input", ComponentType.sym_power_sensor, 2)
+    power_sensor["id"] = [10, 11]
+    power_sensor["measured_object"] = [5, 8]
+    power_sensor["measured_terminal_type"] = [
+        MeasuredTerminalType.branch_from,
+        MeasuredTerminalType.load,
+    ]
+    power_sensor["power_sigma"] = 1e3
+    line = power_flow[ComponentType.line]
+    load = power_flow[ComponentType.sym_load]
+    power_sensor["p_measured"] = [line["p_from"][1], load["p"][0]]
+    power_sensor["q_measured"] = [line["q_from"][1], load["q"][0]]
+
+    return {
+        **input_data,
+        ComponentType.sym_voltage_sensor: voltage_sensor,
+        ComponentType.sym_power_sensor: power_sensor,
+    }
+
+
+def test_node_with_only_shunt_is_zero_injection():
+    input_data = _create_shunt_chain()
+    power_flow = PowerGridModel(input_data).calculate_power_flow()
+    input_data = _add_sensors(input_data, power_flow)
+
+    result = check_observability(input_data)
+
+    assert result.observable, result.reasons
+
+    estimation = PowerGridModel(input_data).calculate_state_estimation()
+    np.testing.assert_allclose(
+        estimation[ComponentType.node]["u"],
+        power_flow[ComponentType.node]["u"],
+        rtol=1e-6,
+    )
+
+
+def test_isolated_node_is_not_checked():
+    input_data = _create_shunt_chain()
+    power_flow = PowerGridModel(input_data).calculate_power_flow()
+    input_data = _add_sensors(input_data, power_flow)
+
+    node = initialize_array("input", ComponentType.node, 4)
+    node[:3] = input_data[ComponentType.node]
+    node["id"][3] = 99
+    node["u_rated"][3] = U_RATED
+    input_data[ComponentType.node] = node
+
+    result = check_observability(input_data)
+
+    assert result.observable, result.reasons
+    assert result.n_islands == 1
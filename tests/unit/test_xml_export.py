@@ -0,0 +1,131 @@
+# Copyright [2025] [SOPTIM AG]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+import requests
+
+from cgmes2pgm_suite.export import GraphToXMLExport, xml_export
+
+BASE_URL = "http://localhost:3030/dataset"
+GRAPH = "http://example.org/graph/SV"
+CIM = "http://iec.ch/TC57/CIM100#"
+MD = "http://iec.ch/TC57/61970-552/ModelDescription/1#"
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+
+HEADER = f"{BASE_URL}#header"
+TRIPLES = [
+    (HEADER, f"{RDF}type", f"<{MD}FullModel>"),
+    (HEADER, f"{MD}Model.created", '"2025-01-01T00:00:00Z"'),
+    (f"{BASE_URL}#a", f"{RDF}type", f"<{CIM}TopologicalIsland>"),
+    (f"{BASE_URL}#a", f"{CIM}IdentifiedObject.name", '"Island \\"A\\""@en'),
+    (f"{BASE_URL}#b", f"{RDF}type", f"<{CIM}SvVoltage>"),
+    (f"{BASE_URL}#b", f"{CIM}SvVoltage.v", f'"110.5"^^<{CIM}Float>'),
+    (f"{BASE_URL}#b", f"{CIM}SvVoltage.TopologicalNode", f"<{BASE_URL}#tn>"),
+    # second triple of _a after _b
+    (f"{BASE_URL}#a", f"{CIM}IdentifiedObject.description", '"desc"'),
+]
+
+
+class _Response:
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode=False):
+        return (line.encode("utf-8") for line in self.lines)
+
+
+class _Dataset:
+    """Dataset with the queries of the model header"""
+
+    base_url = BASE_URL
+
+    def get_prefixes(self) -> dict[str, str]:
+        return {"cim": CIM, "md": MD, "rdf": RDF}
+
+    def format_query(self, query: str, args: dict) -> str:
+        for key, value in args.items():
+            query = query.replace(key, value)
+        return query
+
+    def query(self, query: str) -> pd.DataFrame:
+        if "isIRI" not in query:
+            return pd.DataFrame({"s": [HEADER]})
+        return pd.DataFrame(
+            {
+                "s": [HEADER],
+                "p": [f"{MD}Model.created"],
+                "o": ["2025-01-01T00:00:00Z"],
+                "isIRI": [False],
+            }
+        )
+
+
+def test_ungrouped_graph_store_triples_fall_back_to_sparql(monkeypatch, tmp_path):
+    requests_made = []
+
+    def get(url, **kwargs):
+        requests_made.append("get")
+        return _Response([f"<{s}> <{p}> {o} ." for s, p, o in TRIPLES])
+
+    def post(url, data=None, **kwargs):
+        requests_made.append("post")
+        assert url == f"{BASE_URL}/query"
+        assert "ORDER BY ?s" in data["query"]
+        rows = sorted(TRIPLES, key=lambda t: t[0])
+        return _Response(["?s\t?p\t?o"] + [f"<{s}>\t<{p}>\t{o}" for s, p, o in rows])
+
+    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests, "post", post)
+
+    path = tmp_path / "sv.xml"
+    GraphToXMLExport(_Dataset(), GRAPH, str(path)).export()
+
+    assert requests_made == ["get", "post"]
+
+    root = ET.parse(path).getroot()
+    objects = {element.get(f"{{{RDF}}}about"): element for element in root}
+    assert len(objects) == 3
+
+    island = objects["a"]
+    assert island.tag == f"{{{CIM}}}TopologicalIsland"
+    assert island.find(f"{{{CIM}}}IdentifiedObject.name").text == 'Island "A"'
+    assert island.find(f"{{{CIM}}}IdentifiedObject.description").text == "desc"
+
+    voltage = objects["b"]
+    assert voltage.find(f"{{{CIM}}}SvVoltage.v").text == "110.5"
+    reference = voltage.find(f"{{{CIM}}}SvVoltage.TopologicalNode")
+    assert reference.get(f"{{{RDF}}}resource") == "#_tn"
+
+
+def test_ensure_grouped_raises_on_repeated_subject():
+    triples = [("a", "p", "1", False), ("b", "p", "2", False), ("a", "q", "3", False)]
+
+    grouped = xml_export._ensure_grouped(triples)  # pylint: disable=protected-access
+
+    assert next(grouped)[0] == "a"
+    assert next(grouped)[0] == "b"
+    with pytest.raises(xml_export.UngroupedTriplesError):
+        next(grouped)